@@ -0,0 +1,35 @@
+"""Throughput of PlayerBatch in player-steps per millisecond.
+
+Run with: python -m benchmarks.bench_batch
+"""
+import time
+import numpy as np
+from src.batch import PlayerBatch, platform_arrays
+from src.game_objects import LevelThree
+
+SIZES = [1000, 10000, 100000, 1000000]
+STEPS = 100
+
+def time_batch(count, seed=0):
+    """Return player-steps per millisecond for count players on Level 3."""
+    rng = np.random.default_rng(seed)
+    platforms = platform_arrays(LevelThree().platforms)
+    batch = PlayerBatch(count)
+    batch.x[:] = rng.integers(0, 760, count)
+    batch.rect_x[:] = batch.x
+    left = rng.random((STEPS, count)) < 0.4
+    right = rng.random((STEPS, count)) < 0.5
+    jump = rng.random((STEPS, count)) < 0.3
+    start = time.perf_counter()
+    for step in range(STEPS):
+        batch.step(platforms, left[step], right[step], jump[step])
+    elapsed = time.perf_counter() - start
+    return count * STEPS / (elapsed * 1000)
+
+def main():
+    print(f"{'players':>8} {'player-steps/ms':>16}")
+    for count in SIZES:
+        print(f"{count:>8} {time_batch(count):>16.0f}")
+
+if __name__ == "__main__":
+    main()
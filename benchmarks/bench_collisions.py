@@ -0,0 +1,43 @@
+"""Per-frame cost of Simulation.check_collisions as level object count grows.
+
+Object density is kept constant by widening the level, so the grid should
+stay flat while the linear scan grows with the object count.
+
+Run with: python -m benchmarks.bench_collisions
+"""
+import time
+from src.simulation import Simulation
+from src.inputs import FrameInput
+from src.constants import SCREEN_WIDTH
+from .synthetic import make_level
+
+SIZES = [10, 100, 1000, 10000]
+FRAMES = 300
+
+def time_collisions(count, cell_size=None):
+    """Return mean microseconds per check_collisions call for a level of count objects each."""
+    level = make_level(platforms=count, enemies=count // 10, coins=count, seed=count,
+                       width=SCREEN_WIDTH * max(1, count // 100))
+    if cell_size is not None:
+        level.build_index(cell_size=cell_size)
+    sim = Simulation(levels=[level])
+    sim.step(FrameInput(confirm=True))
+    sim.state = "PLAYING"
+    elapsed = 0.0
+    for frame in range(FRAMES):
+        sim.player.update(FrameInput(right=frame % 120 < 60, left=frame % 120 >= 60, jump=True))
+        start = time.perf_counter()
+        sim.check_collisions()
+        elapsed += time.perf_counter() - start
+        sim.state = "PLAYING"  # Keep going through enemy hits
+    return elapsed / FRAMES * 1e6
+
+def main():
+    print(f"{'objects':>8} {'grid us/frame':>14} {'linear us/frame':>16}")
+    for count in SIZES:
+        grid = time_collisions(count)
+        linear = time_collisions(count, cell_size=10 ** 6)  # One cell: every object is a candidate
+        print(f"{count:>8} {grid:>14.1f} {linear:>16.1f}")
+
+if __name__ == "__main__":
+    main()
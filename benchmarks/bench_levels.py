@@ -0,0 +1,40 @@
+"""Startup time and memory of a Simulation over level packs of growing size.
+
+Run with: python -m benchmarks.bench_levels
+"""
+import os
+import tempfile
+import time
+import tracemalloc
+from src.level_format import LevelPack, compile_levels, level_to_dict
+from src.level_loader import LevelLoader
+from src.simulation import Simulation
+from .synthetic import make_level
+
+SIZES = [10, 100, 1000]
+
+def measure(pack_path):
+    """Return (seconds, peak bytes) to open a pack and build a Simulation on it."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    loader = LevelLoader(LevelPack(pack_path), prefetch=False)
+    sim = Simulation(levels=loader)
+    sim.levels[0]  # First level built on demand
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    loader.close()
+    return elapsed, peak
+
+def main():
+    template = level_to_dict(make_level(platforms=50, enemies=5, coins=50))
+    print(f"{'levels':>7} {'startup ms':>11} {'peak KiB':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in SIZES:
+            path = os.path.join(tmp, f"pack{count}.pak")
+            compile_levels([template] * count, path)
+            elapsed, peak = measure(path)
+            print(f"{count:>7} {elapsed * 1000:>11.2f} {peak / 1024:>9.1f}")
+
+if __name__ == "__main__":
+    main()
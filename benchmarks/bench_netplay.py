@@ -0,0 +1,68 @@
+"""Server tick time and bandwidth per client for rooms of bots over loopback UDP.
+
+Goes up to hundreds of rooms, stopping once a tick takes longer than a frame
+(1/FPS), and reports the room count at which the tick time crosses that
+budget. The bot clients run in the same process, so on one core they starve
+the server's timer well before its own tick time runs out: overruns and the
+falling upload rate show that, while "tick ms" counts only the server's work.
+
+Run with: python -m benchmarks.bench_netplay
+"""
+import asyncio
+import random
+from src.netplay import GameServer, PredictedClient, ClientProtocol
+from src.playtest import RandomBot
+from src.constants import FPS
+
+SECONDS = 5
+PLAYERS_PER_ROOM = 2
+ROOM_COUNTS = (1, 4, 16, 32, 64, 128, 192, 256, 320)
+
+async def session(rooms):
+    loop = asyncio.get_running_loop()
+    server = GameServer()
+    transport, _ = await loop.create_datagram_endpoint(lambda: server, local_addr=("127.0.0.1", 0))
+    address = transport.get_extra_info("sockname")
+    clients = []
+    for index in range(rooms * PLAYERS_PER_ROOM):
+        protocol = ClientProtocol(PredictedClient(), room_id=index // PLAYERS_PER_ROOM)
+        await loop.create_datagram_endpoint(lambda: protocol, remote_addr=address)
+        clients.append((protocol, RandomBot(random.Random(index))))
+    ticks = SECONDS * FPS
+    run = asyncio.ensure_future(server.run(ticks))
+    for _ in range(ticks):
+        for protocol, bot in clients:
+            protocol.send_input(bot(protocol.client.sim))
+        await asyncio.sleep(1 / FPS)
+    await run
+    for protocol, _ in clients:
+        protocol.close()
+    transport.close()
+    return server, [protocol for protocol, _ in clients]
+
+def main():
+    print(f"{'rooms':>6} {'clients':>8} {'tick ms':>8} {'overruns':>9} {'down B/s':>9} {'up B/s':>7} "
+          f"{'corrections':>12}")
+    budget = 1000 / FPS
+    measured = []  # (rooms, tick ms)
+    for rooms in ROOM_COUNTS:
+        server, protocols = asyncio.run(session(rooms))
+        clients = len(protocols)
+        tick = server.tick_seconds / server.ticks * 1000
+        measured.append((rooms, tick))
+        down = sum(protocol.bytes_received for protocol in protocols) / clients / SECONDS
+        up = server.bytes_received / clients / SECONDS
+        corrections = sum(protocol.client.corrections for protocol in protocols)
+        print(f"{rooms:>6} {clients:>8} {tick:>8.3f} {server.overruns:>9} "
+              f"{down:>9.0f} {up:>7.0f} {corrections:>12}")
+        if tick > budget:
+            break
+    print(f"Most rooms within the {budget:.1f} ms tick budget: about {ceiling(measured, budget)}")
+
+def ceiling(measured, budget):
+    """Rooms at which the tick time reaches budget, from the line through the last two measurements."""
+    (rooms_a, tick_a), (rooms_b, tick_b) = measured[-2:]
+    return int(rooms_a + (budget - tick_a) * (rooms_b - rooms_a) / (tick_b - tick_a))
+
+if __name__ == "__main__":
+    main()
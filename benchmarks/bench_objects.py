@@ -0,0 +1,67 @@
+"""Memory and Level.reset latency for a level with 10k coins.
+
+Compares the shared-surface, __slots__ objects against the previous layout
+(one dict-based object with its own Surface per coin), reproduced below.
+
+Run with: python -m benchmarks.bench_objects
+"""
+import time
+import tracemalloc
+import pygame
+from src.game_objects import Level, Coin
+from src.constants import YELLOW
+
+COINS = 10000
+RESETS = 20
+
+class LegacyCoin:
+    """Coin as it was before: instance dict and a private Surface."""
+    def __init__(self, x, y, width, height):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.rect = pygame.Rect(x, y, width, height)
+        self.image = pygame.Surface((width, height))
+        self.image.fill(YELLOW)
+        self.collected = False
+
+class LegacyLevel(Level):
+    """Level as it was before: plain coin lists rebuilt on every reset."""
+    coins = None  # Shadow the CollectibleStore property
+    power_ups = None
+
+    def reset(self):
+        self.coins = [LegacyCoin(c.x, c.y, c.width, c.height) for c in self.initial_coins]
+
+def build(level_class, coin_class):
+    level = level_class()
+    level.coins = [coin_class(i % 780, (i // 780) * 20 % 560, 20, 20) for i in range(COINS)]
+    level.initial_coins = level.coins.copy()
+    return level
+
+def surface_bytes(objects):
+    """Pixel memory of the distinct surfaces used by objects (not seen by tracemalloc)."""
+    surfaces = {id(obj.image): obj.image for obj in objects}
+    return sum(s.get_width() * s.get_height() * s.get_bytesize() for s in surfaces.values())
+
+def measure(level_class, coin_class):
+    tracemalloc.start()
+    level = build(level_class, coin_class)
+    python_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    pixels = surface_bytes(level.coins)
+    start = time.perf_counter()
+    for _ in range(RESETS):
+        level.reset()
+    reset_ms = (time.perf_counter() - start) / RESETS * 1000
+    return python_bytes, pixels, reset_ms
+
+def main():
+    print(f"{'layout':>8} {'python KiB':>11} {'pixels KiB':>11} {'reset ms':>9}")
+    for name, level_class, coin_class in [("before", LegacyLevel, LegacyCoin), ("after", Level, Coin)]:
+        python_bytes, pixels, reset_ms = measure(level_class, coin_class)
+        print(f"{name:>8} {python_bytes / 1024:>11.1f} {pixels / 1024:>11.1f} {reset_ms:>9.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Per-frame cost of 1k to 50k live particles: pooled NumPy arrays against one object per particle.
+
+Run with: python -m benchmarks.bench_particles
+"""
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Render headless
+
+import pygame
+from src.particles import ParticleSystem
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, PARTICLE_GRAVITY, PARTICLE_SIZE, YELLOW, RED
+
+FRAMES = 60
+
+class NaiveParticle:
+    """One object and surface per particle, as a GameObject-based version would have."""
+    def __init__(self, x, y, velocity_x, velocity_y, color):
+        self.x = x
+        self.y = y
+        self.velocity_x = velocity_x
+        self.velocity_y = velocity_y
+        self.life = 10 ** 6
+        self.image = pygame.Surface((PARTICLE_SIZE, PARTICLE_SIZE)).convert()
+        self.image.fill(color)
+
+def fill(particles, count):
+    """Emit count long-lived particles spread over the screen."""
+    while particles.count < count:
+        particles.emit(SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2, min(1000, count - particles.count),
+                       YELLOW if particles.count % 2000 else RED, speed=0.5, life=10 ** 6)
+
+def pooled_frame(particles, screen):
+    particles.update()
+    particles.draw(screen)
+
+def naive_frame(particles, screen):
+    alive = []
+    for particle in particles:
+        particle.velocity_y += PARTICLE_GRAVITY
+        particle.x += particle.velocity_x
+        particle.y += particle.velocity_y
+        particle.life -= 1
+        if particle.life > 0:
+            alive.append(particle)
+            screen.blit(particle.image, (particle.x, particle.y))
+    particles[:] = alive
+
+def time_frames(frame, particles, screen):
+    start = time.perf_counter()
+    for _ in range(FRAMES):
+        frame(particles, screen)
+    return (time.perf_counter() - start) / FRAMES * 1000
+
+def main():
+    pygame.display.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    print(f"{'particles':>10} {'pooled ms':>10} {'naive ms':>9} {'pooled peak KiB':>16}")
+    for count in (1000, 10000, 50000):
+        pooled = ParticleSystem(capacity=count, seed=1)
+        fill(pooled, count)
+        pooled_frame(pooled, screen)  # Warm up the sprite cache
+        pooled_ms = time_frames(pooled_frame, pooled, screen)
+        tracemalloc.start()
+        pooled_frame(pooled, screen)
+        _, peak = tracemalloc.get_traced_memory()  # Blit lists, or ufunc casting buffers; no arrays are reallocated
+        tracemalloc.stop()
+        state = [pooled.arrays[name][:count].tolist() for name in ("x", "y", "velocity_x", "velocity_y")]
+        naive = [NaiveParticle(*values, YELLOW) for values in zip(*state)]
+        naive_ms = time_frames(naive_frame, naive, screen)
+        print(f"{count:>10} {pooled_ms:>10.2f} {naive_ms:>9.2f} {peak / 1024:>16.0f}")
+    print(f"Frame budget at {FPS} FPS: {1000 / FPS:.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,25 @@
+"""Playtest throughput (episodes per second) as worker processes are added.
+
+Run with: python -m benchmarks.bench_playtest
+"""
+import os
+import time
+from src.playtest import playtest
+
+EPISODES = 400
+MAX_TICKS = 1800
+
+def main():
+    cores = os.cpu_count() or 1
+    counts = sorted({1, 2, 4, 8, 16, cores} & set(range(1, cores + 1)))
+    print(f"{'workers':>8} {'episodes/s':>11} {'speedup':>8}")
+    baseline = None
+    for workers in counts:
+        start = time.perf_counter()
+        playtest(EPISODES, "random", workers=workers, max_ticks=MAX_TICKS)
+        rate = EPISODES / (time.perf_counter() - start)
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>11.1f} {rate / baseline:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Reachability analysis time for a level pack with one worker, all cores, and a warm cache.
+
+Run with: python -m benchmarks.bench_reachability
+"""
+import os
+import tempfile
+import time
+from src.level_format import compile_levels, level_to_dict
+from src.reachability import analyze_pack, ReportCache
+from .synthetic import make_level
+
+LEVELS = 32
+
+def timed(pack_path, cache, workers):
+    start = time.perf_counter()
+    analyze_pack(pack_path, cache, workers)
+    return time.perf_counter() - start
+
+def main():
+    levels = [level_to_dict(make_level(platforms=60, enemies=6, coins=60, seed=seed)) for seed in range(LEVELS)]
+    cores = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "pack.pak")
+        compile_levels(levels, path)
+        serial = timed(path, ReportCache(), 1)
+        cache = ReportCache()
+        parallel = timed(path, cache, cores)
+        cached = timed(path, cache, cores)
+    print(f"{LEVELS} levels: 1 worker {serial:.2f}s, {cores} workers {parallel:.2f}s "
+          f"({serial / parallel:.1f}x), cached {cached * 1000:.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""Snapshot size and the cost of taking, restoring and ring-buffering snapshots of the built-in levels.
+
+Run with: python -m benchmarks.bench_rewind
+"""
+import timeit
+from src.simulation import Simulation
+from src.snapshot import SnapshotRing, snapshot_size, take_snapshot, pack_snapshot, restore_snapshot
+from src.inputs import FrameInput
+from src.constants import REWIND_MEMORY
+
+RUNS = 20000
+
+def microseconds(statement):
+    return min(timeit.repeat(statement, number=RUNS, repeat=3)) / RUNS * 1e6
+
+def main():
+    print(f"{'level':>6} {'bytes':>6} {'pack us':>8} {'restore us':>11} {'reset_level us':>15} {'rewind s':>9}")
+    sim = Simulation()
+    sim.step(FrameInput(confirm=True))
+    for index in range(len(sim.levels)):
+        sim.current_level_index = index
+        level = sim.levels[index]
+        level.build_index()
+        snapshot = take_snapshot(sim)
+        buffer = bytearray(len(snapshot))
+        ring = SnapshotRing()
+        ring.push(sim)
+        print(f"{index + 1:>6} {snapshot_size(level):>6} {microseconds(lambda: pack_snapshot(sim, buffer)):>8.2f} "
+              f"{microseconds(lambda: restore_snapshot(sim, snapshot)):>11.2f} "
+              f"{microseconds(sim.reset_level):>15.2f} {ring.capacity / 60:>9.1f}")
+    plain = Simulation()
+    rewinding = Simulation()
+    rewinding.enable_rewind()
+    for sim in (plain, rewinding):
+        sim.step(FrameInput(confirm=True))
+    step = microseconds(lambda: plain.step(FrameInput(right=True)))
+    with_ring = microseconds(lambda: rewinding.step(FrameInput(right=True)))
+    print(f"step {step:.2f} us, with rewind history {with_ring:.2f} us; "
+          f"{REWIND_MEMORY // 1024} KiB of history")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Time to first frame, and the per-blit cost of surfaces left out of display format.
+
+Each startup is measured in a fresh interpreter, from the start of the
+imports until the first frame is on the display. The "full init" run starts
+every pygame subsystem and loads the fonts up front, as the game used to.
+
+Run with: python -m benchmarks.bench_startup
+"""
+import os
+import subprocess
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Render headless
+
+RUNS = 5
+BLITS = 20000
+
+STARTUP = """
+import time
+start = time.perf_counter()
+import pygame
+if {full_init}:
+    pygame.init()
+    pygame.font.Font(None, 36), pygame.font.Font(None, 22)
+from src.game import GameManager
+imported = time.perf_counter()
+game = GameManager()
+created = time.perf_counter()
+game.render()
+print(imported - start, created - start, time.perf_counter() - start)
+"""
+
+def startup(full_init):
+    """Return the median (imported, created, first frame) seconds over RUNS fresh processes."""
+    samples = []
+    for _ in range(RUNS):
+        output = subprocess.run([sys.executable, "-c", STARTUP.format(full_init=full_init)],
+                                capture_output=True, text=True, check=True,
+                                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout
+        samples.append([float(value) for value in output.split("\n")[-2].split()])
+    return [sorted(column)[len(column) // 2] for column in zip(*samples)]
+
+def blit_time(screen, surface):
+    start = time.perf_counter()
+    for i in range(BLITS):
+        screen.blit(surface, (i % 700, i % 500))
+    return time.perf_counter() - start
+
+def main():
+    print(f"{'startup':>10} {'imports ms':>11} {'manager ms':>11} {'first frame ms':>15}")
+    for name, full_init in (("full init", True), ("selective", False)):
+        imported, created, first_frame = startup(full_init)
+        print(f"{name:>10} {imported * 1000:>11.1f} {created * 1000:>11.1f} {first_frame * 1000:>15.1f}")
+
+    import pygame
+    from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+    raw = pygame.Surface((40, 40))  # Made before the display, like objects in levels built early
+    raw.fill((255, 255, 0))
+    pygame.display.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    converted = raw.convert()
+    raw_time, converted_time = blit_time(screen, raw), blit_time(screen, converted)
+    print(f"display {screen.get_bitsize()}-bit {screen.get_masks()}, object image {raw.get_bitsize()}-bit "
+          f"{raw.get_masks()}")
+    print(f"{BLITS} blits: unconverted {raw_time * 1000:.1f} ms, converted {converted_time * 1000:.1f} ms "
+          f"({raw_time / converted_time:.1f}x)")
+
+if __name__ == "__main__":
+    main()
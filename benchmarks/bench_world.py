@@ -0,0 +1,52 @@
+"""Per-frame cost of simulating and rendering scrolling levels as the world grows.
+
+Run with: python -m benchmarks.bench_world
+"""
+import os
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Render headless
+
+from src.game import GameManager
+from src.world import ChunkedLevel
+from src.game_objects import Platform, Enemy, Coin
+from src.inputs import FrameInput
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+SCREENS = [1, 10, 100, 1000]
+FRAMES = 300
+
+def make_world(screens):
+    """A level screens wide with a few platforms, enemies and coins per screen."""
+    width = SCREEN_WIDTH * screens
+    level = ChunkedLevel(width, SCREEN_HEIGHT)
+    level.platforms = [Platform(0, SCREEN_HEIGHT - 20, width, 20)]
+    for x in range(300, width - 200, 200):
+        level.platforms.append(Platform(x, 300 + x % 180, 150, 20))
+    level.enemies = [Enemy(p.x, p.y - 20, 30, 20, p) for p in level.platforms[1:]]
+    level.coins = [Coin(x, 200 + x % 300, 20, 20) for x in range(150, width, 100)]
+    return level
+
+def time_world(screens):
+    """Return mean microseconds per frame for update and render."""
+    game = GameManager(levels=[make_world(screens)])
+    game.step(FrameInput(confirm=True))
+    update = render = 0.0
+    for frame in range(FRAMES):
+        start = time.perf_counter()
+        game.step(FrameInput(right=True, jump=frame % 40 == 0))
+        middle = time.perf_counter()
+        game.render()
+        render += time.perf_counter() - middle
+        update += middle - start
+        game.state = "PLAYING"
+    return update / FRAMES * 1e6, render / FRAMES * 1e6
+
+def main():
+    print(f"{'screens':>8} {'update us':>10} {'render us':>10}")
+    for screens in SCREENS:
+        update, render = time_world(screens)
+        print(f"{screens:>8} {update:>10.1f} {render:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Compare two benchmark suite JSON files and flag regressions.
+
+Run with: python -m benchmarks.compare BASE.json NEW.json [--threshold 1.2]
+Exits with status 1 if any case got slower than the threshold ratio.
+"""
+import argparse
+import json
+import sys
+
+def load_points(path):
+    with open(path) as f:
+        results = json.load(f)
+    points = {}
+    for case, curve in results["cases"].items():
+        for point in curve:
+            points[(case, point["objects"])] = point
+    return results, points
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Compare benchmark suite results")
+    parser.add_argument("base")
+    parser.add_argument("new")
+    parser.add_argument("--threshold", type=float, default=1.2, help="slowdown ratio counted as a regression")
+    args = parser.parse_args(argv)
+    base, base_points = load_points(args.base)
+    new, new_points = load_points(args.new)
+    print(f"base {base.get('commit')}  new {new.get('commit')}")
+    regressions = 0
+    for key in sorted(base_points.keys() & new_points.keys()):
+        old = base_points[key]["us_per_frame"]
+        current = new_points[key]["us_per_frame"]
+        ratio = current / old if old else float("inf")
+        flag = "REGRESSION" if ratio > args.threshold else ""
+        regressions += bool(flag)
+        print(f"{key[0]:>17} {key[1]:>7} {old:>12.1f} -> {current:>12.1f} us/frame  x{ratio:.2f} {flag}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
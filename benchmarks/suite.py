@@ -0,0 +1,167 @@
+"""Benchmark suite for the simulation and rendering hot paths.
+
+Each case runs on synthetic levels of growing size and reports per-frame
+cost and allocations; results are written as JSON so runs from different
+commits can be compared with benchmarks.compare.
+
+Run with: python -m benchmarks.suite --output results.json
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # Render headless
+
+import pygame
+from src.simulation import Simulation
+from src.inputs import FrameInput
+from src.constants import SCREEN_WIDTH
+from .synthetic import make_level
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+FRAME_BUDGET = 200000  # Objects processed per case and size, bounds the run time
+
+def synthetic_level(count):
+    """Level with count platforms, enemies and coins at constant density."""
+    return make_level(platforms=count, enemies=count, coins=count, seed=count,
+                      width=SCREEN_WIDTH * max(1, count // 100))
+
+def walking_input(frame):
+    return FrameInput(right=frame % 120 < 60, left=frame % 120 >= 60, jump=frame % 40 == 0)
+
+def playing_simulation(count):
+    sim = Simulation(levels=[synthetic_level(count)])
+    sim.step(FrameInput(confirm=True))
+    return sim
+
+def setup_player_update(count):
+    sim = playing_simulation(count)
+    frame = [0]
+
+    def run():
+        frame[0] += 1
+        sim.player.update(walking_input(frame[0]))
+    return run
+
+def setup_enemy_update(count):
+    enemies = playing_simulation(count).levels[0].enemies
+
+    def run():
+        for enemy in enemies:
+            enemy.update()
+    return run
+
+def setup_check_collisions(count):
+    sim = playing_simulation(count)
+    frame = [0]
+
+    def run():
+        frame[0] += 1
+        sim.player.update(walking_input(frame[0]))
+        sim.check_collisions()
+        sim.state = "PLAYING"  # Keep going through enemy hits
+    return run
+
+def setup_level_reset(count):
+    level = playing_simulation(count).levels[0]
+    for slot in range(0, len(level.coins.items), 2):
+        level.coins.collect(slot)  # Half the coins collected, as after a partial run
+
+    def run():
+        level.reset()
+    return run
+
+def setup_render(count):
+    from src.game import GameManager
+    game = GameManager(levels=[synthetic_level(count)])
+    game.step(FrameInput(confirm=True))
+    frame = [0]
+
+    def run():
+        frame[0] += 1
+        game.step(walking_input(frame[0]))
+        game.state = "PLAYING"
+        game.render()
+    return run
+
+CASES = {
+    "player_update": setup_player_update,
+    "enemy_update": setup_enemy_update,
+    "check_collisions": setup_check_collisions,
+    "level_reset": setup_level_reset,
+    "render": setup_render,
+}
+
+def frames_for(count):
+    return max(5, min(300, FRAME_BUDGET // count))
+
+def measure(setup, count):
+    """Time one case at one size; allocations are measured in a separate traced pass."""
+    frames = frames_for(count)
+    run = setup(count)
+    run()  # Warm up caches and lazy indexes
+    start = time.perf_counter()
+    for _ in range(frames):
+        run()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    for _ in range(frames):
+        run()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "objects": count,
+        "frames": frames,
+        "us_per_frame": elapsed / frames * 1e6,
+        "peak_alloc_bytes": peak - before,
+        "net_alloc_bytes_per_frame": (after - before) / frames,
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_suite(sizes, cases):
+    results = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": sys.version.split()[0],
+        "pygame": pygame.version.ver,
+        "machine": platform.machine(),
+        "cases": {},
+    }
+    for name in cases:
+        curve = []
+        for count in sizes:
+            point = measure(CASES[name], count)
+            curve.append(point)
+            print(f"{name:>17} {count:>7} objects {point['us_per_frame']:>12.1f} us/frame "
+                  f"{point['peak_alloc_bytes'] / 1024:>9.1f} KiB peak", flush=True)
+        results["cases"][name] = curve
+    return results
+
+def main(argv):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--output", metavar="FILE", help="write results as JSON")
+    args = parser.parse_args(argv)
+    results = run_suite(args.sizes, args.cases)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
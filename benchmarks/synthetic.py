@@ -0,0 +1,20 @@
+import random
+from src.game_objects import Level, Platform, Enemy, Coin
+from src.constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+def make_level(platforms, enemies=0, coins=0, seed=0, width=SCREEN_WIDTH, height=SCREEN_HEIGHT):
+    """Build a Level with randomly scattered platforms, patrolling enemies and coins."""
+    rng = random.Random(seed)
+    level = Level()
+    level.platforms = [Platform(0, height - 20, width, 20)]  # Ground
+    for _ in range(platforms - 1):
+        level.platforms.append(Platform(rng.randrange(0, width - 60), rng.randrange(60, height - 60),
+                                        rng.randrange(40, 160), 20))
+    hosts = level.platforms[1:] or level.platforms
+    for i in range(enemies):
+        platform = hosts[i % len(hosts)]
+        level.enemies.append(Enemy(platform.x, platform.y - 20, 30, 20, platform))
+    level.coins = [Coin(rng.randrange(0, width - 20), rng.randrange(0, height - 40), 20, 20)
+                   for _ in range(coins)]
+    level.initial_coins = level.coins.copy()
+    return level
@@ -0,0 +1,91 @@
+from array import array
+
+class CollectibleStore:
+    """Fixed set of collectibles with O(1) collect, remaining count and reset.
+
+    Each item records the generation in which it was collected; an item is
+    collected only if that stamp equals the current generation, so resetting
+    the whole store is a single counter bump. Iterating and len() cover the
+    items that are still available, like the plain list they replace.
+    """
+    def __init__(self, items=()):
+        self.items = list(items)
+        self.collected_in = array("I", bytes(4 * len(self.items)))  # Generation stamp per item
+        self.generation = 1
+        self.remaining = len(self.items)
+        for slot, item in enumerate(self.items):
+            item.store = self
+            item.slot = slot
+
+    def __len__(self):
+        return self.remaining
+
+    def __bool__(self):
+        return self.remaining > 0
+
+    def __iter__(self):
+        stamps = self.collected_in
+        generation = self.generation
+        for slot, item in enumerate(self.items):
+            if stamps[slot] != generation:
+                yield item
+
+    def copy(self):
+        """Return a list of every item, collected or not."""
+        return list(self.items)
+
+    def is_collected(self, slot):
+        return self.collected_in[slot] == self.generation
+
+    def collect(self, slot):
+        """Mark an item collected; returns False if it already was."""
+        if self.collected_in[slot] == self.generation:
+            return False
+        self.collected_in[slot] = self.generation
+        self.remaining -= 1
+        return True
+
+    def restore(self, slot):
+        """Make a collected item available again."""
+        if self.collected_in[slot] == self.generation:
+            self.collected_in[slot] = 0
+            self.remaining += 1
+
+    def pack_bits(self, buffer, offset):
+        """Write one bit per item (set if collected) into buffer at offset; returns the offset after them."""
+        stamps = self.collected_in
+        generation = self.generation
+        count = len(self.items)
+        for start in range(0, count, 8):
+            byte = 0
+            for bit in range(min(8, count - start)):
+                if stamps[start + bit] == generation:
+                    byte |= 1 << bit
+            buffer[offset] = byte
+            offset += 1
+        return offset
+
+    def unpack_bits(self, data, offset):
+        """Make the collected items match pack_bits() output; returns the offset after it.
+
+        Costs one generation bump plus a step per collected item.
+        """
+        self.generation += 1  # Everything available again
+        stamps = self.collected_in
+        generation = self.generation
+        remaining = len(self.items)
+        size = (remaining + 7) // 8
+        for index in range(size):
+            byte = data[offset + index]
+            while byte:
+                low = byte & -byte
+                stamps[index * 8 + low.bit_length() - 1] = generation
+                remaining -= 1
+                byte ^= low
+        self.remaining = remaining
+        return offset + size
+
+    def reset(self):
+        """Make every item available again."""
+        self.generation += 1
+        self.remaining = len(self.items)
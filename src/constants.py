@@ -6,6 +6,9 @@ GRAVITY = 0.5
 PLAYER_JUMP_POWER = -10
 PLAYER_SPEED = 5
 POWERUP_DURATION = 3000 # 5 seconds in milliseconds
+POWERUP_JUMP_MULTIPLIER = 1.5
+
+STATES = ("START", "PLAYING", "GAME_OVER", "FINISHED")  # Simulation states
 
 # Colors
 WHITE = (255, 255, 255)
@@ -13,4 +16,32 @@ RED = (255, 0, 0)
 YELLOW = (255, 255, 0)
 BLACK = (0, 0, 0)
 DARK_BLUE = (0, 0, 50)
-DARK_GREEN = (0, 100, 0)
\ No newline at end of file
+DARK_GREEN = (0, 100, 0)
+# Broadphase grid cell size in pixels
+SPATIAL_CELL_SIZE = 64
+
+# Maximum number of rendered text surfaces kept by the HUD text cache
+TEXT_CACHE_SIZE = 128
+
+# Number of built levels kept in memory by the level loader
+LEVEL_CACHE_SIZE = 3
+
+# Frames kept in the profiler ring buffer
+PROFILER_FRAMES = 600
+
+# Large scrolling levels are split into square chunks of this many pixels
+CHUNK_SIZE = 512
+# Baked chunk surfaces kept by the scrolling renderer
+CHUNK_CACHE_SIZE = 16
+
+# Particles pooled by the effects system, their size in pixels and their gravity
+PARTICLE_CAPACITY = 50000
+PARTICLE_SIZE = 3
+PARTICLE_GRAVITY = 0.2
+# Above this many live particles they are written into the pixels instead of blitted
+PARTICLE_BLIT_LIMIT = 2000
+
+# Bytes of snapshots kept for rewinding (about 12 seconds of the built-in levels)
+REWIND_MEMORY = 48 * 1024
+# Levels whose snapshots leave less history than this in REWIND_MEMORY are played without rewind
+REWIND_MIN_SECONDS = 2
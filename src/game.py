@@ -1,216 +1,259 @@
 # src/game.py
+import argparse
+import sys
 import pygame
-from .game_objects import Player, LevelOne, LevelTwo, LevelThree
-from .constants import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, WHITE, RED, POWERUP_DURATION
+from .simulation import Simulation
+from .game_objects import convert_surface_cache
+from .physics import FixedTimestep
+from .inputs import read_keyboard, NO_INPUT
+from .rendering import DirtyRectRenderer, ChunkRenderer
+from .world import ChunkedLevel
+from .particles import ParticleSystem, emit_tick_events
+from .text_cache import TextCache
+from .level_format import LevelPack
+from .level_loader import LevelLoader
+from .replay import Recorder
+from .profiler import FrameProfiler, HANDLE_EVENTS, RENDER, DISPLAY_FLIP
+from .constants import SCREEN_WIDTH, SCREEN_HEIGHT, FPS, WHITE, RED, YELLOW
 
-class GameManager:
-    """Manages the game loop, states, and objects."""
-    def __init__(self):
+class GameManager(Simulation):
+    """Manages the window, keyboard and rendering on top of the game simulation."""
+    def __init__(self, levels=None, tick_rate=FPS):
         try:
-            pygame.init()
+            # Only the display; fonts start with the first rendered text and audio is never used
+            pygame.display.init()
         except Exception as e:
             print(f"Error initializing Pygame: {e}")
             raise
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Platformer Adventure")
         self.clock = pygame.time.Clock()
-        self.running = True
-        self.state = "START"  # START, PLAYING, GAME_OVER, FINISHED
-        self.levels = [LevelOne(), LevelTwo(), LevelThree()]
-        self.current_level_index = 0
-        self.player = Player(100, SCREEN_HEIGHT - 60, 40, 40)  # Start on ground
-        self.font = pygame.font.Font(None, 36)
-        self.total_coins = sum(len(level.coins) for level in self.levels)  # Total coins
-        self.level_coin_counts = [0] * len(self.levels)  # Coins collected per level
-        self.powerup_timer = 0  # Tracks power-up duration
-        self.powerup_active = False
-        self.start_time = 0  # Set to 0 before start
-        self.final_time = 0  # Store final time when game is finished
-
-    def reset_level(self):
-        """Reset player and levels, handle coin counts based on state."""
-        self.player.x = 100
-        self.player.y = SCREEN_HEIGHT - 60  # Start on ground
-        self.player.velocity_x = 0
-        self.player.velocity_y = 0
-        self.player.is_on_ground = True
-        self.player.jump_multiplier = 1  # Reset jump boost
-        self.powerup_timer = 0
-        self.powerup_active = False
-        if self.state == "START" or self.state == "FINISHED":
-            self.level_coin_counts = [0] * len(self.levels)  # Reset all coins
-        if self.state == "GAME_OVER":
-            self.level_coin_counts[self.current_level_index] = 0  # Reset current level coins
-        if self.state == "FINISHED":
-            self.start_time = pygame.time.get_ticks()  # Reset timer for new game
-        self.player.score = sum(self.level_coin_counts)  # Update score
-        for level in self.levels:
-            level.reset()  # Reset coins in all levels
+        super().__init__(levels=levels, tick_rate=tick_rate)  # Timers run on simulation ticks
+        self.convert_images()
+        self.enable_rewind()
+        self.interpolate = tick_rate != FPS  # Smooth motion when ticks and frames don't line up
+        self.alpha = 1.0  # Fraction of the next tick elapsed when rendering
+        self.confirm_pressed = False  # Key presses seen since the last step
+        self.restart_pressed = False
+        self.text = TextCache(size=36)
+        self.renderer = DirtyRectRenderer(self.screen)
+        self.chunk_renderer = ChunkRenderer(self.screen)
+        self.particles = ParticleSystem()  # Pickup, hit and level-change effects
+        self.show_profiler = False  # F3 overlay with frame timings
+        self.keep_profiler = False  # Keep timing with the overlay hidden (--profile)
+        self.overlay_text = TextCache(size=22)
+        self.overlay_lines = []
+
+    def convert_images(self):
+        """Convert images of objects built before the display existed, so blits skip format conversion."""
+        converted = convert_surface_cache()
+        if converted:
+            self.player.image = converted.get(self.player.image, self.player.image)
+            for level in self.loaded_levels():
+                level.convert_images(converted)
 
     def handle_events(self):
         """Process user input and window events."""
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 self.running = False
+            if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.renderer.invalidate()  # Window contents were lost
             if event.type == pygame.KEYDOWN:
-                if self.state == "START" and event.key == pygame.K_SPACE:
-                    self.reset_level()
-                    self.state = "PLAYING"
-                    self.start_time = pygame.time.get_ticks()  # Start time for timer
-                elif self.state == "PLAYING" and event.key == pygame.K_r:
-                    self.level_coin_counts[self.current_level_index] = 0  # Reset current level coins
-                    self.player.score = sum(self.level_coin_counts)  # Update score
-                    self.reset_level()  # Restart current level
-                elif self.state == "GAME_OVER" and event.key == pygame.K_SPACE:
-                    self.reset_level()  # Restart current level
-                    self.state = "PLAYING"
-                elif self.state == "FINISHED" and event.key == pygame.K_SPACE:
-                    self.reset_level()
-                    self.state = "PLAYING"
-                    self.current_level_index = 0
-
-    def check_collisions(self):
-        """Handle collisions between player and level objects."""
-        current_level = self.levels[self.current_level_index]
-        for platform in current_level.platforms:
-            if self.player.rect.colliderect(platform.rect):
-                overlap_left = (self.player.x + self.player.width) - platform.x
-                overlap_right = (platform.x + platform.width) - self.player.x
-                overlap_top = (self.player.y + self.player.height) - platform.y
-                overlap_bottom = (platform.y + platform.height) - self.player.y
-                min_overlap = min(overlap_left, overlap_right, overlap_top, overlap_bottom)
-                if min_overlap == overlap_top and self.player.velocity_y > 0:
-                    self.player.y = platform.y - self.player.height
-                    self.player.velocity_y = 0
-                    self.player.is_on_ground = True
-                elif min_overlap == overlap_bottom and self.player.velocity_y < 0:
-                    self.player.y = platform.y + platform.height
-                    self.player.velocity_y = 0
-                elif min_overlap == overlap_left and self.player.velocity_x > 0:
-                    self.player.x = platform.x - self.player.width
-                    self.player.velocity_x = 0
-                elif min_overlap == overlap_right and self.player.velocity_x < 0:
-                    self.player.x = platform.x + platform.width
-                    self.player.velocity_x = 0
-                self.player.rect.topleft = (self.player.x, self.player.y)
-
-        for enemy in current_level.enemies:
-            if self.player.rect.colliderect(enemy.rect):
-                self.state = "GAME_OVER"
-
-        for coin in current_level.coins[:]:
-            if not coin.collected and self.player.rect.colliderect(coin.rect):
-                self.level_coin_counts[self.current_level_index] += 1
-                self.player.score = sum(self.level_coin_counts)
-                coin.collected = True
-                current_level.coins.remove(coin)
-        
-        for powerup in current_level.power_ups[:]:
-            if not powerup.collected and self.player.rect.colliderect(powerup.rect):
-                powerup.collected = True
-                current_level.power_ups.remove(powerup)
-                self.player.jump_multiplier = 1.5  # Double jump height
-                self.powerup_timer = pygame.time.get_ticks()
-                self.powerup_active = True
-
-        # Manage power-up timer
-        if self.powerup_active:
-            if pygame.time.get_ticks() - self.powerup_timer > POWERUP_DURATION:
-                self.player.jump_multiplier = 1
-                self.powerup_active = False
-
-        # Transition to next level or finish
-        if self.state == "PLAYING" and not current_level.coins:
-            if self.current_level_index + 1 < len(self.levels):
-                self.current_level_index += 1
-                self.player.x = 100
-                self.player.y = SCREEN_HEIGHT - 20 - 40
-                self.player.velocity_x = 0
-                self.player.velocity_y = 0
-                self.player.is_on_ground = True
-                self.player.jump_multiplier = 1
-                self.powerup_timer = 0
-                self.powerup_active = False
-            else:
-                self.final_time = (pygame.time.get_ticks() - self.start_time) / 1000  # Store final time in seconds
-                self.state = "FINISHED"
+                if event.key == pygame.K_SPACE:
+                    self.confirm_pressed = True
+                elif event.key == pygame.K_r:
+                    self.restart_pressed = True
+                elif event.key == pygame.K_F3:
+                    self.toggle_profiler()
+
+    def toggle_profiler(self):
+        """Show or hide the frame-timing overlay; timing only runs while it is needed."""
+        self.show_profiler = not self.show_profiler
+        if self.show_profiler and self.profiler is None:
+            self.profiler = FrameProfiler()
+        elif not self.show_profiler and not self.keep_profiler:
+            self.profiler = None
+        self.overlay_lines = []
 
-    def update(self):
-        """Update game objects if in PLAYING state."""
-        if self.state == "PLAYING":
-            self.player.update()
-            for enemy in self.levels[self.current_level_index].enemies:
-                enemy.update()
-            self.check_collisions()
+    def read_input(self):
+        """Combine held keys and this frame's key presses into one FrameInput."""
+        rewind = bool(pygame.key.get_pressed()[pygame.K_BACKSPACE])  # Held to step back in time
+        inputs = read_keyboard()._replace(confirm=self.confirm_pressed, restart=self.restart_pressed, rewind=rewind)
+        self.confirm_pressed = False
+        self.restart_pressed = False
+        return inputs
+
+    def step(self, inputs=NO_INPUT):
+        """Advance one tick, then move the particles and start effects for the tick's events."""
+        level = self.levels[self.current_level_index]
+        super().step(inputs)
+        self.particles.update(self.dt)
+        if self.tick_events:
+            emit_tick_events(self.particles, self.tick_events, level, self.player)
+
+    def render_lag(self, obj):
+        """How far (x, y) obj is drawn behind its simulated position at the current alpha."""
+        previous = self.previous_positions.get(obj)
+        if previous is None:
+            return 0, 0
+        remaining = 1 - self.alpha
+        return (obj.x - previous[0]) * remaining, (obj.y - previous[1]) * remaining
 
     def render(self):
+        """Draw the frame and push it to the display."""
+        self.draw_frame()
+        if self.profiler is not None:
+            self.profiler.lap(RENDER)
+        # Static screens are only pushed when they change
+        self.renderer.present()
+        if self.profiler is not None:
+            self.profiler.lap(DISPLAY_FLIP)
+
+    def draw_profiler_overlay(self):
+        """Draw FPS, frame-time percentiles and the phase breakdown."""
+        if not self.overlay_lines or self.profiler.frames % 30 == 0:
+            self.overlay_lines = self.profiler.overlay_lines()  # Refreshed twice a second
+        for i, line in enumerate(self.overlay_lines):
+            self.renderer.blit(self.overlay_text.render(line, YELLOW), (10, 80 + i * 18))
+
+    def draw_frame(self):
         """Draw objects and UI based on game state."""
         current_level = self.levels[self.current_level_index]
-        self.screen.fill(current_level.background_color)
+        renderer = self.renderer
 
         if self.state == "START":
-            title_text = self.font.render("Platformer Adventure", True, WHITE)
-            start_text = self.font.render("Press SPACE to Start", True, WHITE)
-            self.screen.blit(title_text, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 50))
-            self.screen.blit(start_text, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2))
+            if renderer.begin(self.state, current_level, show_platforms=False):
+                title_text = self.text.render("Platformer Adventure", WHITE)
+                start_text = self.text.render("Press SPACE to Start", WHITE)
+                renderer.blit(title_text, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 - 50))
+                renderer.blit(start_text, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2))
 
         elif self.state == "PLAYING":
-            self.player.draw(self.screen)
-            for platform in current_level.platforms:
-                platform.draw(self.screen)
-            for enemy in current_level.enemies:
-                enemy.draw(self.screen)
-            for coin in current_level.coins:
-                if not coin.collected:
-                    coin.draw(self.screen)
-            for powerup in current_level.power_ups:
-                if not powerup.collected:
-                    powerup.draw(self.screen)
-            score_text = self.font.render(f"Coins: {self.player.score}/{self.total_coins}", True, WHITE)
-            level_text = self.font.render(f"Level {self.current_level_index + 1}", True, WHITE)
-            self.screen.blit(score_text, (10, 10))
-            self.screen.blit(level_text, (SCREEN_WIDTH - 100, 10))
+            if isinstance(current_level, ChunkedLevel):
+                # Scrolling level: the whole screen changes as the camera moves
+                renderer.begin_full(self.state, current_level)
+                self.chunk_renderer.draw(current_level, self.camera, self.player,
+                                         self.render_lag if self.interpolate else None)
+                self.particles.draw(self.screen, self.camera.x, self.camera.y)
+            else:
+                # Platforms and background come from the baked static layer
+                renderer.begin(self.state, current_level)
+                if self.interpolate:
+                    renderer.draw(self.player, *self.render_lag(self.player))
+                    for enemy in current_level.enemies:
+                        renderer.draw(enemy, *self.render_lag(enemy))
+                else:
+                    renderer.draw(self.player)
+                    for enemy in current_level.enemies:
+                        renderer.draw(enemy)
+                for coin in current_level.coins:
+                    if not coin.collected:
+                        renderer.draw(coin)
+                for powerup in current_level.power_ups:
+                    if not powerup.collected:
+                        renderer.draw(powerup)
+                particle_rect = self.particles.draw(self.screen)
+                if particle_rect is not None:
+                    renderer.add_rect(particle_rect)
+            score_text = self.text.render(f"Coins: {self.player.score}/{self.total_coins}", WHITE)
+            level_text = self.text.render(f"Level {self.current_level_index + 1}", WHITE)
+            renderer.blit(score_text, (10, 10))
+            renderer.blit(level_text, (SCREEN_WIDTH - 100, 10))
             # Display timer
-            elapsed_time = (pygame.time.get_ticks() - self.start_time) / 1000  # Seconds with decimals
-            timer_text = self.font.render(f"Time: {elapsed_time:.2f}s", True, WHITE)
-            self.screen.blit(timer_text, (SCREEN_WIDTH // 2 - 50, 40))
+            elapsed_time = (self.get_ticks() - self.start_time) / 1000  # Seconds with decimals
+            renderer.add_rect(self.text.draw_glyphs(self.screen, f"Time: {elapsed_time:.2f}s", WHITE,
+                                                    (SCREEN_WIDTH // 2 - 50, 40)))
             # Display restart instruction
-            restart_text = self.font.render("Press R to Restart", True, WHITE)
-            self.screen.blit(restart_text, (SCREEN_WIDTH // 2 - 80, 10))
+            restart_text = self.text.render("Press R to Restart", WHITE)
+            renderer.blit(restart_text, (SCREEN_WIDTH // 2 - 80, 10))
+            if self.show_profiler:
+                self.draw_profiler_overlay()
 
         elif self.state == "GAME_OVER":
-            game_over_text = self.font.render("Game Over", True, RED)
-            score_text = self.font.render(f"Total Coins: {self.player.score}/{self.total_coins}", True, WHITE)
-            restart_text = self.font.render("Press SPACE to Restart", True, WHITE)
-            self.screen.blit(game_over_text, (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2 - 50))
-            self.screen.blit(score_text, (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2))
-            self.screen.blit(restart_text, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 50))
+            if self.particles.count:
+                # Redraw in full while the hit effect plays; the static screen returns after it
+                renderer.begin_full(self.state, current_level)
+                self.screen.fill(current_level.background_color)
+                self.particles.draw(self.screen, self.camera.x, self.camera.y)
+                renderer.invalidate()
+                redraw = True
+            else:
+                redraw = renderer.begin(self.state, current_level, show_platforms=False)
+            if redraw:
+                game_over_text = self.text.render("Game Over", RED)
+                score_text = self.text.render(f"Total Coins: {self.player.score}/{self.total_coins}", WHITE)
+                restart_text = self.text.render("Press SPACE to Restart", WHITE)
+                renderer.blit(game_over_text, (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2 - 50))
+                renderer.blit(score_text, (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2))
+                renderer.blit(restart_text, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 50))
+                if self.rewind_buffer:  # Nothing to rewind on levels too big to keep history for
+                    rewind_text = self.text.render("Hold BACKSPACE to Rewind", WHITE)
+                    renderer.blit(rewind_text, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 100))
 
         elif self.state == "FINISHED":
-            win_text = self.font.render("You Win!", True, WHITE)
-            score_text = self.font.render(f"Total Coins: {self.player.score}/{self.total_coins}", True, WHITE)
-            replay_text = self.font.render("Press SPACE to Replay", True, WHITE)
-            self.screen.blit(win_text, (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2 - 50))
-            self.screen.blit(score_text, (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2))
-            # Display final time
-            timer_text = self.font.render(f"Time: {self.final_time:.2f}s", True, WHITE)
-            self.screen.blit(timer_text, (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2 + 50))
-            self.screen.blit(replay_text, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 100))
-
-        pygame.display.flip()
+            if renderer.begin(self.state, current_level, show_platforms=False):
+                win_text = self.text.render("You Win!", WHITE)
+                score_text = self.text.render(f"Total Coins: {self.player.score}/{self.total_coins}", WHITE)
+                replay_text = self.text.render("Press SPACE to Replay", WHITE)
+                renderer.blit(win_text, (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2 - 50))
+                renderer.blit(score_text, (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2))
+                # Display final time
+                timer_text = self.text.render(f"Time: {self.final_time:.2f}s", WHITE)
+                renderer.blit(timer_text, (SCREEN_WIDTH // 2 - 50, SCREEN_HEIGHT // 2 + 50))
+                renderer.blit(replay_text, (SCREEN_WIDTH // 2 - 100, SCREEN_HEIGHT // 2 + 100))
 
     def run(self):
-        """Main game loop."""
+        """Main game loop: render every frame and run as many ticks as real time calls for.
+
+        At the frame rate itself every frame runs exactly one tick, as clock.tick
+        paces frames; other tick rates take their ticks from a FixedTimestep and
+        interpolate.
+        """
+        timestep = FixedTimestep(self.tick_rate) if self.interpolate else None
+        elapsed = 1 / FPS
         while self.running:
+            if self.profiler is not None:
+                self.profiler.begin_frame()
             self.handle_events()
-            self.update()
+            if self.profiler is not None:
+                self.profiler.lap(HANDLE_EVENTS)
+            if timestep is None:
+                self.step(self.read_input())
+            else:
+                # Several ticks after a slow frame, none if a frame came early
+                for _ in range(timestep.advance(elapsed)):
+                    self.step(self.read_input())
+                self.alpha = timestep.alpha
             self.render()
-            self.clock.tick(FPS)
+            elapsed = self.clock.tick(FPS) / 1000
         pygame.quit()
 
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Platformer Adventure")
+    parser.add_argument("pack", nargs="?", help="compiled level pack to play instead of the built-in levels")
+    parser.add_argument("--record", metavar="FILE", help="save an input recording of the session to FILE")
+    parser.add_argument("--profile", metavar="PREFIX",
+                        help="time every frame and write PREFIX.csv and PREFIX.trace.json on exit")
+    parser.add_argument("--tick-rate", type=int, default=FPS,
+                        help=f"physics ticks per second (default {FPS}); frames are still drawn at up to {FPS} FPS")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
     try:
-        game = GameManager()
+        levels = LevelLoader(LevelPack(args.pack)) if args.pack else None
+        game = GameManager(levels, tick_rate=args.tick_rate)
+        if args.record:
+            game.recorder = Recorder()
+        if args.profile:
+            game.profiler = FrameProfiler()
+            game.keep_profiler = True
         game.run()
+        if args.record:
+            game.recorder.save(args.record, game)
+        if args.profile:
+            game.profiler.export_csv(args.profile + ".csv")
+            game.profiler.export_chrome_trace(args.profile + ".trace.json")
     except Exception as e:
         print(f"Game failed to start: {e}")
\ No newline at end of file
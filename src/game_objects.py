@@ -1,26 +1,82 @@
 # src/game_objects.py
 import pygame
-from .constants import SCREEN_WIDTH, SCREEN_HEIGHT, GRAVITY, PLAYER_JUMP_POWER, PLAYER_SPEED, BLACK, DARK_BLUE, DARK_GREEN
+from .inputs import read_keyboard
+from .spatial import SpatialHash
+from .collectibles import CollectibleStore
+from .constants import SPATIAL_CELL_SIZE, SCREEN_WIDTH, SCREEN_HEIGHT, GRAVITY, PLAYER_JUMP_POWER, PLAYER_SPEED, BLACK, DARK_BLUE, DARK_GREEN
+
+# Shared filled surfaces keyed by (size, color, pixel format)
+_surface_cache = {}
+
+def display_format():
+    """Return a hashable description of the display pixel format, or None without a display."""
+    display = pygame.display.get_surface()
+    if display is None:
+        return None
+    return (display.get_bitsize(), display.get_masks())
+
+def get_surface(size, color):
+    """Return a shared surface of the given size filled with color.
+
+    Objects of the same size and color all use one image, so images must be
+    treated as read-only.
+    """
+    pixel_format = display_format()
+    key = (size, color, pixel_format)
+    surface = _surface_cache.get(key)
+    if surface is None:
+        surface = pygame.Surface(size)
+        if pixel_format is not None:
+            surface = surface.convert()
+        surface.fill(color)
+        _surface_cache[key] = surface
+    return surface
+
+def convert_surface_cache():
+    """Convert shared surfaces made before the display existed to its pixel format.
+
+    Returns a dict mapping each old surface to its converted replacement, for
+    swapping the images of objects built earlier (see Level.convert_images).
+    """
+    pixel_format = display_format()
+    converted = {}
+    if pixel_format is None:
+        return converted
+    for key, surface in list(_surface_cache.items()):
+        size, color, surface_format = key
+        if surface_format is None:
+            del _surface_cache[key]
+            converted[surface] = get_surface(size, color)
+    return converted
+
+def clear_surface_cache():
+    """Drop all shared surfaces (e.g. after the display mode changes)."""
+    _surface_cache.clear()
 
 class GameObject:
     """Base class for game objects with position and rendering."""
+    __slots__ = ("x", "y", "width", "height", "rect", "image")
+
     def __init__(self, x, y, width, height, color=(255, 255, 255)):
         self.x = x
         self.y = y
         self.width = width
         self.height = height
         self.rect = pygame.Rect(x, y, width, height)
-        self.image = pygame.Surface((width, height))
-        self.image.fill(color)
+        self.image = get_surface((width, height), color)
 
-    def draw(self, screen):
-        screen.blit(self.image, (self.x, self.y))
+    def draw(self, screen, camera_x=0, camera_y=0):
+        """Blit the object (offset by the camera) and return the screen area it covered."""
+        return screen.blit(self.image, (self.x - camera_x, self.y - camera_y))
 
     def update(self):
         pass
 
 class Player(GameObject):
     """Player character with movement and jumping."""
+    __slots__ = ("velocity_x", "velocity_y", "jump_power", "gravity", "is_on_ground", "score", "jump_multiplier",
+                 "world_width", "world_height")
+
     def __init__(self, x, y, width, height):
         super().__init__(x, y, width, height, color=(255, 255, 255))  # White
         self.velocity_x = 0
@@ -30,94 +86,187 @@ class Player(GameObject):
         self.is_on_ground = False
         self.score = 0
         self.jump_multiplier = 1  # For jump boost power-ups
+        self.world_width = SCREEN_WIDTH  # Size of the current level
+        self.world_height = SCREEN_HEIGHT
 
-    def update(self):
-        keys = pygame.key.get_pressed()
+    def update(self, inputs=None, dt=1):
+        """Advance one tick using a FrameInput, or the keyboard if none is given.
+
+        dt is the tick length in 1/FPS units, so speeds stay the same at other tick rates.
+        """
+        if inputs is None:
+            inputs = read_keyboard()
         dx = 0
-        if keys[pygame.K_LEFT]:
+        if inputs.left:
             dx -= PLAYER_SPEED
-        if keys[pygame.K_RIGHT]:
+        if inputs.right:
             dx += PLAYER_SPEED
         self.velocity_x = dx
 
-        if keys[pygame.K_UP] and self.is_on_ground:
+        if inputs.jump and self.is_on_ground:
             self.velocity_y = self.jump_power * self.jump_multiplier
             self.is_on_ground = False
 
-        self.velocity_y += self.gravity
+        self.velocity_y += self.gravity * dt
         if self.velocity_y > 10:
             self.velocity_y = 10
+            fall = self.velocity_y * dt
+        else:
+            # Exact under constant gravity: one long tick covers the same distance as dt short ones
+            fall = self.velocity_y * dt - self.gravity * dt * (dt - 1) / 2
 
-        self.x += self.velocity_x
-        self.y += self.velocity_y
+        self.x += self.velocity_x * dt
+        self.y += fall
 
         # Prevent walking off edges
         if self.x < 0:
             self.x = 0
-        elif self.x + self.width > SCREEN_WIDTH:
-            self.x = SCREEN_WIDTH - self.width
+        elif self.x + self.width > self.world_width:
+            self.x = self.world_width - self.width
         if self.y < 0:
             self.y = 0
-        elif self.y + self.height > SCREEN_HEIGHT:
-            self.y = SCREEN_HEIGHT - self.height
+        elif self.y + self.height > self.world_height:
+            self.y = self.world_height - self.height
 
         self.rect.topleft = (self.x, self.y)
 
 class Platform(GameObject):
     """Static platform for player to stand on."""
+    __slots__ = ()
+
     def __init__(self, x, y, width, height):
         super().__init__(x, y, width, height, color=(255, 255, 255))  # White
 
 class Enemy(GameObject):
     """Enemy that patrols a platform."""
+    __slots__ = ("velocity_x", "platform")
+
     def __init__(self, x, y, width, height, platform):
         super().__init__(x, y, width, height, color=(255, 0, 0))  # Red
         self.velocity_x = 2
         self.platform = platform
 
-    def update(self):
-        self.x += self.velocity_x
+    def update(self, dt=1):
+        self.x += self.velocity_x * dt
         if self.x < self.platform.x or self.x + self.width > self.platform.x + self.platform.width:
             self.velocity_x = -self.velocity_x
         self.rect.topleft = (self.x, self.y)
 
 class FastEnemy(Enemy):
     """Faster enemy that patrols a platform."""
+    __slots__ = ()
+
     def __init__(self, x, y, width, height, platform):
         super().__init__(x, y, width, height, platform)
         self.velocity_x = 4  # Faster than Enemy
 
-class Coin(GameObject):
+class Collectible(GameObject):
+    """Object the player picks up once; state lives in a CollectibleStore when it belongs to one."""
+    __slots__ = ("store", "slot", "_collected")
+
+    def __init__(self, x, y, width, height, color):
+        super().__init__(x, y, width, height, color=color)
+        self.store = None
+        self.slot = 0
+        self._collected = False
+
+    @property
+    def collected(self):
+        if self.store is None:
+            return self._collected
+        return self.store.is_collected(self.slot)
+
+    @collected.setter
+    def collected(self, value):
+        if self.store is None:
+            self._collected = value
+        elif value:
+            self.store.collect(self.slot)
+        else:
+            self.store.restore(self.slot)
+
+class Coin(Collectible):
     """Collectible coin that increases score."""
+    __slots__ = ()
+
     def __init__(self, x, y, width, height):
         super().__init__(x, y, width, height, color=(255, 255, 0))  # Yellow
-        self.collected = False
 
-class PowerUp(GameObject):
+class PowerUp(Collectible):
     """Temporary jump boost power-up."""
+    __slots__ = ()
+
     def __init__(self, x, y, width, height):
         super().__init__(x, y, width, height, color=(0, 0, 255))  # Blue
-        self.collected = False
 
 class Level:
     """Base class for managing level-specific objects."""
     def __init__(self):
+        # Broadphase grids, built on first use by build_index()
+        self.platform_index = None
+        self.enemy_index = None
+        self.coin_index = None
+        self.power_up_index = None
+        self.thinnest_platform = None  # Smallest platform width and height, for skipping collision sweeps
         self.platforms = []
         self.enemies = []
-        self.coins = []
+        self.coins = []  # Store of coins, assigned as a list
         self.power_ups = []  # Store power-ups
         self.initial_coins = []  # Store initial coin configurations
         self.initial_power_ups = []  # Store initial power-ups
         self.background_color = BLACK
+        self.width = SCREEN_WIDTH  # Level size; larger levels scroll (see world.ChunkedLevel)
+        self.height = SCREEN_HEIGHT
+
+    def build_index(self, cell_size=SPATIAL_CELL_SIZE):
+        """Build the broadphase grids for this level's objects."""
+        self.platform_index = SpatialHash(self.platforms, cell_size)
+        self.thinnest_platform = (min((p.width for p in self.platforms), default=float("inf")),
+                                  min((p.height for p in self.platforms), default=float("inf")))
+        self.enemy_index = SpatialHash(self.enemies, cell_size)
+        self.coin_index = SpatialHash(self.coins.items, cell_size)
+        self.power_up_index = SpatialHash(self.power_ups.items, cell_size)
+
+    @property
+    def coins(self):
+        """Coins still to collect, as a CollectibleStore."""
+        return self._coins
+
+    @coins.setter
+    def coins(self, items):
+        self._coins = CollectibleStore(items)
+        if self.coin_index is not None:
+            self.coin_index = SpatialHash(self._coins.items, self.coin_index.cell_size)
+
+    @property
+    def power_ups(self):
+        """Power-ups still to collect, as a CollectibleStore."""
+        return self._power_ups
+
+    @power_ups.setter
+    def power_ups(self, items):
+        self._power_ups = CollectibleStore(items)
+        if self.power_up_index is not None:
+            self.power_up_index = SpatialHash(self._power_ups.items, self.power_up_index.cell_size)
+
+    def awake_enemies(self, view, dt=1):
+        """Return the enemies to update this tick; all of them in a one-screen level."""
+        return self.enemies
+
+    def convert_images(self, converted):
+        """Swap object images for their display-format versions from convert_surface_cache()."""
+        for group in (self.platforms, self.enemies, self.coins.items, self.power_ups.items):
+            for obj in group:
+                obj.image = converted.get(obj.image, obj.image)
 
     def get_objects(self):
         """Return all objects for rendering and updating."""
         return [self.platforms, self.enemies, self.coins, self.power_ups]
 
     def reset(self):
-        """Reset objects to initial state."""
-        self.coins = [Coin(coin.x, coin.y, coin.width, coin.height) for coin in self.initial_coins]
-        self.power_ups = [PowerUp(pu.x, pu.y, pu.width, pu.height) for pu in self.initial_power_ups]
+        """Reset objects to initial state; collectibles are reused, not rebuilt."""
+        self.coins.reset()
+        self.power_ups.reset()
 
 class LevelOne(Level):
     """First level configuration."""
@@ -0,0 +1,16 @@
+import pygame
+from collections import namedtuple
+
+# Input for a single simulation tick. left/right/jump/rewind are held keys,
+# confirm (SPACE) and restart (R) are key presses that happened this tick.
+FrameInput = namedtuple("FrameInput", ["left", "right", "jump", "confirm", "restart", "rewind"],
+                        defaults=(False, False, False, False, False, False))
+
+NO_INPUT = FrameInput()
+
+def read_keyboard():
+    """Build a FrameInput from the currently held arrow keys."""
+    keys = pygame.key.get_pressed()
+    return FrameInput(left=bool(keys[pygame.K_LEFT]),
+                      right=bool(keys[pygame.K_RIGHT]),
+                      jump=bool(keys[pygame.K_UP]))
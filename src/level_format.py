@@ -0,0 +1,192 @@
+"""Level files: editable JSON sources and a compact compiled binary pack.
+
+JSON source (one level per file)::
+
+    {
+      "background_color": [0, 0, 50],
+      "width": 4000, "height": 600,      (optional, larger levels scroll)
+      "platforms": [[x, y, width, height], ...],
+      "enemies": [{"rect": [x, y, width, height], "platform": 1, "fast": false}, ...],
+      "coins": [[x, y, width, height], ...],
+      "power_ups": [[x, y, width, height], ...]
+    }
+
+Compiled pack layout (little-endian)::
+
+    header   "PLVK", version u16, level count u32
+    index    per level: offset u32, size u32, coin count u32
+    records  per level: background RGB (3 x u8), level width and height
+             (2 x u32), platform/enemy/coin/power-up counts (4 x u32), then
+             int32 rects; enemies add platform index and a fast flag as two
+             more int32 values
+
+Compile with: python -m src.level_format compile levels/*.json -o levels.pak
+"""
+import json
+import mmap
+import struct
+import sys
+from .game_objects import Level, Platform, Enemy, FastEnemy, Coin, PowerUp
+from .world import ChunkedLevel
+from .constants import SCREEN_WIDTH, SCREEN_HEIGHT
+
+MAGIC = b"PLVK"
+VERSION = 2
+HEADER = struct.Struct("<4sHI")
+INDEX_ENTRY = struct.Struct("<III")
+RECORD_HEADER = struct.Struct("<3B2I4I")
+RECT = struct.Struct("<4i")
+ENEMY = struct.Struct("<6i")
+
+def level_to_dict(level):
+    """Describe a Level object as a JSON-compatible dict."""
+    def rect(obj):
+        return [obj.x, obj.y, obj.width, obj.height]
+    data = {"background_color": list(level.background_color)}
+    if (level.width, level.height) != (SCREEN_WIDTH, SCREEN_HEIGHT):
+        data["width"] = level.width
+        data["height"] = level.height
+    data.update({
+        "platforms": [rect(p) for p in level.platforms],
+        "enemies": [{"rect": rect(e), "platform": level.platforms.index(e.platform),
+                     "fast": isinstance(e, FastEnemy)} for e in level.enemies],
+        "coins": [rect(c) for c in level.coins.items],
+        "power_ups": [rect(p) for p in level.power_ups.items],
+    })
+    return data
+
+def level_from_dict(data):
+    """Build a Level from a dict in the JSON source format."""
+    width = data.get("width", SCREEN_WIDTH)
+    height = data.get("height", SCREEN_HEIGHT)
+    if width > SCREEN_WIDTH or height > SCREEN_HEIGHT:
+        level = ChunkedLevel(width, height)
+    else:
+        level = Level()
+    level.background_color = tuple(data.get("background_color", (0, 0, 0)))
+    level.platforms = [Platform(*rect) for rect in data.get("platforms", [])]
+    for enemy in data.get("enemies", []):
+        enemy_class = FastEnemy if enemy.get("fast") else Enemy
+        level.enemies.append(enemy_class(*enemy["rect"], level.platforms[enemy["platform"]]))
+    level.coins = [Coin(*rect) for rect in data.get("coins", [])]
+    level.power_ups = [PowerUp(*rect) for rect in data.get("power_ups", [])]
+    level.initial_coins = level.coins.copy()
+    level.initial_power_ups = level.power_ups.copy()
+    return level
+
+def load_level_json(path):
+    """Load one level from a JSON source file."""
+    with open(path) as f:
+        return level_from_dict(json.load(f))
+
+def encode_level(data):
+    """Encode a level dict as one binary record."""
+    platforms = data.get("platforms", [])
+    enemies = data.get("enemies", [])
+    coins = data.get("coins", [])
+    power_ups = data.get("power_ups", [])
+    parts = [RECORD_HEADER.pack(*data.get("background_color", (0, 0, 0)),
+                                data.get("width", SCREEN_WIDTH), data.get("height", SCREEN_HEIGHT),
+                                len(platforms), len(enemies), len(coins), len(power_ups))]
+    parts += [RECT.pack(*rect) for rect in platforms]
+    parts += [ENEMY.pack(*e["rect"], e["platform"], int(bool(e.get("fast")))) for e in enemies]
+    parts += [RECT.pack(*rect) for rect in coins]
+    parts += [RECT.pack(*rect) for rect in power_ups]
+    return b"".join(parts)
+
+def decode_level(buffer, offset=0):
+    """Decode the binary record at offset into a level dict."""
+    (red, green, blue, width, height,
+     n_platforms, n_enemies, n_coins, n_power_ups) = RECORD_HEADER.unpack_from(buffer, offset)
+    offset += RECORD_HEADER.size
+
+    def rects(count):
+        nonlocal offset
+        result = [list(r) for r in RECT.iter_unpack(buffer[offset:offset + count * RECT.size])]
+        offset += count * RECT.size
+        return result
+
+    platforms = rects(n_platforms)
+    enemies = []
+    for values in ENEMY.iter_unpack(buffer[offset:offset + n_enemies * ENEMY.size]):
+        enemies.append({"rect": list(values[:4]), "platform": values[4], "fast": bool(values[5])})
+    offset += n_enemies * ENEMY.size
+    coins = rects(n_coins)
+    power_ups = rects(n_power_ups)
+    data = {"background_color": [red, green, blue]}
+    if (width, height) != (SCREEN_WIDTH, SCREEN_HEIGHT):
+        data["width"] = width
+        data["height"] = height
+    data.update({"platforms": platforms, "enemies": enemies, "coins": coins, "power_ups": power_ups})
+    return data
+
+def compile_levels(levels, out_path):
+    """Write level dicts (in play order) to a compiled pack file."""
+    records = [encode_level(data) for data in levels]
+    offset = HEADER.size + INDEX_ENTRY.size * len(records)
+    index = []
+    for data, record in zip(levels, records):
+        index.append(INDEX_ENTRY.pack(offset, len(record), len(data.get("coins", []))))
+        offset += len(record)
+    with open(out_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, len(records)))
+        f.write(b"".join(index))
+        f.write(b"".join(records))
+
+class LevelPack:
+    """Read-only, memory-mapped view of a compiled level pack.
+
+    Opening a pack only reads the header and index; level records are paged in
+    by the OS when a level is decoded.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = HEADER.unpack_from(self.data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} level pack")
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def entry(self, index):
+        """Return (offset, size, coin count) for a level."""
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return INDEX_ENTRY.unpack_from(self.data, HEADER.size + index * INDEX_ENTRY.size)
+
+    def coin_counts(self):
+        """Return the number of coins in every level, read from the index only."""
+        end = HEADER.size + self.count * INDEX_ENTRY.size
+        return [entry[2] for entry in INDEX_ENTRY.iter_unpack(self.data[HEADER.size:end])]
+
+    def level_dict(self, index):
+        """Decode one level's record into a dict."""
+        offset, _, _ = self.entry(index)
+        return decode_level(self.data, offset)
+
+    def load(self, index):
+        """Build a fresh Level object for one level."""
+        return level_from_dict(self.level_dict(index))
+
+    def close(self):
+        self.data.close()
+
+def main(argv):
+    if len(argv) >= 4 and argv[0] == "compile" and "-o" in argv:
+        out_index = argv.index("-o")
+        sources = argv[1:out_index] + argv[out_index + 2:]
+        levels = []
+        for path in sources:
+            with open(path) as f:
+                levels.append(json.load(f))
+        compile_levels(levels, argv[out_index + 1])
+        print(f"Compiled {len(levels)} levels to {argv[out_index + 1]}")
+        return 0
+    print("Usage: python -m src.level_format compile LEVEL.json [...] -o PACK")
+    return 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
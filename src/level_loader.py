@@ -0,0 +1,67 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from .constants import LEVEL_CACHE_SIZE
+
+class LevelLoader:
+    """Sequence of levels built on demand from a LevelPack.
+
+    Indexing builds the Level the first time it is needed, keeps the most
+    recently used ones in a small cache, and prefetches the following level
+    on a background thread.
+    """
+    def __init__(self, pack, cache_size=LEVEL_CACHE_SIZE, prefetch=True):
+        self.pack = pack
+        self.cache_size = cache_size
+        self.cache = OrderedDict()  # index -> Level, least recently used first
+        self.pending = {}  # index -> Future of a background load
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        self.coin_counts = pack.coin_counts()
+
+    def __len__(self):
+        return len(self.pack)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        with self.lock:
+            level = self.cache.get(index)
+            if level is not None:
+                self.cache.move_to_end(index)
+            future = self.pending.pop(index, None)
+        if level is None:
+            level = future.result() if future is not None else self.pack.load(index)
+            self._store(index, level)
+        self.prefetch(index + 1)
+        return level
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def prefetch(self, index):
+        """Start building a level in the background if it is not cached yet."""
+        if self.executor is None or not 0 <= index < len(self):
+            return
+        with self.lock:
+            if index in self.cache or index in self.pending:
+                return
+            self.pending[index] = self.executor.submit(self.pack.load, index)
+
+    def cached_levels(self):
+        """Return the levels currently held in memory."""
+        with self.lock:
+            return list(self.cache.values())
+
+    def _store(self, index, level):
+        with self.lock:
+            self.cache[index] = level
+            self.cache.move_to_end(index)
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True)
+        self.pack.close()
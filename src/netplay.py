@@ -0,0 +1,494 @@
+"""Authoritative multiplayer over UDP: rooms of players racing through the same levels.
+
+The server runs every room at FPS. Clients send their FrameInput bits each
+tick (repeating the last few in case a datagram is lost) and acknowledge the
+newest snapshot they hold. Snapshots flatten a room into a list of integers
+(level, players, enemies, collected bitsets) and are sent as varint deltas
+against the state the client acknowledged, or in full when the server no
+longer has that state.
+
+Clients predict their own player with Player.update and platform collisions,
+then reconcile when a snapshot shows where the server put them: the player is
+reset to the server's state and the inputs the server has not processed yet
+are replayed.
+
+Positions and velocities move in half pixels at 60 Hz, so they are sent as
+integers in units of 1/FIXED pixel and round-trip exactly.
+
+Run a server with: python -m src.netplay --port 7777
+"""
+import argparse
+import asyncio
+import struct
+import sys
+import time
+from collections import OrderedDict, deque
+from .simulation import Simulation
+from .game_objects import Player
+from .inputs import NO_INPUT
+from .replay import INPUT_TABLE, input_bits, write_varint, read_varint
+from .constants import FPS, SCREEN_HEIGHT, POWERUP_JUMP_MULTIPLIER
+
+JOIN, WELCOME, FULL, INPUT, LEAVE, SNAPSHOT = range(1, 7)
+JOIN_MESSAGE = struct.Struct("<BI")  # type, room
+WELCOME_MESSAGE = struct.Struct("<BBI")  # type, player id, room
+INPUT_MESSAGE = struct.Struct("<BIIB")  # type, newest input seq, acked snapshot tick, input count; then bits
+SNAPSHOT_MESSAGE = struct.Struct("<BIII")  # type, tick, base tick (0 = full), last input seq processed
+
+FIXED = 2  # Units per pixel for positions and velocities
+PLAYER_FIELDS = 7  # id, x, y, velocity x, velocity y, flags, score
+BITSET_WORD = 30  # Collected flags per integer, keeping each varint within five bytes
+HISTORY = 64  # Snapshots kept for delta encoding, per room and per client
+ROOM_SIZE = 8
+REDUNDANT_INPUTS = 4  # Inputs repeated in every input message
+MAX_QUEUED_INPUTS = 8  # Inputs buffered per player before the oldest are dropped
+INPUT_MASK = len(INPUT_TABLE) - 1  # Bits a FrameInput can set; the rest of a received byte is ignored
+CLIENT_TIMEOUT = 5 * FPS  # Ticks without a message before a player is dropped
+
+def zigzag(value):
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+def unzigzag(value):
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+def encode_delta(state, base):
+    """Encode the fields of state that differ from base as (gap, zigzag difference) varints."""
+    changes = bytearray()
+    count = 0
+    last = -1
+    for index, value in enumerate(state):
+        if value != base[index]:
+            write_varint(changes, index - last - 1)
+            write_varint(changes, zigzag(value - base[index]))
+            last = index
+            count += 1
+    out = bytearray()
+    write_varint(out, len(state))
+    write_varint(out, count)
+    return bytes(out + changes)
+
+def decode_delta(data, offset, base):
+    """Apply an encode_delta payload to base (None for a full state) and return the new state."""
+    length, offset = read_varint(data, offset)
+    count, offset = read_varint(data, offset)
+    state = list(base) if base is not None else [0] * length
+    index = -1
+    for _ in range(count):
+        gap, offset = read_varint(data, offset)
+        difference, offset = read_varint(data, offset)
+        index += gap + 1
+        state[index] += unzigzag(difference)
+    return state
+
+def collected_words(store):
+    """Pack which items of a CollectibleStore are collected into BITSET_WORD-bit integers."""
+    words = []
+    for start in range(0, len(store.items), BITSET_WORD):
+        word = 0
+        for bit in range(min(BITSET_WORD, len(store.items) - start)):
+            if store.is_collected(start + bit):
+                word |= 1 << bit
+        words.append(word)
+    return words
+
+def apply_collected_words(store, words):
+    """Make a CollectibleStore match collected_words() taken elsewhere."""
+    for slot in range(len(store.items)):
+        if words[slot // BITSET_WORD] >> (slot % BITSET_WORD) & 1:
+            store.collect(slot)
+        else:
+            store.restore(slot)
+
+def bitset_length(count):
+    return (count + BITSET_WORD - 1) // BITSET_WORD
+
+def respawn(player):
+    player.x = 100
+    player.y = SCREEN_HEIGHT - 60  # Start on ground
+    player.velocity_x = 0
+    player.velocity_y = 0
+    player.is_on_ground = True
+    player.jump_multiplier = 1
+    player.rect.topleft = (player.x, player.y)
+
+class PlayerSlot:
+    """A connected player: its Player, the per-player game state and its input queue."""
+    def __init__(self, player_id, address, level_count):
+        self.id = player_id
+        self.address = address
+        self.player = Player(100, SCREEN_HEIGHT - 60, 40, 40)
+        self.level_coin_counts = [0] * level_count
+        self.powerup_timer = 0
+        self.powerup_active = False
+        self.queue = deque()  # (seq, bits) not yet simulated
+        self.newest_seq = 0  # Newest input seq received
+        self.processed_seq = 0  # Newest input seq simulated
+        self.held = NO_INPUT  # Input repeated when the queue runs dry
+        self.acked = 0  # Newest snapshot tick the client has acknowledged
+        self.last_heard = 0
+
+    def receive_inputs(self, seq, bits):
+        """Queue the inputs of an input message that haven't been seen yet (bits are oldest first)."""
+        first = seq - len(bits) + 1
+        for offset, value in enumerate(bits):
+            if first + offset > self.newest_seq:
+                self.queue.append((first + offset, value & INPUT_MASK))
+        self.newest_seq = max(self.newest_seq, seq)
+        while len(self.queue) > MAX_QUEUED_INPUTS:
+            self.queue.popleft()  # Don't let a burst add latency
+
+    def next_input(self):
+        if self.queue:
+            self.processed_seq, bits = self.queue.popleft()
+            self.held = INPUT_TABLE[bits]
+        return self.held
+
+class Room:
+    """One shared world: a Simulation holds the levels, and each player's state is swapped in to move it."""
+    def __init__(self, room_id, levels=None):
+        self.id = room_id
+        self.world = Simulation(levels=levels)
+        self.world.press_confirm()
+        self.slots = OrderedDict()  # Player id -> PlayerSlot
+        self.tick = 0
+        self.history = OrderedDict()  # Tick -> state list, newest last
+        self.finishes = 0  # Times the room completed the last level
+
+    def add_player(self, address):
+        """Add a player and return its slot, or None when the room is full."""
+        free = [i for i in range(ROOM_SIZE) if i not in self.slots]
+        if not free:
+            return None
+        slot = PlayerSlot(free[0], address, len(self.world.levels))
+        slot.last_heard = self.tick
+        self.slots[slot.id] = slot
+        return slot
+
+    def remove_player(self, player_id):
+        del self.slots[player_id]
+
+    def step_player(self, slot):
+        """Move one player and resolve its collisions against the shared level."""
+        world = self.world
+        level = world.levels[world.current_level_index]
+        player = slot.player
+        world.player = player
+        world.level_coin_counts = slot.level_coin_counts
+        world.powerup_timer = slot.powerup_timer
+        world.powerup_active = slot.powerup_active
+        player.world_width = level.width
+        player.world_height = level.height
+        previous = (player.x, player.y)
+        player.update(slot.next_input())
+        world.check_collisions(previous)
+        slot.powerup_timer = world.powerup_timer
+        slot.powerup_active = world.powerup_active
+        if world.state == "GAME_OVER":
+            respawn(player)  # Hit an enemy; the race goes on
+            slot.powerup_active = False
+            world.state = "PLAYING"
+
+    def step(self):
+        """Advance the room one tick and record its state."""
+        world = self.world
+        world.frame += 1
+        level = world.levels[world.current_level_index]
+        if level.platform_index is None:
+            level.build_index()
+        for enemy in level.enemies:
+            enemy.update()
+            level.enemy_index.move(enemy)
+        level_index = world.current_level_index
+        for slot in self.slots.values():
+            self.step_player(slot)
+            if world.state != "PLAYING" or world.current_level_index != level_index:
+                break  # The last coin went; everyone starts the next level together
+        if world.state == "FINISHED":
+            self.finishes += 1
+            world.press_confirm()  # Back to the first level with fresh coins
+            for slot in self.slots.values():
+                slot.level_coin_counts = [0] * len(world.levels)
+                slot.player.score = 0
+        if world.state != "PLAYING" or world.current_level_index != level_index:
+            world.state = "PLAYING"
+            for slot in self.slots.values():
+                respawn(slot.player)
+                slot.powerup_active = False
+        self.tick += 1
+        self.history[self.tick] = self.state()
+        if len(self.history) > HISTORY:
+            self.history.popitem(last=False)
+
+    def state(self):
+        """Flatten the room into the integer list that snapshots are encoded from."""
+        world = self.world
+        level = world.levels[world.current_level_index]
+        state = [world.current_level_index, len(self.slots)]
+        for slot in self.slots.values():
+            player = slot.player
+            state += [slot.id, round(player.x * FIXED), round(player.y * FIXED),
+                      round(player.velocity_x * FIXED), round(player.velocity_y * FIXED),
+                      player.is_on_ground | (player.jump_multiplier != 1) << 1, player.score]
+        for enemy in level.enemies:
+            state += [round(enemy.x * FIXED), round(enemy.velocity_x * FIXED)]
+        state += collected_words(level.coins)
+        state += collected_words(level.power_ups)
+        return state
+
+    def snapshot(self, slot):
+        """Encode the newest state for one player, as a delta against what it acknowledged."""
+        state = self.history[self.tick]
+        base = self.history.get(slot.acked)
+        base_tick = slot.acked
+        if base is None or len(base) != len(state):
+            base = [0] * len(state)
+            base_tick = 0
+        return (SNAPSHOT_MESSAGE.pack(SNAPSHOT, self.tick, base_tick, slot.processed_seq)
+                + encode_delta(state, base))
+
+class GameServer(asyncio.DatagramProtocol):
+    """UDP endpoint running every room at FPS and sending each client a snapshot per tick."""
+    def __init__(self, make_levels=None):
+        self.make_levels = make_levels  # Called to build each room's levels (default: built-in)
+        self.rooms = {}  # Room id -> Room
+        self.clients = {}  # Address -> (Room, PlayerSlot)
+        self.transport = None
+        self.ticks = 0
+        self.tick_seconds = 0.0  # Time spent in step(), for benchmarks
+        self.overruns = 0  # Ticks that finished after the next one was due
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, address):
+        self.bytes_received += len(data)
+        if not data:
+            return
+        try:
+            self.handle(data, address)
+        except struct.error:
+            pass  # Truncated datagram; one bad packet mustn't stop the server
+
+    def handle(self, data, address):
+        kind = data[0]
+        if kind == INPUT:
+            client = self.clients.get(address)
+            if client is None:
+                return
+            room, slot = client
+            _, seq, ack, count = INPUT_MESSAGE.unpack_from(data)
+            slot.receive_inputs(seq, data[INPUT_MESSAGE.size:INPUT_MESSAGE.size + count])
+            slot.acked = max(slot.acked, ack)
+            slot.last_heard = room.tick
+        elif kind == JOIN:
+            _, room_id = JOIN_MESSAGE.unpack_from(data)
+            self.join(room_id, address)
+        elif kind == LEAVE:
+            self.leave(address)
+
+    def join(self, room_id, address):
+        if address in self.clients:
+            room, slot = self.clients[address]
+        else:
+            room = self.rooms.get(room_id)
+            if room is None:
+                levels = self.make_levels() if self.make_levels is not None else None
+                room = self.rooms[room_id] = Room(room_id, levels)
+            slot = room.add_player(address)
+            if slot is None:
+                self.transport.sendto(bytes([FULL]), address)
+                return
+            self.clients[address] = (room, slot)
+        self.transport.sendto(WELCOME_MESSAGE.pack(WELCOME, slot.id, room.id), address)
+
+    def leave(self, address):
+        client = self.clients.pop(address, None)
+        if client is not None:
+            room, slot = client
+            room.remove_player(slot.id)
+            if not room.slots:
+                del self.rooms[room.id]
+
+    def step(self):
+        """Advance every room one tick and send every client its snapshot."""
+        start = time.perf_counter()
+        for room in self.rooms.values():
+            room.step()
+        sendto = self.transport.sendto
+        for address, (room, slot) in list(self.clients.items()):
+            if room.tick - slot.last_heard > CLIENT_TIMEOUT:
+                self.leave(address)
+                continue
+            message = room.snapshot(slot)
+            self.bytes_sent += len(message)
+            sendto(message, address)
+        self.ticks += 1
+        self.tick_seconds += time.perf_counter() - start
+
+    async def run(self, ticks=None):
+        """Step at FPS until ticks have run (forever if None)."""
+        loop = asyncio.get_running_loop()
+        due = loop.time()
+        while ticks is None or self.ticks < ticks:
+            self.step()
+            due += 1 / FPS
+            delay = due - loop.time()
+            if delay < 0:
+                self.overruns += 1
+                due = loop.time()  # Don't try to catch up on a backlog
+            await asyncio.sleep(max(delay, 0))
+
+class PredictedClient:
+    """Client-side game state: predicts its own player and reconciles with server snapshots.
+
+    Transport-agnostic: input_message() and receive() produce and consume datagrams.
+    """
+    def __init__(self, levels=None):
+        self.sim = Simulation(levels=levels)  # Local copy of the levels for prediction and drawing
+        self.sim.press_confirm()
+        self.player_id = None
+        self.seq = 0
+        self.pending = deque()  # (seq, FrameInput) sent but not yet reflected in a snapshot
+        self.states = OrderedDict()  # Snapshot tick -> state list
+        self.tick = 0  # Newest snapshot tick
+        self.others = {}  # Player id -> (x, y) of the other players
+        self.scores = {}  # Player id -> score
+        self.corrections = 0  # Snapshots that disagreed with the prediction
+
+    def input_message(self, inputs):
+        """Predict one tick of inputs and return the input message to send."""
+        self.seq += 1
+        self.pending.append((self.seq, inputs))
+        self.predict(inputs)
+        recent = [input_bits(pending) for _, pending in list(self.pending)[-REDUNDANT_INPUTS:]]
+        return INPUT_MESSAGE.pack(INPUT, self.seq, self.tick, len(recent)) + bytes(recent)
+
+    def predict(self, inputs):
+        sim = self.sim
+        player = sim.player
+        level = sim.levels[sim.current_level_index]
+        player.world_width = level.width
+        player.world_height = level.height
+        previous = (player.x, player.y)
+        player.update(inputs)
+        sim.resolve_platforms(previous)
+
+    def receive(self, data):
+        """Handle a datagram from the server."""
+        kind = data[0]
+        if kind == WELCOME:
+            _, self.player_id, _ = WELCOME_MESSAGE.unpack_from(data)
+        elif kind == SNAPSHOT:
+            _, tick, base_tick, processed_seq = SNAPSHOT_MESSAGE.unpack_from(data)
+            if tick <= self.tick:
+                return  # Late or duplicated datagram
+            base = None
+            if base_tick:
+                base = self.states.get(base_tick)
+                if base is None:
+                    return  # Base already dropped; the server falls back to a full snapshot
+            state = decode_delta(data, SNAPSHOT_MESSAGE.size, base)
+            self.states[tick] = state
+            if len(self.states) > HISTORY:
+                self.states.popitem(last=False)
+            self.tick = tick
+            self.apply(state, processed_seq)
+
+    def apply(self, state, processed_seq):
+        """Update the local world from a state list and reconcile the predicted player."""
+        sim = self.sim
+        sim.current_level_index = state[0]
+        level = sim.levels[sim.current_level_index]
+        if level.platform_index is None:
+            level.build_index()
+        offset = 2
+        own = None
+        self.others = {}
+        for _ in range(state[1]):
+            player_id, x, y, velocity_x, velocity_y, flags, score = state[offset:offset + PLAYER_FIELDS]
+            offset += PLAYER_FIELDS
+            self.scores[player_id] = score
+            if player_id == self.player_id:
+                own = (x, y, velocity_x, velocity_y, flags, score)
+            else:
+                self.others[player_id] = (x / FIXED, y / FIXED)
+        for enemy in level.enemies:
+            enemy.x = state[offset] / FIXED
+            enemy.velocity_x = state[offset + 1] / FIXED
+            enemy.rect.topleft = (enemy.x, enemy.y)
+            offset += 2
+        coin_words = bitset_length(len(level.coins.items))
+        apply_collected_words(level.coins, state[offset:offset + coin_words])
+        offset += coin_words
+        apply_collected_words(level.power_ups, state[offset:offset + bitset_length(len(level.power_ups.items))])
+        if own is not None:
+            self.reconcile(own, processed_seq)
+
+    def reconcile(self, own, processed_seq):
+        """Reset to the server's view of our player, then replay the inputs it hasn't seen."""
+        while self.pending and self.pending[0][0] <= processed_seq:
+            self.pending.popleft()
+        player = self.sim.player
+        predicted = (player.x, player.y)
+        x, y, velocity_x, velocity_y, flags, score = own
+        player.x = x / FIXED
+        player.y = y / FIXED
+        player.velocity_x = velocity_x / FIXED
+        player.velocity_y = velocity_y / FIXED
+        player.is_on_ground = bool(flags & 1)
+        player.jump_multiplier = POWERUP_JUMP_MULTIPLIER if flags & 2 else 1
+        player.score = score
+        player.rect.topleft = (player.x, player.y)
+        for _, inputs in self.pending:
+            self.predict(inputs)
+        if (player.x, player.y) != predicted:
+            self.corrections += 1
+
+class ClientProtocol(asyncio.DatagramProtocol):
+    """asyncio UDP endpoint for a PredictedClient."""
+    def __init__(self, client, room_id):
+        self.client = client
+        self.room_id = room_id
+        self.transport = None
+        self.bytes_received = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.sendto(JOIN_MESSAGE.pack(JOIN, self.room_id))
+
+    def datagram_received(self, data, address):
+        self.bytes_received += len(data)
+        self.client.receive(data)
+
+    def send_input(self, inputs):
+        self.transport.sendto(self.client.input_message(inputs))
+
+    def close(self):
+        self.transport.sendto(bytes([LEAVE]))
+        self.transport.close()
+
+async def serve(host="127.0.0.1", port=7777, ticks=None, make_levels=None):
+    """Run a GameServer on a UDP port; returns it once ticks have run."""
+    loop = asyncio.get_running_loop()
+    server = GameServer(make_levels)
+    transport, _ = await loop.create_datagram_endpoint(lambda: server, local_addr=(host, port))
+    try:
+        await server.run(ticks)
+    finally:
+        transport.close()
+    return server
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Platformer Adventure multiplayer server")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=7777)
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,217 @@
+import math
+from itertools import repeat
+import numpy as np
+import pygame
+from .game_objects import get_surface
+from .constants import PARTICLE_CAPACITY, PARTICLE_GRAVITY, PARTICLE_SIZE, PARTICLE_BLIT_LIMIT, WHITE, RED, YELLOW
+
+FIELDS = ("x", "y", "velocity_x", "velocity_y", "life", "kind")
+
+class ParticleSystem:
+    """Fixed pool of particles stored as NumPy arrays, updated and drawn in bulk.
+
+    Live particles are packed at the front of the arrays. Each update moves
+    them all at once and scatters the survivors into a second, equally sized
+    set of arrays, then swaps the two. Every intermediate result goes into
+    preallocated scratch arrays, so nothing is allocated per frame.
+    Particles emitted while the pool is full are dropped.
+
+    Up to PARTICLE_BLIT_LIMIT particles are drawn with one Surface.blits call;
+    larger counts are written straight into 32-bit surfaces' pixels, since
+    even batched blits cost about a microsecond each.
+    """
+    def __init__(self, capacity=PARTICLE_CAPACITY, seed=None):
+        self.capacity = capacity
+        self.count = 0
+        self.arrays = {}
+        self.spare = {}  # Compaction target, swapped with arrays every update
+        # One extra slot at the end of packed arrays takes the elements packed out
+        for name in FIELDS:
+            dtype = np.intp if name == "kind" else np.float32  # Kinds index the palette
+            self.arrays[name] = np.zeros(capacity + 1, dtype=dtype)
+            self.spare[name] = np.zeros(capacity + 1, dtype=dtype)
+        self.keep = np.zeros(capacity, dtype=bool)  # Packing scratch
+        self.keep_counts = np.zeros(capacity, dtype=np.int64)
+        self.destinations = np.zeros(capacity, dtype=np.int64)
+        self.random = np.zeros(2 * capacity, dtype=np.float64)  # Emission scratch
+        self.positions = np.zeros((capacity, 2), dtype=np.int32)  # Screen positions for draw()
+        self.test = np.zeros(capacity, dtype=bool)  # Pixel-writing scratch
+        self.offsets = np.zeros(capacity, dtype=np.int64)
+        self.visible_offsets = np.zeros(capacity + 1, dtype=np.int64)
+        self.pixels = np.zeros(capacity, dtype=np.uint32)
+        self.visible_pixels = np.zeros(capacity + 1, dtype=np.uint32)
+        self.palette = np.zeros(256, dtype=np.uint32)  # Kind -> mapped pixel value; at most 256 colors
+        self.rng = np.random.default_rng(seed)
+        self.colors = []  # Kind -> color
+        self.kinds = {}  # Color -> kind
+
+    def clear(self):
+        self.count = 0
+
+    def pack(self, n):
+        """Work out where each of the first n elements goes when those not flagged in self.keep are dropped.
+
+        Returns (destinations, kept count) for np.put; dropped elements go to
+        the extra last slot. Clobbers self.keep.
+        """
+        keep = self.keep[:n]
+        counts = self.keep_counts[:n]
+        np.copyto(counts, keep)
+        destinations = self.destinations[:n]
+        np.cumsum(counts, out=destinations)
+        kept = int(destinations[-1])
+        destinations -= 1
+        np.logical_not(keep, out=keep)
+        np.copyto(destinations, self.capacity, where=keep)
+        return destinations, kept
+
+    def emit(self, x, y, count, color, speed=3.0, life=30, direction=-math.pi / 2, spread=math.tau):
+        """Add up to count particles at (x, y) flying out within spread radians of direction.
+
+        Speeds and lifetimes (in ticks) are randomized up to the given values.
+        Returns the number of particles added.
+        """
+        start = self.count
+        count = min(count, self.capacity - start)
+        if count <= 0:
+            return 0
+        end = start + count
+        kind = self.kinds.get(color)
+        if kind is None:
+            kind = self.kinds[color] = len(self.colors)
+            self.colors.append(color)
+        arrays = self.arrays
+        arrays["x"][start:end] = x
+        arrays["y"][start:end] = y
+        arrays["kind"][start:end] = kind
+        angle = self.random[:count]
+        self.rng.random(out=angle)
+        angle -= 0.5
+        angle *= spread
+        angle += direction
+        np.cos(angle, out=arrays["velocity_x"][start:end])
+        np.sin(angle, out=arrays["velocity_y"][start:end])
+        scale = self.random[count:2 * count]
+        self.rng.random(out=scale)
+        scale *= 0.7
+        scale += 0.3  # Between 30% and 100% of speed and life
+        life_slice = arrays["life"][start:end]
+        np.multiply(scale, life, out=life_slice, casting="same_kind")
+        scale *= speed
+        arrays["velocity_x"][start:end] *= scale
+        arrays["velocity_y"][start:end] *= scale
+        self.count = end
+        return count
+
+    def update(self, dt=1):
+        """Move every live particle one tick (of dt 1/FPS units) and drop the expired ones."""
+        n = self.count
+        if not n:
+            return
+        arrays = self.arrays
+        velocity_y = arrays["velocity_y"][:n]
+        velocity_y += PARTICLE_GRAVITY * dt
+        if dt == 1:
+            arrays["x"][:n] += arrays["velocity_x"][:n]
+            arrays["y"][:n] += velocity_y
+        else:
+            step = self.spare["x"][:n]  # Free until compaction
+            np.multiply(arrays["velocity_x"][:n], dt, out=step)
+            arrays["x"][:n] += step
+            np.multiply(velocity_y, dt, out=step)
+            arrays["y"][:n] += step
+        life = arrays["life"][:n]
+        life -= dt
+        np.greater(life, 0, out=self.keep[:n])
+        destinations, live = self.pack(n)
+        if live == n:
+            return
+        spare = self.spare
+        for name in FIELDS:
+            np.put(spare[name], destinations, arrays[name][:n])
+        self.arrays, self.spare = spare, arrays
+        self.count = live
+
+    def draw(self, surface, offset_x=0, offset_y=0):
+        """Draw every live particle (shifted back by an offset) in one batch.
+
+        Returns the rect bounding the particles on the surface, or None if none are live.
+        """
+        n = self.count
+        if not n:
+            return None
+        arrays = self.arrays
+        positions = self.positions[:n]
+        np.subtract(arrays["x"][:n], offset_x + PARTICLE_SIZE / 2, out=positions[:, 0], casting="unsafe")
+        np.subtract(arrays["y"][:n], offset_y + PARTICLE_SIZE / 2, out=positions[:, 1], casting="unsafe")
+        if n > PARTICLE_BLIT_LIMIT and surface.get_bytesize() == 4:
+            self.write_pixels(surface, n)
+        else:
+            sprites = [get_surface((PARTICLE_SIZE, PARTICLE_SIZE), color) for color in self.colors]
+            if len(sprites) == 1:
+                sequence = zip(repeat(sprites[0]), positions.tolist())
+            else:
+                sequence = zip(map(sprites.__getitem__, arrays["kind"][:n].tolist()), positions.tolist())
+            surface.blits(sequence, doreturn=False)
+        left = int(positions[:, 0].min())
+        top = int(positions[:, 1].min())
+        bounds = pygame.Rect(left, top, int(positions[:, 0].max()) - left + PARTICLE_SIZE,
+                             int(positions[:, 1].max()) - top + PARTICLE_SIZE)
+        return bounds.clip(surface.get_rect())
+
+    def write_pixels(self, surface, n):
+        """Fill each particle's square in a 32-bit surface's pixel buffer (positions from draw())."""
+        width, height = surface.get_size()
+        pitch = surface.get_pitch() // 4
+        x = self.positions[:n, 0]
+        y = self.positions[:n, 1]
+        visible = self.keep[:n]
+        test = self.test[:n]
+        # Skip particles not wholly on the surface, so squares never wrap onto the next row
+        np.greater_equal(x, 0, out=visible)
+        np.less_equal(x, width - PARTICLE_SIZE, out=test)
+        visible &= test
+        np.greater_equal(y, 0, out=test)
+        visible &= test
+        np.less_equal(y, height - PARTICLE_SIZE, out=test)
+        visible &= test
+        offsets = self.offsets[:n]
+        np.multiply(y, pitch, out=offsets)
+        offsets += x
+        palette = self.palette
+        for kind, color in enumerate(self.colors):
+            palette[kind] = surface.map_rgb(color)
+        np.take(palette, self.arrays["kind"][:n], out=self.pixels[:n], mode="clip")  # "raise" would buffer out
+        destinations, count = self.pack(n)
+        np.put(self.visible_offsets, destinations, offsets)
+        np.put(self.visible_pixels, destinations, self.pixels[:n])
+        targets = self.visible_offsets[:count]
+        pixels = self.visible_pixels[:count]
+        buffer = surface.get_buffer()  # Locks the surface until released
+        data = np.frombuffer(buffer, dtype=np.uint32)
+        for _ in range(PARTICLE_SIZE):
+            for _ in range(PARTICLE_SIZE):
+                np.put(data, targets, pixels)
+                targets += 1
+            targets += pitch - PARTICLE_SIZE
+        del data, buffer
+
+def emit_tick_events(particles, events, level, player):
+    """Start the effects for a tick's events; level is the level the tick began in."""
+    for kind, value in events:
+        if kind == "coin":
+            x, y = level.coins.items[value].rect.center
+            particles.emit(x, y, 40, YELLOW, speed=3.0, life=30)
+        elif kind == "power_up":
+            x, y = level.power_ups.items[value].rect.center
+            particles.emit(x, y, 120, (0, 0, 255), speed=5.0, life=45)
+            particles.emit(x, y, 60, WHITE, speed=2.0, life=60)
+        elif kind == "level":
+            x, y = player.rect.center
+            particles.emit(x, y, 400, YELLOW, speed=8.0, life=60, spread=math.pi / 2)
+            particles.emit(x, y, 200, WHITE, speed=6.0, life=60, spread=math.pi / 2)
+        elif kind == "state" and value == "GAME_OVER":
+            x, y = player.rect.center
+            particles.emit(x, y, 300, RED, speed=6.0, life=50)
+        elif kind == "state" and value == "PLAYING":
+            particles.clear()  # Leftovers from the last screen
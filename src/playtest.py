@@ -0,0 +1,268 @@
+"""Automated playtesting: many bot playthroughs spread over a process pool.
+
+Every worker process builds its levels once and reuses them for all of its
+episodes, restoring enemy patrols between episodes. Episodes come back in
+batches of fixed-size binary records, which are folded into running
+statistics as they arrive, so memory does not grow with the episode count.
+
+Run with: python -m src.playtest [PACK] --episodes 10000 --policy seeker
+"""
+import argparse
+import json
+import os
+import random
+import struct
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from math import sqrt
+from .simulation import Simulation
+from .inputs import FrameInput, NO_INPUT
+from .game_objects import LevelOne, LevelTwo, LevelThree
+from .level_format import LevelPack
+from .world import ChunkedLevel
+from .constants import FPS
+
+OUTCOMES = ("finished", "died", "timed out")
+# seed, outcome, level reached, ticks, death x and y; then ticks and coins for every level
+EPISODE = struct.Struct("<IBHIii")
+LEVEL = struct.Struct("<IH")
+HOTSPOT_CELL = 40  # Death positions are counted on a grid of this many pixels
+
+class RandomBot:
+    """Holds a random combination of keys for 5 to 40 ticks at a time."""
+    def __init__(self, rng):
+        self.rng = rng
+        self.inputs = NO_INPUT
+        self.hold = 0
+
+    def __call__(self, sim):
+        if self.hold == 0:
+            rng = self.rng
+            self.inputs = FrameInput(left=rng.random() < 0.3, right=rng.random() < 0.6, jump=rng.random() < 0.4)
+            self.hold = rng.randint(5, 40)
+        self.hold -= 1
+        return self.inputs
+
+class SeekerBot:
+    """Runs toward the nearest remaining coin and jumps when it is above, with some noise."""
+    def __init__(self, rng):
+        self.rng = rng
+
+    def __call__(self, sim):
+        player = sim.player
+        coins = sim.levels[sim.current_level_index].coins
+        if not coins:
+            return NO_INPUT
+        target = min(coins, key=lambda coin: abs(coin.x - player.x) + abs(coin.y - player.y))
+        dx = target.x - player.x
+        jump = (target.y < player.y and self.rng.random() < 0.3) or self.rng.random() < 0.02
+        return FrameInput(left=dx < -5, right=dx > 5, jump=jump)
+
+POLICIES = {"random": RandomBot, "seeker": SeekerBot}
+
+def builtin_levels():
+    return [LevelOne(), LevelTwo(), LevelThree()]
+
+def capture_enemies(levels):
+    """Record every enemy's patrol state so the levels can be reused by later episodes."""
+    return [(enemy, enemy.x, enemy.y, enemy.velocity_x) for level in levels for enemy in level.enemies]
+
+def restore_enemies(levels, captured):
+    """Put enemies back where capture_enemies() found them."""
+    for enemy, x, y, velocity_x in captured:
+        enemy.x = x
+        enemy.y = y
+        enemy.velocity_x = velocity_x
+        enemy.rect.topleft = (x, y)
+    for level in levels:
+        if level.enemy_index is not None:
+            for enemy in level.enemies:
+                level.enemy_index.move(enemy)
+        if isinstance(level, ChunkedLevel):
+            level.awake = {}
+            level.asleep_since = {}
+            level.ticks = 0
+
+def run_episode(levels, captured, policy, seed, max_ticks):
+    """Play one episode on reused levels and return its binary record."""
+    restore_enemies(levels, captured)
+    sim = Simulation(levels=levels)  # Coins and power-ups are reset when the game starts
+    bot = POLICIES[policy](random.Random(seed))
+    level_ticks = [0] * len(levels)
+    sim.step(FrameInput(confirm=True))
+    while sim.state == "PLAYING" and sim.frame <= max_ticks:
+        level_ticks[sim.current_level_index] += 1
+        sim.step(bot(sim))
+    outcome = {"FINISHED": 0, "GAME_OVER": 1}.get(sim.state, 2)
+    death = (int(sim.player.x), int(sim.player.y)) if outcome == 1 else (0, 0)
+    record = [EPISODE.pack(seed, outcome, sim.current_level_index, sim.frame - 1, *death)]
+    record += [LEVEL.pack(ticks, coins) for ticks, coins in zip(level_ticks, sim.level_coin_counts)]
+    return b"".join(record)
+
+_worker = None  # (levels, captured enemies) built once per worker process
+
+def _init_worker(pack_path):
+    global _worker
+    if pack_path is None:
+        levels = builtin_levels()
+    else:
+        pack = LevelPack(pack_path)
+        levels = [pack.load(index) for index in range(len(pack))]
+        pack.close()
+    _worker = (levels, capture_enemies(levels))
+
+def _run_batch(policy, seeds, max_ticks):
+    levels, captured = _worker
+    return b"".join(run_episode(levels, captured, policy, seed, max_ticks) for seed in seeds)
+
+class RunningStats:
+    """Count, mean, standard deviation, minimum and maximum, updated one value at a time (Welford)."""
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def stdev(self):
+        return sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0
+
+    def to_dict(self):
+        return {"count": self.count, "mean": self.mean, "stdev": self.stdev, "min": self.min, "max": self.max}
+
+class PlaytestStats:
+    """Aggregates episode records incrementally."""
+    def __init__(self, level_count, tick_rate=FPS):
+        self.level_count = level_count
+        self.tick_rate = tick_rate
+        self.record_size = EPISODE.size + LEVEL.size * level_count
+        self.episodes = 0
+        self.outcomes = Counter()
+        self.reached = Counter()  # Level index -> episodes that got to it
+        self.level_times = [RunningStats() for _ in range(level_count)]  # Seconds, completed levels only
+        self.time_histograms = [Counter() for _ in range(level_count)]  # Whole seconds -> episodes
+        self.coin_histograms = [Counter() for _ in range(level_count)]  # Coins collected -> episodes
+        self.hotspots = Counter()  # (level, cell x, cell y) -> deaths
+
+    def add_records(self, data):
+        """Fold a batch of concatenated episode records into the statistics."""
+        for offset in range(0, len(data), self.record_size):
+            seed, outcome, level_reached, ticks, death_x, death_y = EPISODE.unpack_from(data, offset)
+            self.episodes += 1
+            self.outcomes[OUTCOMES[outcome]] += 1
+            for level in range(level_reached + 1):
+                self.reached[level] += 1
+            if outcome == 1:
+                self.hotspots[(level_reached, death_x // HOTSPOT_CELL, death_y // HOTSPOT_CELL)] += 1
+            for level, (level_ticks, coins) in enumerate(LEVEL.iter_unpack(
+                    data[offset + EPISODE.size:offset + self.record_size])):
+                if level > level_reached:
+                    break
+                self.coin_histograms[level][coins] += 1
+                if level < level_reached or outcome == 0:
+                    seconds = level_ticks / self.tick_rate
+                    self.level_times[level].add(seconds)
+                    self.time_histograms[level][int(seconds)] += 1
+
+    def completion_rate(self):
+        return self.outcomes["finished"] / self.episodes if self.episodes else 0.0
+
+    def to_dict(self):
+        return {
+            "episodes": self.episodes,
+            "outcomes": dict(self.outcomes),
+            "completion_rate": self.completion_rate(),
+            "levels": [{"reached": self.reached[level],
+                        "time": self.level_times[level].to_dict(),
+                        "time_histogram": dict(sorted(self.time_histograms[level].items())),
+                        "coin_histogram": dict(sorted(self.coin_histograms[level].items()))}
+                       for level in range(self.level_count)],
+            "hotspots": [{"level": level, "x": x * HOTSPOT_CELL, "y": y * HOTSPOT_CELL, "deaths": deaths}
+                         for (level, x, y), deaths in self.hotspots.most_common(10)],
+        }
+
+    def summary(self):
+        """Return human-readable report lines."""
+        lines = [f"{self.episodes} episodes: {self.completion_rate():.1%} finished, "
+                 + ", ".join(f"{count} {name}" for name, count in sorted(self.outcomes.items()))]
+        for level in range(self.level_count):
+            times = self.level_times[level]
+            coins = self.coin_histograms[level]
+            lines.append(f"Level {level + 1}: reached {self.reached[level]}, completed {times.count}"
+                         + (f" in {times.mean:.1f}s +/- {times.stdev:.1f}s" if times.count else "")
+                         + ", coins " + " ".join(f"{n}:{count}" for n, count in sorted(coins.items())))
+        for (level, x, y), deaths in self.hotspots.most_common(5):
+            lines.append(f"Death hotspot: level {level + 1} around ({x * HOTSPOT_CELL}, {y * HOTSPOT_CELL}), "
+                         f"{deaths} deaths")
+        return lines
+
+def playtest(episodes, policy="random", pack=None, workers=None, seed=0, max_ticks=120 * FPS, batch_size=16):
+    """Run episodes with seeds seed..seed+episodes-1 and return their PlaytestStats.
+
+    workers=1 plays in this process; otherwise batches go to a process pool,
+    with at most two batches per worker in flight.
+    """
+    if pack is None:
+        level_count = 3
+    else:
+        level_pack = LevelPack(pack)
+        level_count = len(level_pack)
+        level_pack.close()
+    stats = PlaytestStats(level_count)
+    batches = (range(start, min(start + batch_size, seed + episodes))
+               for start in range(seed, seed + episodes, batch_size))
+    if workers == 1:
+        _init_worker(pack)
+        for batch in batches:
+            stats.add_records(_run_batch(policy, batch, max_ticks))
+        return stats
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(pack,)) as pool:
+        pending = set()
+        for batch in batches:
+            pending.add(pool.submit(_run_batch, policy, batch, max_ticks))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stats.add_records(future.result())
+        for future in pending:
+            stats.add_records(future.result())
+    return stats
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Run bot playthroughs and report completion statistics")
+    parser.add_argument("pack", nargs="?", help="compiled level pack (default: the built-in levels)")
+    parser.add_argument("--episodes", type=int, default=1000)
+    parser.add_argument("--policy", choices=sorted(POLICIES), default="random")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first episode")
+    parser.add_argument("--max-seconds", type=int, default=120, help="simulated time limit per episode")
+    parser.add_argument("--output", metavar="FILE", help="also write the statistics as JSON")
+    return parser.parse_args(argv)
+
+def main(argv):
+    args = parse_args(argv)
+    start = time.perf_counter()
+    stats = playtest(args.episodes, args.policy, args.pack, args.workers, args.seed, args.max_seconds * FPS)
+    elapsed = time.perf_counter() - start
+    for line in stats.summary():
+        print(line)
+    print(f"Played {stats.episodes} episodes in {elapsed:.2f}s ({stats.episodes / elapsed:.0f} episodes/s)")
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(stats.to_dict(), f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
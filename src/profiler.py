@@ -0,0 +1,113 @@
+import csv
+import json
+from array import array
+from time import perf_counter
+from .constants import PROFILER_FRAMES
+
+# Frame phases, in the order they run inside GameManager.run()
+PHASES = ("handle_events", "player_update", "enemy_update", "check_collisions", "render", "display_flip")
+HANDLE_EVENTS, PLAYER_UPDATE, ENEMY_UPDATE, CHECK_COLLISIONS, RENDER, DISPLAY_FLIP = range(len(PHASES))
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+class FrameProfiler:
+    """Times each phase of every frame into a fixed-size ring buffer.
+
+    Call begin_frame() at the top of a frame and lap(phase) at the end of each
+    phase; the time since the previous lap (or mark()) is charged to that phase.
+    Instrumented code checks for a profiler before calling it, so a game
+    without one pays only for that check.
+    """
+    def __init__(self, capacity=PROFILER_FRAMES):
+        self.capacity = capacity
+        size = capacity * len(PHASES)
+        self.phase_start = array("d", bytes(8 * size))  # perf_counter() at phase start
+        self.phase_time = array("d", bytes(8 * size))  # Seconds spent in phase
+        self.frame_start = array("d", bytes(8 * capacity))
+        self.frames = 0  # Frames started so far
+        self.row = 0
+        self.last = 0.0
+
+    def begin_frame(self):
+        now = perf_counter()
+        self.row = (self.frames % self.capacity) * len(PHASES)
+        self.frame_start[self.frames % self.capacity] = now
+        for i in range(self.row, self.row + len(PHASES)):
+            self.phase_time[i] = 0.0
+            self.phase_start[i] = now
+        self.frames += 1
+        self.last = now
+
+    def mark(self):
+        """Start timing from now, excluding time since the previous lap."""
+        self.last = perf_counter()
+
+    def lap(self, phase):
+        """Charge the time since the previous lap or mark to phase."""
+        now = perf_counter()
+        i = self.row + phase
+        if self.phase_time[i] == 0.0:
+            self.phase_start[i] = self.last
+        self.phase_time[i] += now - self.last
+        self.last = now
+
+    def recent_frames(self):
+        """Return ring-buffer slots of the recorded frames, oldest first (last frame may be partial)."""
+        count = min(self.frames, self.capacity)
+        first = self.frames - count
+        return [(first + n, (first + n) % self.capacity) for n in range(count)]
+
+    def summary(self):
+        """Return FPS, frame-time percentiles and mean phase times (milliseconds)."""
+        slots = self.recent_frames()[:-1]  # Skip the frame in progress
+        if not slots:
+            return {"fps": 0.0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "phases": {name: 0.0 for name in PHASES}}
+        width = len(PHASES)
+        work = sorted(sum(self.phase_time[slot * width:slot * width + width]) * 1000 for _, slot in slots)
+        span = self.frame_start[(slots[-1][0] + 1) % self.capacity] - self.frame_start[slots[0][1]]
+        phases = {}
+        for phase, name in enumerate(PHASES):
+            phases[name] = sum(self.phase_time[slot * width + phase] for _, slot in slots) * 1000 / len(slots)
+        return {"fps": len(slots) / span if span > 0 else 0.0,
+                "p50": percentile(work, 0.50), "p95": percentile(work, 0.95), "p99": percentile(work, 0.99),
+                "phases": phases}
+
+    def overlay_lines(self):
+        """Text lines for the in-game overlay."""
+        stats = self.summary()
+        lines = [f"FPS {stats['fps']:.0f}",
+                 f"p50 {stats['p50']:.2f} p95 {stats['p95']:.2f} p99 {stats['p99']:.2f} ms"]
+        lines += [f"{name} {ms:.2f} ms" for name, ms in stats["phases"].items()]
+        return lines
+
+    def export_csv(self, path):
+        """Write one row per recorded frame with per-phase milliseconds."""
+        width = len(PHASES)
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "start_ms"] + [f"{name}_ms" for name in PHASES])
+            origin = self.frame_start[self.recent_frames()[0][1]] if self.frames else 0.0
+            for frame, slot in self.recent_frames():
+                times = self.phase_time[slot * width:slot * width + width]
+                writer.writerow([frame, f"{(self.frame_start[slot] - origin) * 1000:.3f}"]
+                                + [f"{t * 1000:.3f}" for t in times])
+
+    def export_chrome_trace(self, path):
+        """Write phases as Chrome trace-event JSON (open in chrome://tracing or Perfetto)."""
+        width = len(PHASES)
+        events = []
+        for frame, slot in self.recent_frames():
+            events.append({"name": "frame", "ph": "i", "s": "t", "pid": 1, "tid": 1,
+                           "ts": self.frame_start[slot] * 1e6, "args": {"frame": frame}})
+            for phase, name in enumerate(PHASES):
+                duration = self.phase_time[slot * width + phase]
+                if duration > 0.0:
+                    events.append({"name": name, "ph": "X", "pid": 1, "tid": 1,
+                                   "ts": self.phase_start[slot * width + phase] * 1e6, "dur": duration * 1e6})
+        with open(path, "w") as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
@@ -0,0 +1,290 @@
+"""Offline check that every coin in a level can be reached.
+
+The player's jump is precomputed once per multiplier as a per-tick table of
+how far it has risen or fallen and how far sideways it can have moved. Each
+platform's top is a node, and so is the level's bottom edge, which
+Player.update clamps the player to like a floor. A jump from one node that
+crosses another node's height on the way down is an edge. Coins touched by any jump from a
+reachable node are reachable; power-ups switch the search to the boosted
+jump table.
+
+The model errs towards "reachable": it ignores head bumps, the power-up
+timeout and enemies, so a reported coin really is out of reach. Coins that
+sit in an enemy's patrol lane are listed separately as guarded.
+
+Analyze levels with: python -m src.reachability PACK|LEVEL.json [...] [--workers N] [--cache FILE]
+"""
+import hashlib
+import json
+import os
+import sys
+import time
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from .level_format import LevelPack, level_to_dict, encode_level
+from .constants import (SCREEN_WIDTH, SCREEN_HEIGHT, GRAVITY, PLAYER_JUMP_POWER, PLAYER_SPEED,
+                        POWERUP_JUMP_MULTIPLIER)
+
+PLAYER_WIDTH = 40  # Size and start position of Simulation's player
+PLAYER_HEIGHT = 40
+PLAYER_START = (100, SCREEN_HEIGHT - 60)
+TERMINAL_VELOCITY = 10
+ANALYZER_VERSION = 2  # Bump when the model changes so cached reports are redone
+
+# Everything besides the level that a report depends on
+ANALYSIS_KEY = repr((ANALYZER_VERSION, PLAYER_JUMP_POWER, GRAVITY, PLAYER_SPEED, POWERUP_JUMP_MULTIPLIER,
+                     PLAYER_WIDTH, PLAYER_HEIGHT, PLAYER_START, TERMINAL_VELOCITY)).encode()
+
+ReachabilityReport = namedtuple("ReachabilityReport", ["coins", "unreachable", "guarded", "reachable_platforms"])
+
+def trajectory(velocity, max_drop):
+    """Feet offsets from the starting height, tick by tick as in Player.update, until max_drop below it."""
+    offsets = [0]
+    while offsets[-1] <= max_drop:
+        velocity = min(velocity + GRAVITY, TERMINAL_VELOCITY)
+        offsets.append(offsets[-1] + velocity)
+    return offsets
+
+def merge(ranges, gap=0):
+    """Merge (start, end) ranges that overlap or lie within gap of each other."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + gap:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return tuple(merged)
+
+@lru_cache(maxsize=None)
+def jump_arc(multiplier=1, max_drop=SCREEN_HEIGHT):
+    """Return a per-tick table of where the player can be after leaving a platform.
+
+    Entry t is (reach, feet, landings): how far sideways the player can have
+    run after t ticks, the merged ranges of feet offsets from the take-off
+    height it can be at (negative is up), and the ranges its feet can cross
+    on the way down during tick t. Player keeps is_on_ground after walking off
+    a ledge, so besides jumping straight away the player can walk off and
+    jump any number of ticks into the fall, or never jump at all.
+    """
+    jump = trajectory(PLAYER_JUMP_POWER * multiplier, max_drop)
+    fall = trajectory(0, max_drop)
+
+    def position(delay, tick):
+        """Feet offset at tick of the path that jumps after delay ticks of falling, or None once gone."""
+        if tick <= delay:
+            return fall[tick] if tick < len(fall) else None
+        if delay >= len(fall) or tick - delay >= len(jump):
+            return None
+        return fall[delay] + jump[tick - delay]
+
+    table = [(0, ((0, 0),), ())]
+    tick = 1
+    while True:
+        points = []
+        crossings = []
+        for delay in range(tick + 1):
+            now = position(delay, tick)
+            if now is None:
+                continue
+            points.append((now, now))
+            before = position(delay, tick - 1)
+            if now > before:
+                crossings.append((before, now))
+        if not points:
+            return tuple(table)
+        # Feet within a player height of each other leave no gap in the rows covered
+        table.append((PLAYER_SPEED * tick, merge(points, PLAYER_HEIGHT), merge(crossings)))
+        tick += 1
+
+def level_key(record):
+    """Hash an encoded level record together with the physics it was analyzed with."""
+    return hashlib.sha1(ANALYSIS_KEY + bytes(record)).hexdigest()
+
+def analyze(data):
+    """Analyze a level dict in the level_format JSON layout and return a ReachabilityReport."""
+    width = data.get("width", SCREEN_WIDTH)
+    height = data.get("height", SCREEN_HEIGHT)
+    max_x = width - PLAYER_WIDTH
+    platforms = data.get("platforms", [])
+    coins = data.get("coins", [])
+    power_ups = data.get("power_ups", [])
+    # Nodes are (leftmost x, rightmost x, feet y) of the player standing somewhere;
+    # one per platform top, the level's bottom edge, and the start position.
+    nodes = [(max(x - PLAYER_WIDTH + 1, 0), min(x + w - 1, max_x), y) for x, y, w, h in platforms]
+    nodes.append((0, max_x, height))  # The player is clamped to the bottom edge and can walk along it
+    nodes.append((PLAYER_START[0], PLAYER_START[0], PLAYER_START[1] + PLAYER_HEIGHT))
+    tops = sorted(range(len(nodes) - 1), key=lambda i: nodes[i][2])
+    top_ys = [nodes[i][2] for i in tops]
+    # (rect, coin index or None for a power-up), sorted by top edge
+    pickups = sorted([(rect, i) for i, rect in enumerate(coins)] + [(rect, None) for rect in power_ups],
+                     key=lambda item: item[0][1])
+    pickup_ys = [rect[1] for rect, _ in pickups]
+    tallest = max((rect[3] for rect, _ in pickups), default=0)
+    arcs = {False: jump_arc(1, height), True: jump_arc(POWERUP_JUMP_MULTIPLIER, height)}
+
+    touched = set()  # Indices of coins touched
+    seen = {(len(nodes) - 1, False)}
+    stack = list(seen)
+    while stack:
+        node, boosted = stack.pop()
+        left, right, feet = nodes[node]
+        grabbed = boosted
+        for reach, feet_ranges, landings in arcs[boosted]:
+            low = max(left - reach, 0)
+            high = min(right + reach, max_x)
+            for highest, lowest in feet_ranges:
+                top = feet + highest - PLAYER_HEIGHT
+                bottom = feet + lowest
+                # Pickups overlapping the rows the player can cover at this tick
+                for k in range(bisect_right(pickup_ys, top - tallest), bisect_left(pickup_ys, bottom)):
+                    (x, y, w, h), coin = pickups[k]
+                    if y + h > top and low < x + w and high + PLAYER_WIDTH > x:
+                        if coin is None:
+                            grabbed = True
+                        else:
+                            touched.add(coin)
+            for before, after in landings:
+                # Platform tops crossed on the way down during this tick
+                for k in range(bisect_left(top_ys, feet + before), bisect_left(top_ys, feet + after)):
+                    target = tops[k]
+                    target_left, target_right, _ = nodes[target]
+                    state = (target, grabbed)
+                    if low <= target_right and high >= target_left and state not in seen:
+                        seen.add(state)
+                        stack.append(state)
+            if grabbed and not boosted and (node, True) not in seen:
+                seen.add((node, True))  # Standing on or jumping into a power-up
+                stack.append((node, True))
+
+    unreachable = [rect for i, rect in enumerate(coins) if i not in touched]
+    lanes = []
+    for enemy in data.get("enemies", []):
+        x, y, w, h = enemy["rect"]
+        platform = platforms[enemy["platform"]]
+        lanes.append((platform[0], y, platform[0] + platform[2], y + h))
+    guarded = [rect for i, rect in enumerate(coins) if i in touched
+               and any(rect[0] < x2 and rect[0] + rect[2] > x1 and rect[1] < y2 and rect[1] + rect[3] > y1
+                       for x1, y1, x2, y2 in lanes)]
+    reachable_platforms = len({node for node, _ in seen if node < len(platforms)})
+    return ReachabilityReport(len(coins), unreachable, guarded, reachable_platforms)
+
+def analyze_level(level):
+    """Analyze a Level object."""
+    return analyze(level_to_dict(level))
+
+class ReportCache:
+    """Reports keyed by level_key, optionally kept in a JSON file between runs."""
+    def __init__(self, path=None):
+        self.path = path
+        self.reports = {}
+        self.hits = 0
+        self.misses = 0
+        if path is not None and os.path.exists(path):
+            with open(path) as f:
+                self.reports = {key: ReachabilityReport(**value) for key, value in json.load(f).items()}
+
+    def get(self, key):
+        report = self.reports.get(key)
+        if report is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return report
+
+    def put(self, key, report):
+        self.reports[key] = report
+
+    def save(self):
+        if self.path is not None:
+            with open(self.path, "w") as f:
+                json.dump({key: report._asdict() for key, report in self.reports.items()}, f)
+
+_worker_packs = {}  # Path -> LevelPack, opened once per worker process
+
+def _analyze_pack_level(path, index):
+    pack = _worker_packs.get(path)
+    if pack is None:
+        pack = _worker_packs[path] = LevelPack(path)
+    return analyze(pack.level_dict(index))
+
+def analyze_pack(path, cache=None, workers=None):
+    """Return a report for every level in a compiled pack.
+
+    Levels missing from cache are analyzed in parallel by a pool of worker
+    processes (workers=1 analyzes in this process).
+    """
+    if cache is None:
+        cache = ReportCache()
+    pack = LevelPack(path)
+    try:
+        keys = []
+        for index in range(len(pack)):
+            offset, size, _ = pack.entry(index)
+            keys.append(level_key(pack.data[offset:offset + size]))
+    finally:
+        pack.close()
+    reports = [cache.get(key) for key in keys]
+    pending = [index for index, report in enumerate(reports) if report is None]
+    if len(pending) > 1 and workers != 1:
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_analyze_pack_level, repeat(path), pending,
+                                    chunksize=max(1, len(pending) // (workers * 4))))
+    else:
+        results = [_analyze_pack_level(path, index) for index in pending]
+    for index, report in zip(pending, results):
+        reports[index] = report
+        cache.put(keys[index], report)
+    return reports
+
+def main(argv):
+    paths = [arg for arg in argv if not arg.startswith("--")]
+    workers = None
+    cache_path = ".reachability-cache.json"
+    if "--workers" in argv:
+        value = argv[argv.index("--workers") + 1]
+        paths.remove(value)
+        workers = int(value)
+    if "--cache" in argv:
+        cache_path = argv[argv.index("--cache") + 1]
+        paths.remove(cache_path)
+    if not paths:
+        print("Usage: python -m src.reachability PACK|LEVEL.json [...] [--workers N] [--cache FILE]")
+        return 1
+    start = time.perf_counter()
+    cache = ReportCache(cache_path)
+    results = []
+    for path in paths:
+        if path.endswith(".json"):
+            with open(path) as f:
+                data = json.load(f)
+            key = level_key(encode_level(data))
+            report = cache.get(key)
+            if report is None:
+                report = analyze(data)
+                cache.put(key, report)
+            results.append((path, report))
+        else:
+            for index, report in enumerate(analyze_pack(path, cache, workers)):
+                results.append((f"{path}[{index}]", report))
+    cache.save()
+    problems = 0
+    for name, report in results:
+        reachable = report.coins - len(report.unreachable)
+        line = f"{name}: {reachable}/{report.coins} coins reachable"
+        if report.unreachable:
+            line += "; unreachable at " + ", ".join(f"({x}, {y})" for x, y, _, _ in report.unreachable)
+        if report.guarded:
+            line += "; guarded by enemies at " + ", ".join(f"({x}, {y})" for x, y, _, _ in report.guarded)
+        problems += bool(report.unreachable)
+        print(line)
+    elapsed = time.perf_counter() - start
+    print(f"Analyzed {len(results)} levels in {elapsed:.2f}s ({cache.hits} cached)")
+    return 1 if problems else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
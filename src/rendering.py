@@ -0,0 +1,154 @@
+from collections import OrderedDict
+import pygame
+from .constants import CHUNK_CACHE_SIZE
+
+class DirtyRectRenderer:
+    """Draws frames on top of a pre-baked static level layer and pushes only changed rects.
+
+    A scene is a (state, level) pair. The first frame of a scene is drawn in full;
+    after that each frame restores the static layer under last frame's rects,
+    redraws the moving objects and HUD, and updates only those screen areas.
+    """
+    def __init__(self, screen):
+        self.screen = screen
+        self.static_layer = None  # Background and platforms of baked_level
+        self.baked_level = None
+        self.scene = None  # (state, level) drawn last frame
+        self.full_redraw = True
+        self.previous_rects = []  # Rects drawn last frame
+        self.rects = []  # Rects drawn this frame
+
+    def invalidate(self):
+        """Force the next frame to be drawn in full (e.g. after the window was exposed)."""
+        self.scene = None
+
+    def bake(self, level):
+        """Render the level's background and platforms into one cached surface."""
+        layer = pygame.Surface(self.screen.get_size())
+        if pygame.display.get_surface() is not None:
+            layer = layer.convert()
+        layer.fill(level.background_color)
+        for platform in level.platforms:
+            platform.draw(layer)
+        self.static_layer = layer
+        self.baked_level = level
+
+    def begin(self, state, level, show_platforms=True):
+        """Start a frame; returns True if the whole screen is being redrawn."""
+        scene = (state, level)
+        self.rects = []
+        if scene != self.scene:
+            self.scene = scene
+            self.full_redraw = True
+            self.previous_rects = []
+            if show_platforms:
+                if level is not self.baked_level:
+                    self.bake(level)
+                self.screen.blit(self.static_layer, (0, 0))
+            else:
+                self.screen.fill(level.background_color)
+            return True
+        self.full_redraw = False
+        if not show_platforms:
+            # Menu screens do not change within a scene
+            self.previous_rects = []
+            return False
+        # Erase last frame's moving objects and HUD
+        for rect in self.previous_rects:
+            self.screen.blit(self.static_layer, rect, rect)
+        return False
+
+    def begin_full(self, state, level):
+        """Start a frame that the caller redraws entirely (e.g. a scrolling level)."""
+        self.scene = (state, level)
+        self.full_redraw = True
+        self.previous_rects = []
+        self.rects = []
+
+    def draw(self, obj, offset_x=0, offset_y=0):
+        """Draw a game object (shifted back by an offset) and mark its area dirty."""
+        self.rects.append(obj.draw(self.screen, offset_x, offset_y))
+
+    def blit(self, surface, position):
+        """Blit a surface (e.g. HUD text) and mark its area dirty."""
+        self.rects.append(self.screen.blit(surface, position))
+
+    def add_rect(self, rect):
+        """Mark an area drawn by other means dirty."""
+        self.rects.append(rect)
+
+    def present(self):
+        """Push this frame to the display."""
+        if self.full_redraw:
+            pygame.display.flip()
+        elif self.previous_rects or self.rects:
+            pygame.display.update(self.previous_rects + self.rects)
+        self.previous_rects = self.rects
+
+class ChunkRenderer:
+    """Draws a ChunkedLevel through the camera, touching only chunks on screen.
+
+    Each chunk's background and platforms are baked into one surface on first
+    sight and kept in a small LRU cache.
+    """
+    def __init__(self, screen, max_chunks=CHUNK_CACHE_SIZE):
+        self.screen = screen
+        self.max_chunks = max_chunks
+        self.layers = OrderedDict()  # (level, chunk key) -> baked Surface
+
+    def chunk_layer(self, level, key, chunk):
+        cache_key = (level, key)
+        layer = self.layers.get(cache_key)
+        if layer is not None:
+            self.layers.move_to_end(cache_key)
+            return layer
+        size = level.chunk_size
+        layer = pygame.Surface((size, size))
+        if pygame.display.get_surface() is not None:
+            layer = layer.convert()
+        layer.fill(level.background_color)
+        origin_x, origin_y = key[0] * size, key[1] * size
+        for platform in chunk.platforms:
+            platform.draw(layer, origin_x, origin_y)
+        self.layers[cache_key] = layer
+        if len(self.layers) > self.max_chunks:
+            self.layers.popitem(last=False)
+        return layer
+
+    def draw(self, level, camera, player, lag=None):
+        """Draw the visible chunks, their moving objects and the player.
+
+        lag, if given, maps an object to how far (x, y) its drawn position
+        trails its simulated one, for render interpolation.
+        """
+        view = camera.view_rect()
+        chunks = level.visible_chunks(view)
+        camera_x, camera_y = camera.x, camera.y
+        if lag is not None:
+            lag_x, lag_y = lag(camera)
+            camera_x -= lag_x
+            camera_y -= lag_y
+        self.screen.fill(level.background_color)  # Areas with no chunk
+        size = level.chunk_size
+        for key, chunk in chunks:
+            self.screen.blit(self.chunk_layer(level, key, chunk), (key[0] * size - camera_x, key[1] * size - camera_y))
+        drawn = set()  # Objects spanning chunks are listed in each of them
+        for _, chunk in chunks:
+            for enemy in chunk.enemies:
+                if enemy not in drawn:
+                    drawn.add(enemy)
+                    if lag is None:
+                        enemy.draw(self.screen, camera_x, camera_y)
+                    else:
+                        lag_x, lag_y = lag(enemy)
+                        enemy.draw(self.screen, camera_x + lag_x, camera_y + lag_y)
+            for group in (chunk.coins, chunk.power_ups):
+                for item in group:
+                    if not item.collected and item not in drawn:
+                        drawn.add(item)
+                        item.draw(self.screen, camera_x, camera_y)
+        if lag is None:
+            player.draw(self.screen, camera_x, camera_y)
+        else:
+            lag_x, lag_y = lag(player)
+            player.draw(self.screen, camera_x + lag_x, camera_y + lag_y)
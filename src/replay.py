@@ -0,0 +1,191 @@
+"""Input recordings and headless replay verification.
+
+A recording stores the per-tick FrameInput of a session and the events it
+produced (state changes, level changes, coin and power-up pickups), plus the
+tick rate and the final time and score the game reported. Both streams are delta-encoded: an
+input entry is written only when the held/pressed keys change, and every
+entry stores the number of ticks since the previous one as a varint. The
+body is then zlib-compressed.
+
+Verify recordings with: python -m src.replay RUN.rec [...] [--levels PACK]
+"""
+import struct
+import sys
+import time
+import zlib
+from collections import namedtuple
+from .inputs import FrameInput
+from .simulation import Simulation
+from .level_format import LevelPack
+from .level_loader import LevelLoader
+from .constants import STATES
+
+MAGIC = b"PREC"
+VERSION = 3  # 2: tick rate stored, 3: rewind input bit
+READABLE_VERSIONS = (2, 3)  # Version 2 recordings never set the rewind bit
+HEADER = struct.Struct("<4sH")
+EVENT_KINDS = ["state", "level", "coin", "power_up"]
+
+REWIND_BIT = 1 << 5
+# FrameInput for every combination of the six input bits
+INPUT_TABLE = [FrameInput(*(bool(bits >> i & 1) for i in range(6))) for bits in range(64)]
+
+ReplayResult = namedtuple("ReplayResult", ["valid", "final_time", "score", "frames", "reason"])
+
+def input_bits(inputs):
+    """Pack a FrameInput into six bits."""
+    return (inputs.left | inputs.right << 1 | inputs.jump << 2
+            | inputs.confirm << 3 | inputs.restart << 4 | inputs.rewind << 5)
+
+def write_varint(buffer, value):
+    while value >= 0x80:
+        buffer.append(value & 0x7F | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+def read_varint(data, offset):
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+def encode_event(kind, value):
+    """Map a simulation event to (kind code, unsigned value)."""
+    if kind == "state":
+        return 0, STATES.index(value)
+    return EVENT_KINDS.index(kind), value
+
+class Recorder:
+    """Collects a simulation's inputs and events tick by tick (set as Simulation.recorder)."""
+    def __init__(self):
+        self.frames = 0
+        self.inputs = bytearray()  # (ticks since last change, bits) pairs
+        self.input_changes = 0
+        self.last_bits = 0
+        self.last_change = 0
+        self.events = bytearray()  # (ticks since last event, kind, value) triples
+        self.event_count = 0
+        self.last_event = 0
+
+    def record(self, inputs, events):
+        bits = input_bits(inputs)
+        if bits != self.last_bits:
+            write_varint(self.inputs, self.frames - self.last_change)
+            self.inputs.append(bits)
+            self.input_changes += 1
+            self.last_bits = bits
+            self.last_change = self.frames
+        for kind, value in events:
+            code, value = encode_event(kind, value)
+            write_varint(self.events, self.frames - self.last_event)
+            self.events.append(code)
+            write_varint(self.events, value)
+            self.event_count += 1
+            self.last_event = self.frames
+        self.frames += 1
+
+    def to_bytes(self, sim):
+        """Encode the recording with the final time and score reported by sim."""
+        body = bytearray()
+        write_varint(body, sim.tick_rate)
+        write_varint(body, self.frames)
+        write_varint(body, round(sim.final_time * 1000))
+        write_varint(body, sim.player.score)
+        write_varint(body, self.input_changes)
+        body += self.inputs
+        write_varint(body, self.event_count)
+        body += self.events
+        return HEADER.pack(MAGIC, VERSION) + zlib.compress(bytes(body), 9)
+
+    def save(self, path, sim):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes(sim))
+
+class Recording:
+    """A decoded recording."""
+    def __init__(self, data):
+        magic, version = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version not in READABLE_VERSIONS:
+            raise ValueError(f"not a version {' or '.join(map(str, READABLE_VERSIONS))} recording")
+        body = zlib.decompress(data[HEADER.size:])
+        self.tick_rate, offset = read_varint(body, 0)
+        self.frames, offset = read_varint(body, offset)
+        self.final_ticks, offset = read_varint(body, offset)
+        self.score, offset = read_varint(body, offset)
+        changes, offset = read_varint(body, offset)
+        self.input_changes = []  # (tick, bits)
+        tick = 0
+        for _ in range(changes):
+            delta, offset = read_varint(body, offset)
+            tick += delta
+            self.input_changes.append((tick, body[offset]))
+            offset += 1
+        event_count, offset = read_varint(body, offset)
+        self.events = body[offset:]  # Kept encoded; compared byte for byte
+        self.event_count = event_count
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def inputs(self):
+        """Yield the FrameInput for every recorded tick."""
+        bits = 0
+        tick = 0
+        for change_tick, new_bits in self.input_changes:
+            current = INPUT_TABLE[bits]
+            for _ in range(change_tick - tick):
+                yield current
+            tick = change_tick
+            bits = new_bits
+        current = INPUT_TABLE[bits]
+        for _ in range(self.frames - tick):
+            yield current
+
+def verify(recording, levels=None):
+    """Re-simulate a recording headless and check its events, final time and score."""
+    sim = Simulation(levels=levels, tick_rate=recording.tick_rate)
+    if any(bits & REWIND_BIT for _, bits in recording.input_changes):
+        sim.enable_rewind()  # The same history size the game keeps
+    sim.recorder = Recorder()
+    sim.run(recording.inputs())
+    final_ticks = round(sim.final_time * 1000)
+    result = dict(final_time=sim.final_time, score=sim.player.score, frames=sim.recorder.frames)
+    if sim.recorder.frames != recording.frames:
+        return ReplayResult(False, reason="frame count differs", **result)
+    if bytes(sim.recorder.events) != recording.events:
+        return ReplayResult(False, reason="events differ", **result)
+    if (final_ticks, sim.player.score) != (recording.final_ticks, recording.score):
+        return ReplayResult(False, reason="final time or score differs", **result)
+    return ReplayResult(True, reason="", **result)
+
+def main(argv):
+    paths = [arg for arg in argv if not arg.startswith("--")]
+    pack = None
+    if "--levels" in argv:
+        pack = argv[argv.index("--levels") + 1]
+        paths.remove(pack)
+    if not paths:
+        print("Usage: python -m src.replay RUN.rec [...] [--levels PACK]")
+        return 1
+    start = time.perf_counter()
+    failures = 0
+    for path in paths:
+        # Levels hold enemy positions, so every run starts from freshly built ones
+        levels = LevelLoader(LevelPack(pack), prefetch=False) if pack is not None else None
+        result = verify(Recording.load(path), levels)
+        status = "OK" if result.valid else f"FAIL ({result.reason})"
+        failures += not result.valid
+        print(f"{path}: {status} time={result.final_time:.2f}s score={result.score} frames={result.frames}")
+    elapsed = time.perf_counter() - start
+    print(f"Verified {len(paths)} runs in {elapsed:.2f}s ({len(paths) / elapsed * 60:.0f} runs/minute)")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,326 @@
+import pygame
+from .game_objects import Player, LevelOne, LevelTwo, LevelThree
+from .inputs import NO_INPUT
+from .level_loader import LevelLoader
+from .world import Camera
+from .physics import can_tunnel, sweep_aabb
+from .snapshot import SnapshotRing, take_snapshot, restore_snapshot
+from .profiler import PLAYER_UPDATE, ENEMY_UPDATE, CHECK_COLLISIONS
+from .constants import (SCREEN_HEIGHT, FPS, POWERUP_DURATION, POWERUP_JUMP_MULTIPLIER, REWIND_MEMORY,
+                        REWIND_MIN_SECONDS)
+
+class Simulation:
+    """Game logic (levels, collisions, state transitions) without display or input devices.
+
+    Each call to step() advances the world by one fixed tick of 1/tick_rate seconds,
+    so the simulation can run headless and uncapped for bots, CI and regression checks.
+    """
+    def __init__(self, levels=None, time_source=None, tick_rate=FPS):
+        self.running = True
+        self.state = "START"  # One of STATES
+        self.levels = levels if levels is not None else [LevelOne(), LevelTwo(), LevelThree()]
+        self.current_level_index = 0
+        self.player = Player(100, SCREEN_HEIGHT - 60, 40, 40)  # Start on ground
+        if isinstance(self.levels, LevelLoader):
+            self.total_coins = sum(self.levels.coin_counts)  # Counted from the pack index
+        else:
+            self.total_coins = sum(len(level.coins) for level in self.levels)  # Total coins
+        self.level_coin_counts = [0] * len(self.levels)  # Coins collected per level
+        self.powerup_timer = 0  # Tracks power-up duration
+        self.powerup_active = False
+        self.start_time = 0  # Set to 0 before start
+        self.final_time = 0  # Store final time when game is finished
+        self.frame = 0  # Number of ticks simulated
+        self.tick_rate = tick_rate  # Ticks per simulated second
+        # Tick length in 1/FPS units; kept an int when it divides evenly so 60 Hz stays exact
+        self.dt = FPS // tick_rate if FPS % tick_rate == 0 else FPS / tick_rate
+        # Millisecond clock for the timers, derived from simulation ticks by default
+        self.get_ticks = time_source if time_source is not None else self.simulation_ticks
+        self.tick_events = []  # (kind, value) events from the last step()
+        self.recorder = None  # Optional Recorder fed by step()
+        self.profiler = None  # Optional FrameProfiler timing the update phases
+        self.camera = Camera()  # Viewport; also decides which parts of large levels are simulated
+        self.interpolate = False  # Keep positions from before each tick for render interpolation
+        self.previous_positions = {}  # Object -> (x, y) before the last tick
+        self.checkpoints = {}  # Level index -> snapshot from when the player entered it, restored by restarts
+        self.rewind_buffer = None  # Optional SnapshotRing of recent ticks (see enable_rewind)
+
+    def simulation_ticks(self):
+        """Milliseconds of simulated time elapsed, derived from the tick counter."""
+        return self.frame * 1000 // self.tick_rate
+
+    def loaded_levels(self):
+        """Return the levels currently built in memory."""
+        if isinstance(self.levels, LevelLoader):
+            return self.levels.cached_levels()  # Levels not in memory load fresh
+        return self.levels
+
+    def enable_rewind(self, memory=REWIND_MEMORY):
+        """Keep a snapshot of every PLAYING tick in memory bytes, so FrameInput.rewind can step back.
+
+        Levels too big to keep REWIND_MIN_SECONDS of snapshots in memory are played without rewind.
+        """
+        self.rewind_buffer = SnapshotRing(memory, min_count=REWIND_MIN_SECONDS * self.tick_rate)
+
+    def restart_from_checkpoint(self):
+        """Put the current level back as it was when the player entered it; the timer keeps running."""
+        # Keyed by level so a rewind back into an earlier level restarts that level, not the later one
+        restore_snapshot(self, self.checkpoints[self.current_level_index], clock=False)
+
+    def reset_level(self):
+        """Reset player and levels, handle coin counts based on state."""
+        self.player.x = 100
+        self.player.y = SCREEN_HEIGHT - 60  # Start on ground
+        self.player.velocity_x = 0
+        self.player.velocity_y = 0
+        self.player.is_on_ground = True
+        self.player.jump_multiplier = 1  # Reset jump boost
+        self.powerup_timer = 0
+        self.powerup_active = False
+        if self.state == "START" or self.state == "FINISHED":
+            self.level_coin_counts = [0] * len(self.levels)  # Reset all coins
+        if self.state == "GAME_OVER":
+            self.level_coin_counts[self.current_level_index] = 0  # Reset current level coins
+        if self.state == "FINISHED":
+            self.start_time = self.get_ticks()  # Reset timer for new game
+        self.player.score = sum(self.level_coin_counts)  # Update score
+        for level in self.loaded_levels():
+            level.reset()  # Reset coins in all levels
+
+    def press_confirm(self):
+        """Handle a SPACE press: start, retry after game over, or replay."""
+        if self.state == "START":
+            self.reset_level()
+            self.state = "PLAYING"
+            self.start_time = self.get_ticks()  # Start time for timer
+            self.new_game()
+        elif self.state == "GAME_OVER":
+            self.restart_from_checkpoint()  # Restart current level
+        elif self.state == "FINISHED":
+            self.reset_level()
+            self.state = "PLAYING"
+            self.current_level_index = 0
+            self.new_game()
+
+    def new_game(self):
+        """Checkpoint the first level and forget checkpoints and rewind history from earlier games."""
+        self.checkpoints = {self.current_level_index: take_snapshot(self)}
+        if self.rewind_buffer is not None:
+            self.rewind_buffer.clear()
+
+    def press_restart(self):
+        """Handle an R press: restart the current level while playing."""
+        if self.state == "PLAYING":
+            self.restart_from_checkpoint()  # Restart current level
+
+    def sweep_platforms(self, level, previous):
+        """Move the player back along its path from previous to the first platform it hits.
+
+        Only platforms the move could tunnel through (see physics.can_tunnel)
+        are swept; the overlap resolution handles the rest as it always has.
+        """
+        player = self.player
+        x, y = previous
+        dx = player.x - x
+        dy = player.y - y
+        thinnest_width, thinnest_height = level.thinnest_platform
+        if not can_tunnel(dx, dy, player.width, player.height, thinnest_width, thinnest_height):
+            return
+        for _ in range(3):  # Slide along at most a wall and a floor
+            path = pygame.Rect(int(min(x, x + dx)) - 1, int(min(y, y + dy)) - 1,
+                               player.width + abs(dx) + 2, player.height + abs(dy) + 2)
+            hit = None
+            for platform in level.platform_index.query(path):
+                if not can_tunnel(dx, dy, player.width, player.height, platform.width, platform.height):
+                    continue
+                contact = sweep_aabb(x, y, player.width, player.height, dx, dy, platform.rect)
+                if contact is not None and (hit is None or contact[0] < hit[0]):
+                    hit = contact + (platform,)
+            if hit is None:
+                x += dx
+                y += dy
+                break
+            time, normal_x, normal_y, platform = hit
+            if normal_x:
+                # Stop at the wall and keep the rest of the vertical move
+                x = platform.x - player.width if normal_x < 0 else platform.x + platform.width
+                y += dy * time
+                dx = 0
+                dy *= 1 - time
+                player.velocity_x = 0
+            else:
+                # Land on (or bump the underside of) the platform and keep sliding sideways
+                x += dx * time
+                if normal_y < 0:
+                    y = platform.y - player.height
+                    player.is_on_ground = True
+                else:
+                    y = platform.y + platform.height
+                dx *= 1 - time
+                dy = 0
+                player.velocity_y = 0
+        player.x = x
+        player.y = y
+        player.rect.topleft = (x, y)
+
+    def resolve_platforms(self, previous=None):
+        """Push the player out of the current level's platforms (also used by client-side prediction)."""
+        current_level = self.levels[self.current_level_index]
+        if current_level.platform_index is None:
+            current_level.build_index()
+        platform_index = current_level.platform_index
+        if previous is not None:
+            self.sweep_platforms(current_level, previous)
+        # Only platforms near the player are tested; after a correction moves the
+        # player, the remaining candidates are re-queried at the new position.
+        candidates = platform_index.query(self.player.rect)
+        i = 0
+        while i < len(candidates):
+            platform = candidates[i]
+            i += 1
+            if self.player.rect.colliderect(platform.rect):
+                overlap_left = (self.player.x + self.player.width) - platform.x
+                overlap_right = (platform.x + platform.width) - self.player.x
+                overlap_top = (self.player.y + self.player.height) - platform.y
+                overlap_bottom = (platform.y + platform.height) - self.player.y
+                min_overlap = min(overlap_left, overlap_right, overlap_top, overlap_bottom)
+                if min_overlap == overlap_top and self.player.velocity_y > 0:
+                    self.player.y = platform.y - self.player.height
+                    self.player.velocity_y = 0
+                    self.player.is_on_ground = True
+                elif min_overlap == overlap_bottom and self.player.velocity_y < 0:
+                    self.player.y = platform.y + platform.height
+                    self.player.velocity_y = 0
+                elif min_overlap == overlap_left and self.player.velocity_x > 0:
+                    self.player.x = platform.x - self.player.width
+                    self.player.velocity_x = 0
+                elif min_overlap == overlap_right and self.player.velocity_x < 0:
+                    self.player.x = platform.x + platform.width
+                    self.player.velocity_x = 0
+                else:
+                    continue
+                self.player.rect.topleft = (self.player.x, self.player.y)
+                candidates = platform_index.query(self.player.rect, after=platform)
+                i = 0
+
+    def check_collisions(self, previous=None):
+        """Handle collisions between player and level objects.
+
+        previous is the player's (x, y) before this tick, used to sweep long moves.
+        """
+        current_level = self.levels[self.current_level_index]
+        self.resolve_platforms(previous)
+
+        for enemy in current_level.enemy_index.query(self.player.rect):
+            if self.player.rect.colliderect(enemy.rect):
+                self.state = "GAME_OVER"
+
+        # Collected items stay in the grids; their store slot says they are gone
+        for coin in current_level.coin_index.query(self.player.rect):
+            if not coin.collected and self.player.rect.colliderect(coin.rect):
+                current_level.coins.collect(coin.slot)
+                self.tick_events.append(("coin", coin.slot))
+                self.level_coin_counts[self.current_level_index] += 1
+                self.player.score += 1  # Score is always the sum of level_coin_counts
+
+        for powerup in current_level.power_up_index.query(self.player.rect):
+            if not powerup.collected and self.player.rect.colliderect(powerup.rect):
+                current_level.power_ups.collect(powerup.slot)
+                self.tick_events.append(("power_up", powerup.slot))
+                self.player.jump_multiplier = POWERUP_JUMP_MULTIPLIER  # Jump boost
+                self.powerup_timer = self.get_ticks()
+                self.powerup_active = True
+
+        # Manage power-up timer
+        if self.powerup_active:
+            if self.get_ticks() - self.powerup_timer > POWERUP_DURATION:
+                self.player.jump_multiplier = 1
+                self.powerup_active = False
+
+        # Transition to next level or finish
+        if self.state == "PLAYING" and not current_level.coins:
+            if self.current_level_index + 1 < len(self.levels):
+                self.current_level_index += 1
+                self.player.x = 100
+                self.player.y = SCREEN_HEIGHT - 20 - 40
+                self.player.velocity_x = 0
+                self.player.velocity_y = 0
+                self.player.is_on_ground = True
+                self.player.jump_multiplier = 1
+                self.powerup_timer = 0
+                self.powerup_active = False
+                self.checkpoints[self.current_level_index] = take_snapshot(self)
+            else:
+                self.final_time = (self.get_ticks() - self.start_time) / 1000  # Store final time in seconds
+                self.state = "FINISHED"
+
+    def update(self, inputs=NO_INPUT):
+        """Update game objects if in PLAYING state."""
+        self.frame += 1
+        if self.state == "PLAYING":
+            current_level = self.levels[self.current_level_index]
+            if current_level.platform_index is None:
+                current_level.build_index()
+            profiler = self.profiler
+            if profiler is not None:
+                profiler.mark()
+            player = self.player
+            previous = (player.x, player.y)
+            if self.interpolate:
+                self.previous_positions[player] = previous
+                self.previous_positions[self.camera] = (self.camera.x, self.camera.y)
+            player.world_width = current_level.width
+            player.world_height = current_level.height
+            player.update(inputs, self.dt)
+            if profiler is not None:
+                profiler.lap(PLAYER_UPDATE)
+            for enemy in current_level.awake_enemies(self.camera.view_rect(), self.dt):
+                if self.interpolate:
+                    self.previous_positions[enemy] = (enemy.x, enemy.y)
+                enemy.update(self.dt)
+                current_level.enemy_index.move(enemy)
+            if profiler is not None:
+                profiler.lap(ENEMY_UPDATE)
+            self.check_collisions(previous)
+            self.camera.follow(self.player, self.levels[self.current_level_index])
+            if profiler is not None:
+                profiler.lap(CHECK_COLLISIONS)
+
+    def step(self, inputs=NO_INPUT):
+        """Advance the simulation by one fixed tick driven by a FrameInput."""
+        if self.tick_events:
+            self.tick_events = []
+        state = self.state
+        level_index = self.current_level_index
+        rewind_buffer = self.rewind_buffer
+        if inputs.rewind and rewind_buffer is not None and state in ("PLAYING", "GAME_OVER"):
+            rewind_buffer.pop(self)  # One tick back, out of a game over too; the clock rewinds with it
+        else:
+            if inputs.confirm:
+                self.press_confirm()
+            if inputs.restart:
+                self.press_restart()
+            if rewind_buffer is not None and self.state == "PLAYING":
+                rewind_buffer.push(self)
+            self.update(inputs)
+        if self.state != state:
+            self.tick_events.append(("state", self.state))
+        if self.current_level_index != level_index:
+            self.tick_events.append(("level", self.current_level_index))
+        if self.previous_positions and (self.state != state or self.current_level_index != level_index):
+            self.previous_positions.clear()  # Don't interpolate across a reset
+        if self.recorder is not None:
+            self.recorder.record(inputs, self.tick_events)
+
+    def run(self, input_stream, observer=None):
+        """Step through every FrameInput in input_stream as fast as possible.
+
+        observer, if given, is called with the simulation after each tick (e.g. a renderer).
+        """
+        for inputs in input_stream:
+            if not self.running:
+                break
+            self.step(inputs)
+            if observer is not None:
+                observer(self)
+        return self
@@ -0,0 +1,191 @@
+"""Compact snapshots of the simulation, for rewinding and instant checkpoint restarts.
+
+A snapshot holds only what changes while the current level is played: the
+player's kinematics, each enemy's patrol position and direction, one bit per
+coin and power-up, the power-up timer, the level index and the clock.
+Platforms never change and enemy speeds are fixed, so neither is stored. The
+built-in levels take 56 to 65 bytes. Scrolling levels also store their enemy
+tick count and how many updates each sleeping enemy still has to catch up on.
+
+Restoring writes those fields back in place: nothing is rebuilt or
+reallocated, and the collectible stores are reset by a generation bump.
+"""
+import struct
+from .constants import STATES, POWERUP_JUMP_MULTIPLIER, REWIND_MEMORY
+from .world import ChunkedLevel
+
+# State, flags (on ground, power-up active, jump boost), level index, coins collected in the level,
+# frame, power-up timer in ms, player x, y, velocity x and velocity y
+HEADER = struct.Struct("<BBHHIIdddd")
+ENEMY = struct.Struct("<d")  # Patrol x; directions follow as one bit per enemy
+TICKS = struct.Struct("<I")  # ChunkedLevel only: enemy update ticks, then LAG per enemy
+LAG = struct.Struct("<I")  # Updates a sleeping enemy has missed; 0 while awake
+
+def snapshot_size(level):
+    """Bytes taken by a snapshot of the given level."""
+    enemies = len(level.enemies)
+    size = (HEADER.size + ENEMY.size * enemies + (enemies + 7) // 8
+            + (len(level.coins.items) + 7) // 8 + (len(level.power_ups.items) + 7) // 8)
+    if isinstance(level, ChunkedLevel):
+        size += TICKS.size + LAG.size * enemies
+    return size
+
+def pack_snapshot(sim, buffer, offset=0):
+    """Write a snapshot of sim into buffer at offset; returns the offset after it."""
+    index = sim.current_level_index
+    level = sim.levels[index]
+    player = sim.player
+    flags = player.is_on_ground | sim.powerup_active << 1 | (player.jump_multiplier != 1) << 2
+    HEADER.pack_into(buffer, offset, STATES.index(sim.state), flags, index, sim.level_coin_counts[index],
+                     sim.frame, sim.powerup_timer, player.x, player.y, player.velocity_x, player.velocity_y)
+    offset += HEADER.size
+    enemies = level.enemies
+    for enemy in enemies:
+        ENEMY.pack_into(buffer, offset, enemy.x)
+        offset += ENEMY.size
+    for start in range(0, len(enemies), 8):
+        byte = 0
+        for bit, enemy in enumerate(enemies[start:start + 8]):
+            if enemy.velocity_x < 0:
+                byte |= 1 << bit
+        buffer[offset] = byte
+        offset += 1
+    if isinstance(level, ChunkedLevel):
+        ticks = level.ticks
+        TICKS.pack_into(buffer, offset, ticks)
+        offset += TICKS.size
+        for enemy in enemies:
+            LAG.pack_into(buffer, offset, 0 if enemy in level.awake else ticks - level.asleep_since.get(enemy, 0))
+            offset += LAG.size
+    offset = level.coins.pack_bits(buffer, offset)
+    return level.power_ups.pack_bits(buffer, offset)
+
+def take_snapshot(sim):
+    """Return a snapshot of sim as a new bytearray."""
+    buffer = bytearray(snapshot_size(sim.levels[sim.current_level_index]))
+    pack_snapshot(sim, buffer)
+    return buffer
+
+def restore_snapshot(sim, data, offset=0, clock=True):
+    """Put sim back in the state a snapshot recorded.
+
+    With clock=False the frame counter keeps running, as it does over a
+    restart; the power-up timer is then only meaningful if no power-up was active.
+    """
+    (state, flags, index, coins, frame, powerup_timer,
+     x, y, velocity_x, velocity_y) = HEADER.unpack_from(data, offset)
+    offset += HEADER.size
+    # Levels played since the snapshot go back to untouched
+    for later in range(index + 1, sim.current_level_index + 1):
+        sim.level_coin_counts[later] = 0
+        sim.levels[later].reset()
+    sim.state = STATES[state]
+    sim.current_level_index = index
+    sim.level_coin_counts[index] = coins
+    if clock:
+        sim.frame = frame
+    sim.powerup_timer = powerup_timer
+    sim.powerup_active = bool(flags & 2)
+    player = sim.player
+    player.x = x
+    player.y = y
+    player.velocity_x = velocity_x
+    player.velocity_y = velocity_y
+    player.is_on_ground = bool(flags & 1)
+    player.jump_multiplier = POWERUP_JUMP_MULTIPLIER if flags & 4 else 1
+    player.score = sum(sim.level_coin_counts)
+    player.rect.topleft = (x, y)
+    level = sim.levels[index]
+    enemies = level.enemies
+    for enemy in enemies:
+        enemy.x = ENEMY.unpack_from(data, offset)[0]
+        enemy.rect.topleft = (enemy.x, enemy.y)
+        offset += ENEMY.size
+    for start in range(0, len(enemies), 8):
+        byte = data[offset]
+        offset += 1
+        for bit, enemy in enumerate(enemies[start:start + 8]):
+            speed = abs(enemy.velocity_x)
+            enemy.velocity_x = -speed if byte >> bit & 1 else speed
+    if level.enemy_index is not None:
+        for enemy in enemies:
+            level.enemy_index.move(enemy)
+    if isinstance(level, ChunkedLevel):
+        ticks = level.ticks = TICKS.unpack_from(data, offset)[0]
+        offset += TICKS.size
+        level.awake = {}
+        level.asleep_since = {}
+        for enemy in enemies:
+            lag = LAG.unpack_from(data, offset)[0]
+            offset += LAG.size
+            if lag:
+                level.asleep_since[enemy] = ticks - lag
+            else:
+                level.awake[enemy] = None  # Up to date; sleeps next tick if out of range
+    offset = level.coins.unpack_bits(data, offset)
+    offset = level.power_ups.unpack_bits(data, offset)
+    sim.camera.follow(player, level)
+    sim.previous_positions.clear()  # Nothing to interpolate from
+    return offset
+
+class SnapshotRing:
+    """The newest snapshots in one fixed block of memory, the oldest overwritten first.
+
+    Every slot is as large as the biggest snapshot pushed so far. A bigger
+    snapshot re-lays the ring with larger slots, keeping the newest that fit.
+    Snapshots too big to leave min_count slots aren't kept at all.
+    """
+    def __init__(self, memory=REWIND_MEMORY, slot_size=64, min_count=1):
+        self.buffer = bytearray(memory)
+        self.slot_size = slot_size
+        self.capacity = memory // slot_size
+        self.max_size = memory // min_count  # Largest snapshot that still leaves min_count slots
+        self.start = 0  # Slot of the oldest snapshot
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.start = 0
+        self.count = 0
+
+    def slot_offset(self, position):
+        """Offset of the snapshot position places after the oldest."""
+        return (self.start + position) % self.capacity * self.slot_size
+
+    def push(self, sim):
+        """Snapshot sim into the next slot; returns False, dropping the history, if the level is too big."""
+        size = snapshot_size(sim.levels[sim.current_level_index])
+        if size > self.max_size:
+            self.count = 0  # Rewinding can't cross a level whose ticks weren't kept
+            return False
+        if size > self.slot_size:
+            self.resize(size)
+        if self.count == self.capacity:
+            self.start = (self.start + 1) % self.capacity  # Overwrite the oldest
+        else:
+            self.count += 1
+        pack_snapshot(sim, self.buffer, self.slot_offset(self.count - 1))
+        return True
+
+    def pop(self, sim):
+        """Restore sim to the newest snapshot and drop it; returns False if there is none."""
+        if not self.count:
+            return False
+        self.count -= 1
+        restore_snapshot(sim, self.buffer, self.slot_offset(self.count))
+        return True
+
+    def resize(self, slot_size):
+        size = self.slot_size
+        kept = [bytes(self.buffer[offset:offset + size])
+                for offset in map(self.slot_offset, range(self.count))]
+        self.slot_size = slot_size
+        self.capacity = len(self.buffer) // slot_size
+        kept = kept[len(kept) - self.capacity:] if len(kept) > self.capacity else kept
+        self.start = 0
+        self.count = len(kept)
+        for position, snapshot in enumerate(kept):
+            offset = position * slot_size
+            self.buffer[offset:offset + size] = snapshot
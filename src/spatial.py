@@ -0,0 +1,102 @@
+from .constants import SPATIAL_CELL_SIZE
+
+class SpatialHash:
+    """Uniform grid that maps cells to the game objects whose rects cover them.
+
+    Queries return candidates in insertion order, so callers that resolve
+    collisions one object at a time behave exactly like a linear scan.
+    """
+    def __init__(self, objects=(), cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (cell_x, cell_y) -> list of objects
+        self.object_cells = {}  # object -> cell range it is stored under
+        self.order = {}  # object -> insertion index
+        self.next_order = 0
+        for obj in objects:
+            self.insert(obj)
+
+    def __len__(self):
+        return len(self.object_cells)
+
+    def cell_range(self, rect):
+        """Return the (x0, y0, x1, y1) cell bounds covered by rect."""
+        size = self.cell_size
+        x, y, width, height = rect
+        return (x // size, y // size,
+                (x + width - 1) // size if width > 0 else x // size,
+                (y + height - 1) // size if height > 0 else y // size)
+
+    def insert(self, obj):
+        """Add obj under every cell its rect covers."""
+        bounds = self.cell_range(obj.rect)
+        self.object_cells[obj] = bounds
+        self.order[obj] = self.next_order
+        self.next_order += 1
+        self._add_to_cells(obj, bounds)
+
+    def remove(self, obj):
+        """Remove obj from the grid if present."""
+        bounds = self.object_cells.pop(obj, None)
+        if bounds is None:
+            return
+        del self.order[obj]
+        self._remove_from_cells(obj, bounds)
+
+    def move(self, obj):
+        """Re-file obj after its rect moved; cheap when it stays in the same cells."""
+        old_bounds = self.object_cells.get(obj)
+        bounds = self.cell_range(obj.rect)
+        if bounds == old_bounds:
+            return
+        if old_bounds is not None:
+            self._remove_from_cells(obj, old_bounds)
+        else:
+            self.order[obj] = self.next_order
+            self.next_order += 1
+        self.object_cells[obj] = bounds
+        self._add_to_cells(obj, bounds)
+
+    def query(self, rect, after=None):
+        """Return objects sharing a cell with rect, in insertion order.
+
+        If after is given, only objects inserted after it are returned.
+        """
+        x0, y0, x1, y1 = self.cell_range(rect)
+        cells = self.cells
+        if x0 == x1 and y0 == y1:
+            found = cells.get((x0, y0), ())  # One bucket holds no duplicates
+        else:
+            found = {}
+            for cx in range(x0, x1 + 1):
+                for cy in range(y0, y1 + 1):
+                    bucket = cells.get((cx, cy))
+                    if bucket:
+                        found.update(dict.fromkeys(bucket))
+        order = self.order
+        if after is not None:
+            limit = order[after]
+            return sorted((obj for obj in found if order[obj] > limit), key=order.__getitem__)
+        if len(found) < 2:
+            return list(found)
+        return sorted(found, key=order.__getitem__)
+
+    def _add_to_cells(self, obj, bounds):
+        x0, y0, x1, y1 = bounds
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [obj]
+                else:
+                    bucket.append(obj)
+
+    def _remove_from_cells(self, obj, bounds):
+        x0, y0, x1, y1 = bounds
+        cells = self.cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells[(cx, cy)]
+                bucket.remove(obj)
+                if not bucket:
+                    del cells[(cx, cy)]
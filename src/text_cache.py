@@ -0,0 +1,59 @@
+from collections import OrderedDict
+import pygame
+from .constants import TEXT_CACHE_SIZE
+
+class TextCache:
+    """Bounded LRU cache of rendered text surfaces for HUD and menu text.
+
+    Without a font, the default font at size is loaded (and pygame.font
+    started) when the first text is rendered.
+    """
+    def __init__(self, font=None, max_entries=TEXT_CACHE_SIZE, size=36):
+        self._font = font
+        self.size = size
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()  # (text, color) -> Surface, least recently used first
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    @property
+    def font(self):
+        if self._font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            self._font = pygame.font.Font(None, self.size)
+        return self._font
+
+    def render(self, text, color):
+        """Return the antialiased surface for text, rasterizing it only on a cache miss."""
+        key = (text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self.font.render(text, True, color)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()  # Blit without per-frame format conversion
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)  # Evict least recently used
+        return surface
+
+    def draw_glyphs(self, screen, text, color, position):
+        """Draw text one cached glyph at a time and return the covered rect.
+
+        Used for strings that change every frame (the timer), which would
+        otherwise be rasterized again each frame and flush the cache.
+        """
+        x, y = position
+        area = pygame.Rect(x, y, 0, 0)
+        for char in text:
+            glyph = self.render(char, color)
+            area.union_ip(screen.blit(glyph, (x, y)))
+            x += glyph.get_width()
+        return area
@@ -0,0 +1,138 @@
+import math
+import pygame
+from .game_objects import Level
+from .constants import SCREEN_WIDTH, SCREEN_HEIGHT, CHUNK_SIZE, SPATIAL_CELL_SIZE
+
+class Camera:
+    """Top-left corner of the screen in world coordinates, following the player."""
+    def __init__(self):
+        self.x = 0
+        self.y = 0
+
+    def follow(self, player, level):
+        """Center the player on screen without showing anything outside the level."""
+        x = int(player.x + player.width / 2) - SCREEN_WIDTH // 2
+        y = int(player.y + player.height / 2) - SCREEN_HEIGHT // 2
+        self.x = max(0, min(x, level.width - SCREEN_WIDTH))
+        self.y = max(0, min(y, level.height - SCREEN_HEIGHT))
+
+    def view_rect(self):
+        return pygame.Rect(self.x, self.y, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+def fast_forward(enemy, steps, dt=1):
+    """Apply steps patrol updates to an enemy in constant time.
+
+    Positions stay on a lattice of one update's move from the current x. A
+    patrol runs from the last lattice point past the platform's left edge to
+    the first one past its right edge and back, so after that bounce period
+    the position repeats, and steps can be reduced modulo the period. The
+    result matches stepping exactly whenever a move is exact in floating point,
+    as it is at every tick rate dividing FPS; otherwise stepping accumulates
+    rounding, and a bounce can come one move earlier or later.
+    """
+    if steps <= 0:
+        return
+    platform = enemy.platform
+    left = platform.x
+    right = platform.x + platform.width - enemy.width  # Rightmost x still on the platform
+    if not left <= enemy.x <= right:
+        enemy.update(dt)  # From off the edge, one update either comes back on or never will
+        steps -= 1
+        if not left <= enemy.x <= right:
+            if steps % 2:
+                enemy.update(dt)  # Stuck flipping between two positions off the edge
+            return
+    speed = abs(enemy.velocity_x)
+    move = speed * dt
+    if not steps or not move:
+        return
+    x = enemy.x
+    last = math.floor((right - x) / move) + 1  # Lattice index of the right bounce
+    first = math.ceil((left - x) / move) - 1  # And of the left bounce (negative)
+    span = last - first
+    # Phase 0 is the left bounce heading right, phase span the right bounce heading left
+    phase = (steps + (-first if enemy.velocity_x > 0 else 2 * last - first)) % (2 * span)
+    if phase < span:
+        index = first + phase
+        enemy.velocity_x = speed
+    else:
+        index = 2 * last - first - phase
+        enemy.velocity_x = -speed
+    enemy.x = x + index * move
+    enemy.rect.topleft = (enemy.x, enemy.y)
+
+class Chunk:
+    """Objects whose area overlaps one chunk of a ChunkedLevel."""
+    __slots__ = ("platforms", "enemies", "coins", "power_ups")
+
+    def __init__(self):
+        self.platforms = []
+        self.enemies = []
+        self.coins = []
+        self.power_ups = []
+
+class ChunkedLevel(Level):
+    """Level larger than the screen, stored in fixed-size chunks.
+
+    Only enemies whose patrol platform overlaps the chunks around the camera
+    are updated; the others sleep and are fast-forwarded when they wake up.
+    """
+    def __init__(self, width, height, chunk_size=CHUNK_SIZE):
+        super().__init__()
+        self.width = width
+        self.height = height
+        self.chunk_size = chunk_size
+        self.chunks = None  # (chunk_x, chunk_y) -> Chunk, built with the spatial index
+        self.awake = {}  # Enemies updated last tick, in a stable order
+        self.asleep_since = {}  # Enemy -> ticks it had received when it fell asleep
+        self.ticks = 0  # Enemy update ticks simulated in this level
+
+    def chunk_keys(self, rect):
+        """Return the keys of every chunk that rect overlaps."""
+        size = self.chunk_size
+        x0, y0 = rect.left // size, rect.top // size
+        x1, y1 = (rect.right - 1) // size, (rect.bottom - 1) // size
+        return [(cx, cy) for cx in range(x0, x1 + 1) for cy in range(y0, y1 + 1)]
+
+    def build_index(self, cell_size=SPATIAL_CELL_SIZE):
+        """Build the broadphase grids and sort objects into chunks."""
+        super().build_index(cell_size)
+        self.chunks = {}
+        groups = [("platforms", self.platforms, lambda obj: obj.rect),
+                  ("enemies", self.enemies, lambda enemy: enemy.platform.rect.union(enemy.rect)),
+                  ("coins", self.coins.items, lambda obj: obj.rect),
+                  ("power_ups", self.power_ups.items, lambda obj: obj.rect)]
+        for name, objects, area in groups:
+            for obj in objects:
+                for key in self.chunk_keys(area(obj)):
+                    chunk = self.chunks.get(key)
+                    if chunk is None:
+                        chunk = self.chunks[key] = Chunk()
+                    getattr(chunk, name).append(obj)
+
+    def active_chunks(self, view):
+        """Return the chunks within one chunk of the view."""
+        margin = self.chunk_size
+        area = view.inflate(2 * margin, 2 * margin)
+        return [self.chunks[key] for key in self.chunk_keys(area) if key in self.chunks]
+
+    def awake_enemies(self, view, dt=1):
+        """Return the enemies to update this tick, waking and sleeping them as needed."""
+        awake = {}
+        for chunk in self.active_chunks(view):
+            for enemy in chunk.enemies:
+                awake[enemy] = None
+        for enemy in awake:
+            if enemy not in self.awake:
+                fast_forward(enemy, self.ticks - self.asleep_since.pop(enemy, 0), dt)
+                self.enemy_index.move(enemy)
+        for enemy in self.awake:
+            if enemy not in awake:
+                self.asleep_since[enemy] = self.ticks
+        self.awake = awake
+        self.ticks += 1
+        return awake
+
+    def visible_chunks(self, view):
+        """Return the (key, chunk) pairs overlapping the view, for rendering."""
+        return [(key, self.chunks[key]) for key in self.chunk_keys(view) if key in self.chunks]
@@ -0,0 +1,63 @@
+import random
+import unittest
+import numpy as np
+from src.batch import PlayerBatch, platform_arrays, round_rect_coords
+from src.simulation import Simulation
+from src.game_objects import Level, Platform, Coin, Player, LevelThree
+from src.inputs import FrameInput
+
+def platform_level(seed):
+    rng = random.Random(seed)
+    level = Level()
+    level.platforms = [Platform(0, 580, 800, 20)]
+    for _ in range(40):
+        level.platforms.append(Platform(rng.randrange(-50, 800), rng.randrange(0, 580),
+                                        rng.randrange(20, 200), rng.randrange(10, 40)))
+    level.coins = [Coin(-1000, -1000, 20, 20)]  # Unreachable, keeps the level from finishing
+    return level
+
+def level_three_platforms():
+    level = LevelThree()
+    level.power_ups = []  # The batch only covers platform physics
+    level.enemies = []
+    level.coins = [Coin(-1000, -1000, 20, 20)]
+    return level
+
+class TestPlayerBatch(unittest.TestCase):
+    def test_rounding_matches_rect(self):
+        player = Player(0, 0, 40, 40)
+        for value in [2.5, -2.5, 3.5, 1.7, -1.7, 0.49]:
+            player.rect.topleft = (value, 0)
+            self.assertEqual(player.rect.x, round_rect_coords(np.array([value]))[0])
+
+    def test_gravity_and_terminal_velocity(self):
+        batch = PlayerBatch(3, y=0)
+        for _ in range(30):
+            batch.update(False, False, False)
+        np.testing.assert_array_equal(batch.velocity_y, 10)
+
+    def test_matches_scalar_player(self):
+        count = 40
+        for seed, level in enumerate([platform_level(1), platform_level(2), level_three_platforms()]):
+            rng = random.Random(seed)
+            sims = [Simulation(levels=[level]) for _ in range(count)]
+            for i, sim in enumerate(sims):
+                sim.state = "PLAYING"
+                sim.player.x = rng.randrange(0, 760)
+                sim.player.y = rng.randrange(0, 560)
+                sim.player.jump_multiplier = rng.choice([1, 1.5])
+                sim.player.rect.topleft = (sim.player.x, sim.player.y)
+            batch = PlayerBatch.from_players([sim.player for sim in sims])
+            platforms = platform_arrays(level.platforms)
+            for _ in range(300):
+                inputs = [FrameInput(rng.random() < 0.4, rng.random() < 0.5, rng.random() < 0.3) for _ in sims]
+                for sim, frame_input in zip(sims, inputs):
+                    sim.update(frame_input)  # The real path, collision sweep included
+                batch.step(platforms, [i.left for i in inputs], [i.right for i in inputs], [i.jump for i in inputs])
+                np.testing.assert_array_equal(batch.x, [sim.player.x for sim in sims])
+                np.testing.assert_array_equal(batch.y, [sim.player.y for sim in sims])
+                np.testing.assert_array_equal(batch.velocity_y, [sim.player.velocity_y for sim in sims])
+                np.testing.assert_array_equal(batch.is_on_ground, [sim.player.is_on_ground for sim in sims])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+from src.collectibles import CollectibleStore
+from src.game_objects import Coin, LevelOne
+from src.simulation import Simulation
+from src.inputs import FrameInput
+
+class TestCollectibleStore(unittest.TestCase):
+    def setUp(self):
+        self.coins = [Coin(x, 100, 20, 20) for x in range(0, 100, 20)]
+        self.store = CollectibleStore(self.coins)
+
+    def test_collect_updates_remaining(self):
+        self.assertTrue(self.store.collect(2))
+        self.assertFalse(self.store.collect(2))
+        self.assertEqual(len(self.store), 4)
+        self.assertTrue(self.coins[2].collected)
+        self.assertNotIn(self.coins[2], list(self.store))
+
+    def test_reset_bumps_generation(self):
+        for coin in self.coins:
+            coin.collected = True
+        self.assertFalse(self.store)
+        self.store.reset()
+        self.assertEqual(len(self.store), 5)
+        self.assertFalse(any(coin.collected for coin in self.coins))
+        self.assertEqual(list(self.store), self.coins)
+
+    def test_level_reset_reuses_objects(self):
+        level = LevelOne()
+        coins = level.coins.copy()
+        level.coins.collect(0)
+        level.reset()
+        self.assertEqual(list(level.coins), coins)
+        self.assertEqual(len(level.coins), 2)
+
+    def test_restart_restores_collected_coin(self):
+        sim = Simulation()
+        sim.run([FrameInput(confirm=True)] + [FrameInput(right=True)] * 60)
+        self.assertEqual((sim.player.score, len(sim.levels[0].coins)), (1, 1))
+        sim.step(FrameInput(restart=True))
+        self.assertEqual((sim.player.score, len(sim.levels[0].coins)), (0, 2))
+
+if __name__ == "__main__":
+    unittest.main()
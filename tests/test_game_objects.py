@@ -82,5 +82,17 @@ class TestGameObjects(unittest.TestCase):
         self.assertTrue(powerup.collected)
         self.assertEqual(player.jump_multiplier, 2)
 
+    def test_identical_objects_share_surface(self):
+        coins = [Coin(x, 100, 20, 20) for x in range(0, 200, 20)]
+        self.assertTrue(all(coin.image is coins[0].image for coin in coins))
+        self.assertIsNot(PowerUp(0, 0, 20, 20).image, coins[0].image)  # Different color
+        self.assertIsNot(Coin(0, 0, 30, 30).image, coins[0].image)  # Different size
+
+    def test_objects_use_slots(self):
+        for obj in (self.player, self.platform, self.enemy, self.coin):
+            self.assertFalse(hasattr(obj, "__dict__"))
+            with self.assertRaises(AttributeError):
+                obj.unknown_attribute = 1
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
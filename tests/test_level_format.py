@@ -0,0 +1,73 @@
+import glob
+import json
+import os
+import tempfile
+import unittest
+from src.level_format import LevelPack, compile_levels, level_to_dict, load_level_json, encode_level, decode_level
+from src.level_loader import LevelLoader
+from src.game_objects import LevelOne, LevelTwo, LevelThree, FastEnemy
+from src.simulation import Simulation
+from src.inputs import FrameInput
+
+LEVEL_DIR = os.path.join(os.path.dirname(__file__), "..", "levels")
+
+class TestLevelFormat(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.sources = [level_to_dict(level) for level in (LevelOne(), LevelTwo(), LevelThree())]
+        self.pack_path = os.path.join(self.tmp.name, "levels.pak")
+        compile_levels(self.sources, self.pack_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_json_sources_match_builtin_levels(self):
+        paths = sorted(glob.glob(os.path.join(LEVEL_DIR, "level*.json")))
+        self.assertEqual([level_to_dict(load_level_json(p)) for p in paths], self.sources)
+
+    def test_binary_round_trip(self):
+        for data in self.sources:
+            self.assertEqual(decode_level(encode_level(data)), json.loads(json.dumps(data)))
+
+    def test_pack_index_and_load(self):
+        pack = LevelPack(self.pack_path)
+        self.assertEqual(len(pack), 3)
+        self.assertEqual(pack.coin_counts(), [2, 2, 3])
+        level = pack.load(2)
+        self.assertIsInstance(level.enemies[0], FastEnemy)
+        self.assertIs(level.enemies[0].platform, level.platforms[3])
+        pack.close()
+
+    def test_loader_builds_on_demand_with_bounded_cache(self):
+        sources = self.sources * 4
+        compile_levels(sources, self.pack_path)
+        loader = LevelLoader(LevelPack(self.pack_path), cache_size=2, prefetch=False)
+        self.assertEqual(loader.cached_levels(), [])
+        first = loader[0]
+        self.assertIs(loader[0], first)
+        loader[1]
+        loader[2]
+        self.assertEqual(len(loader.cached_levels()), 2)
+        self.assertIsNot(loader[0], first)  # Evicted and rebuilt
+        loader.close()
+
+    def test_loader_prefetches_next_level(self):
+        loader = LevelLoader(LevelPack(self.pack_path))
+        loader[0]
+        loader.pending[1].result()
+        self.assertEqual(level_to_dict(loader[1]), self.sources[1])
+        loader.close()
+
+    def test_simulation_plays_the_same_from_a_pack(self):
+        inputs = [FrameInput(confirm=True)] + [FrameInput(right=i % 200 < 120, left=i % 200 >= 120, jump=i % 30 < 3)
+                                               for i in range(1500)]
+        builtin = Simulation().run(inputs)
+        loader = LevelLoader(LevelPack(self.pack_path))
+        packed = Simulation(levels=loader).run(inputs)
+        self.assertEqual(packed.total_coins, builtin.total_coins)
+        self.assertEqual((packed.player.x, packed.player.y, packed.state, packed.level_coin_counts),
+                         (builtin.player.x, builtin.player.y, builtin.state, builtin.level_coin_counts))
+        loader.close()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,126 @@
+import asyncio
+import unittest
+from src.netplay import (GameServer, PredictedClient, ClientProtocol, Room, encode_delta, decode_delta,
+                         collected_words, apply_collected_words, FIXED, INPUT, JOIN, INPUT_MESSAGE)
+from src.inputs import FrameInput, NO_INPUT
+from src.game_objects import LevelOne
+
+class LoopbackTransport:
+    """Collects datagrams sent by a GameServer instead of putting them on a socket."""
+    def __init__(self):
+        self.sent = []
+
+    def sendto(self, data, address):
+        self.sent.append((data, address))
+
+def script(tick):
+    return FrameInput(right=tick % 90 < 60, left=tick % 90 >= 75, jump=tick % 45 == 0)
+
+class TestNetplay(unittest.TestCase):
+    def test_delta_round_trip(self):
+        base = [0, 2, 5, 200, -40, 7, 0, 1 << 29]
+        state = [0, 2, 6, 200, -44, 7, 3, 1 << 29]
+        data = encode_delta(state, base)
+        self.assertEqual(decode_delta(data, 0, base), state)
+        self.assertEqual(decode_delta(encode_delta(state, [0] * len(state)), 0, None), state)
+        self.assertEqual(len(encode_delta(base, base)), 2)  # Nothing changed
+
+    def test_collected_bitsets(self):
+        server, client = LevelOne(), LevelOne()
+        server.coins.collect(1)
+        client.coins.collect(0)
+        apply_collected_words(client.coins, collected_words(server.coins))
+        self.assertEqual([client.coins.is_collected(slot) for slot in range(len(client.coins.items))],
+                         [server.coins.is_collected(slot) for slot in range(len(server.coins.items))])
+        self.assertEqual(len(client.coins), len(server.coins))
+
+    def test_prediction_matches_server(self):
+        server = GameServer()
+        server.transport = LoopbackTransport()
+        address = ("client", 1)
+        server.join(7, address)
+        client = PredictedClient()
+        client.receive(server.transport.sent.pop()[0])
+        in_flight = []  # Simulates one tick of latency each way
+        level_changes = 0
+        for tick in range(400):
+            level = client.sim.current_level_index
+            in_flight.append(client.input_message(script(tick)))
+            if len(in_flight) > 1:
+                server.datagram_received(in_flight.pop(0), address)
+            server.step()
+            for data, _ in server.transport.sent:
+                client.receive(data)
+            server.transport.sent.clear()
+            level_changes += client.sim.current_level_index != level
+        _, slot = server.clients[address]
+        # The server is one input behind; prediction agrees with it once that input is replayed
+        self.assertEqual(len(client.pending), 1)
+        # Only the respawns on level changes, which the client can't predict, are corrected
+        self.assertGreater(level_changes, 0)
+        self.assertEqual(client.corrections, level_changes)
+        self.assertLess(server.bytes_sent / server.ticks, 60)  # Deltas, not full snapshots
+        server.datagram_received(in_flight.pop(0), address)
+        server.step()
+        player = client.sim.player
+        self.assertEqual((player.x, player.y), (slot.player.x, slot.player.y))
+
+    def test_room_runs_players_independently(self):
+        room = Room(1)
+        first, second = room.add_player("a"), room.add_player("b")
+        first.receive_inputs(1, bytes([2]))  # Hold right
+        for _ in range(30):
+            room.step()
+        self.assertGreater(first.player.x, second.player.x)
+        state = room.state()
+        self.assertEqual(state[:2], [0, 2])
+        self.assertEqual(state[3] / FIXED, first.player.x)
+
+    def test_malformed_datagrams_are_ignored(self):
+        server = GameServer()
+        server.transport = LoopbackTransport()
+        address = ("client", 1)
+        server.join(0, address)
+        server.datagram_received(b"", address)
+        server.datagram_received(bytes([INPUT, 1]), address)  # Truncated header
+        server.datagram_received(bytes([JOIN]), address)
+        # Bits outside the FrameInput table are masked off: 198 holds right and jumps
+        server.datagram_received(INPUT_MESSAGE.pack(INPUT, 1, 0, 1) + bytes([198]), address)
+        for _ in range(10):
+            server.step()
+        _, slot = server.clients[address]
+        self.assertEqual(slot.processed_seq, 1)
+        self.assertGreater(slot.player.x, 100)
+
+    def test_loopback_server(self):
+        async def session():
+            loop = asyncio.get_running_loop()
+            server = GameServer()
+            transport, _ = await loop.create_datagram_endpoint(lambda: server, local_addr=("127.0.0.1", 0))
+            address = transport.get_extra_info("sockname")
+            clients = []
+            for _ in range(2):
+                protocol = ClientProtocol(PredictedClient(), room_id=3)
+                await loop.create_datagram_endpoint(lambda: protocol, remote_addr=address)
+                clients.append(protocol)
+            run = asyncio.ensure_future(server.run(40))
+            for tick in range(40):
+                for protocol in clients:
+                    protocol.send_input(script(tick) if protocol is clients[0] else NO_INPUT)
+                await asyncio.sleep(1 / 60)
+            await run
+            await asyncio.sleep(0.05)
+            for protocol in clients:
+                protocol.close()
+            transport.close()
+            return server, clients
+
+        server, clients = asyncio.run(session())
+        self.assertEqual(sorted(protocol.client.player_id for protocol in clients), [0, 1])
+        for protocol in clients:
+            self.assertGreater(protocol.client.tick, 0)
+            self.assertEqual(len(protocol.client.others), 1)
+        self.assertEqual(len(server.rooms), 1)
+
+if __name__ == "__main__":
+    unittest.main()
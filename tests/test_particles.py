@@ -0,0 +1,84 @@
+import os
+import unittest
+import numpy as np
+import pygame
+from src.particles import ParticleSystem, emit_tick_events
+from src.game_objects import LevelOne, Player
+from src.constants import YELLOW, RED
+
+class TestParticleSystem(unittest.TestCase):
+    def test_expired_particles_are_compacted(self):
+        particles = ParticleSystem(capacity=100, seed=1)
+        particles.emit(50, 50, 30, YELLOW, life=10)
+        particles.emit(60, 60, 30, RED, life=40)
+        lives = sorted(particles.arrays["life"][:60].tolist())
+        buffers = {id(array) for array in particles.arrays.values()} | {id(array) for array in particles.spare.values()}
+        for tick in range(1, 41):
+            particles.update()
+            self.assertEqual(particles.count, sum(life > tick for life in lives))
+        self.assertEqual(particles.count, 0)
+        # Only the two preallocated sets of arrays are ever used
+        self.assertEqual(buffers, {id(array) for array in particles.arrays.values()}
+                         | {id(array) for array in particles.spare.values()})
+
+    def test_survivors_keep_their_state(self):
+        particles = ParticleSystem(capacity=10, seed=2)
+        particles.emit(0, 0, 10, RED, speed=0, life=5)
+        particles.arrays["life"][:10] = [1, 5, 1, 5, 5, 1, 1, 5, 1, 5]
+        particles.arrays["x"][:10] = np.arange(10)
+        particles.update()
+        np.testing.assert_array_equal(particles.arrays["x"][:particles.count], [1, 3, 4, 7, 9])
+
+    def test_pool_is_capped(self):
+        particles = ParticleSystem(capacity=50)
+        self.assertEqual(particles.emit(0, 0, 40, YELLOW), 40)
+        self.assertEqual(particles.emit(0, 0, 40, YELLOW), 10)
+        self.assertEqual(particles.emit(0, 0, 40, YELLOW), 0)
+        self.assertEqual(particles.count, 50)
+
+    def test_draw_blits_every_particle(self):
+        surface = pygame.Surface((100, 100))
+        particles = ParticleSystem(capacity=10)
+        particles.emit(20, 30, 1, YELLOW, speed=0)
+        particles.emit(70, 80, 1, RED, speed=0)
+        rect = particles.draw(surface)
+        self.assertEqual(surface.get_at((20, 30))[:3], YELLOW)
+        self.assertEqual(surface.get_at((70, 80))[:3], RED)
+        self.assertTrue(rect.collidepoint(20, 30) and rect.collidepoint(70, 80))
+        self.assertIsNone(ParticleSystem(capacity=10).draw(surface))
+
+    def test_pixel_writes_match_blits(self):
+        particles = ParticleSystem(capacity=3000, seed=3)
+        for i in range(3000):  # Squares don't overlap, so the drawing order doesn't matter
+            particles.emit(i % 60 * 4 + 2, i // 60 * 4 + 2, 1, YELLOW if i % 3 else RED, speed=0)
+        written = pygame.Surface((240, 200), depth=32)  # 3000 particles go straight into the pixels
+        blitted = pygame.Surface((240, 200), depth=24)  # Not 32-bit, so always blitted
+        self.assertEqual(particles.draw(written), particles.draw(blitted))
+        self.assertEqual(pygame.image.tobytes(written, "RGB"), pygame.image.tobytes(blitted, "RGB"))
+
+    def test_events_start_effects(self):
+        level = LevelOne()
+        particles = ParticleSystem(capacity=1000)
+        emit_tick_events(particles, [("coin", 0)], level, Player(100, 100, 40, 40))
+        self.assertGreater(particles.count, 0)
+        x, y = level.coins.items[0].rect.center
+        self.assertEqual((particles.arrays["x"][0], particles.arrays["y"][0]), (x, y))
+        emit_tick_events(particles, [("state", "PLAYING")], level, Player(100, 100, 40, 40))
+        self.assertEqual(particles.count, 0)
+
+    def test_game_emits_on_pickup(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        from src.game import GameManager
+        from src.inputs import FrameInput
+        game = GameManager()
+        game.step(FrameInput(confirm=True))
+        coin = game.levels[0].coins.items[0]
+        game.player.x, game.player.y = coin.x, coin.y
+        game.player.rect.topleft = (coin.x, coin.y)
+        game.step(FrameInput())
+        self.assertIn(("coin", 0), game.tick_events)
+        self.assertGreater(game.particles.count, 0)
+        game.render()
+
+if __name__ == "__main__":
+    unittest.main()
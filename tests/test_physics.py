@@ -0,0 +1,132 @@
+import os
+import random
+import unittest
+from src.physics import sweep_aabb, FixedTimestep, interpolate
+from src.simulation import Simulation
+from src.game_objects import Level, Platform, Coin
+from src.inputs import FrameInput, NO_INPUT
+
+def thin_level():
+    """Ground, a 2 px ledge and a 4 px wall: both thinner than a 10 Hz tick's move."""
+    level = Level()
+    level.platforms = [Platform(0, 580, 800, 20), Platform(0, 300, 800, 2), Platform(400, 400, 4, 180)]
+    level.coins = [Coin(10, 10, 20, 20)]  # Out of the way, so the level doesn't end
+    return level
+
+def random_level(seed):
+    """Scattered platforms 10 to 40 px thick, some thinner than a boosted jump's 14.5 px step."""
+    rng = random.Random(seed)
+    level = Level()
+    level.platforms = [Platform(0, 580, 800, 20)]
+    for _ in range(40):
+        level.platforms.append(Platform(rng.randrange(-50, 800), rng.randrange(0, 580),
+                                        rng.randrange(20, 200), rng.randrange(10, 40)))
+    level.coins = [Coin(-1000, -1000, 20, 20)]
+    return level
+
+def playing(tick_rate, levels=None):
+    sim = Simulation(levels=levels or [thin_level()], tick_rate=tick_rate)
+    sim.press_confirm()
+    return sim
+
+class TestPhysics(unittest.TestCase):
+    def test_sweep_aabb(self):
+        ledge = Platform(0, 100, 200, 2).rect
+        self.assertEqual(sweep_aabb(50, 0, 40, 40, 0, 100, ledge), (0.6, 0, -1))
+        self.assertEqual(sweep_aabb(50, 200, 40, 40, 0, -100, ledge), (0.98, 0, 1))
+        self.assertIsNone(sweep_aabb(250, 0, 40, 40, 0, 100, ledge))  # Passes beside it
+        self.assertIsNone(sweep_aabb(50, 0, 40, 40, 0, 50, ledge))  # Stops short
+        self.assertIsNone(sweep_aabb(50, 80, 40, 40, 0, 10, ledge))  # Already overlapping
+        wall = Platform(100, 0, 4, 200).rect
+        self.assertEqual(sweep_aabb(0, 50, 40, 40, 120, 0, wall), (0.5, -1, 0))
+
+    def test_fixed_timestep(self):
+        timestep = FixedTimestep(30)
+        self.assertEqual(timestep.advance(1 / 60), 0)
+        self.assertAlmostEqual(timestep.alpha, 0.5)
+        self.assertEqual(timestep.advance(1 / 60 + 1 / 30), 2)
+        self.assertAlmostEqual(timestep.alpha, 0.0)
+        self.assertEqual(timestep.advance(10), 5)  # A long stall is dropped, not replayed
+        self.assertAlmostEqual(timestep.accumulator, 0.0)
+        self.assertEqual(interpolate((0, 0), (10, 20), 0.25), (2.5, 5.0))
+
+    def test_no_tunneling_at_low_tick_rates(self):
+        for tick_rate in (60, 30, 10):
+            sim = playing(tick_rate)
+            sim.player.y = 0  # Fall onto the 2 px ledge at terminal velocity
+            for _ in range(tick_rate * 2):
+                sim.step(NO_INPUT)
+            self.assertEqual(sim.player.y, 260, tick_rate)
+            self.assertTrue(sim.player.is_on_ground)
+            sim = playing(tick_rate)
+            for _ in range(tick_rate * 2):
+                sim.step(FrameInput(right=True))
+            self.assertEqual(sim.player.x, 360, tick_rate)  # Stopped by the 4 px wall
+
+    def test_60hz_play_never_sweeps(self):
+        for seed in range(3):
+            rng = random.Random(seed)
+            swept, discrete = playing(60, [random_level(seed)]), playing(60, [random_level(seed)])
+            for sim in (swept, discrete):
+                sim.player.jump_multiplier = 1.5  # Boosted jumps move 14.5 px in a tick
+            for _ in range(600):
+                inputs = FrameInput(rng.random() < 0.4, rng.random() < 0.5, rng.random() < 0.3)
+                swept.step(inputs)
+                discrete.player.update(inputs)
+                discrete.check_collisions()  # The overlap resolver alone
+                self.assertEqual((swept.player.x, swept.player.y, swept.player.velocity_y),
+                                 (discrete.player.x, discrete.player.y, discrete.player.velocity_y), seed)
+
+    def test_motion_independent_of_tick_rate(self):
+        trajectories = {}
+        for tick_rate in (60, 30, 20):
+            level = Level()
+            level.platforms = [Platform(0, 580, 800, 20)]
+            level.coins = [Coin(10, 10, 20, 20)]
+            sim = playing(tick_rate, levels=[level])
+            positions = []
+            for tick in range(tick_rate):  # One second of running and jumping
+                sim.step(FrameInput(right=True, jump=tick == 0))
+                positions.append((sim.player.x, sim.player.y))
+            trajectories[tick_rate] = positions
+        for tick_rate in (30, 20):
+            step = 60 // tick_rate
+            # The slow ticks land exactly on every step-th position of the 60 Hz run
+            self.assertEqual(trajectories[tick_rate], trajectories[60][step - 1::step])
+
+    def test_one_tick_per_frame_at_the_frame_rate(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        from src.game import GameManager
+        counts = {}
+        for tick_rate in (60, 30):
+            game = GameManager(tick_rate=tick_rate)
+            jitter = iter([15, 18, 16, 17] * 75)  # clock.tick never returns exactly 1/60 s
+            game.clock = type("Clock", (), {"tick": lambda self, fps: next(jitter)})()
+            frames = []
+            ticks = []
+
+            def handle_events():
+                frames.append(None)
+                game.running = len(frames) < 300
+
+            game.handle_events = handle_events
+            game.step = ticks.append
+            game.run()
+            counts[tick_rate] = len(ticks)
+        self.assertEqual(counts[60], 300)  # No skipped or doubled ticks from the jitter
+        self.assertAlmostEqual(counts[30], 300 * 16.5 / 1000 * 30, delta=2)  # Paced by real time
+
+    def test_render_interpolation(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        from src.game import GameManager
+        game = GameManager(tick_rate=30)
+        self.assertTrue(game.interpolate)
+        game.step(FrameInput(confirm=True))
+        game.step(FrameInput(right=True))
+        self.assertEqual(game.player.x, 110)
+        game.alpha = 0.25  # A quarter of the way from the last tick to the next
+        self.assertEqual(game.render_lag(game.player)[0], 7.5)
+        game.render()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import statistics
+import unittest
+from src.playtest import (RunningStats, PlaytestStats, playtest, run_episode, builtin_levels, capture_enemies,
+                          EPISODE, LEVEL)
+
+class TestPlaytest(unittest.TestCase):
+    def test_running_stats(self):
+        values = [3.0, 1.5, 4.0, 1.0, 5.5, 9.0, 2.5]
+        stats = RunningStats()
+        for value in values:
+            stats.add(value)
+        self.assertAlmostEqual(stats.mean, statistics.mean(values))
+        self.assertAlmostEqual(stats.stdev, statistics.stdev(values))
+        self.assertEqual((stats.min, stats.max, stats.count), (1.0, 9.0, 7))
+
+    def test_reused_levels_play_like_fresh_ones(self):
+        levels = builtin_levels()
+        captured = capture_enemies(levels)
+        records = [run_episode(levels, captured, "seeker", seed, 900) for seed in (1, 2, 1)]
+        self.assertEqual(records[0], records[2])
+        fresh = builtin_levels()
+        self.assertEqual(run_episode(fresh, capture_enemies(fresh), "seeker", 2, 900), records[1])
+        self.assertEqual(len(records[0]), EPISODE.size + 3 * LEVEL.size)
+
+    def test_records_aggregate_incrementally(self):
+        levels = builtin_levels()
+        captured = capture_enemies(levels)
+        stats = PlaytestStats(3)
+        for seed in range(10):
+            stats.add_records(run_episode(levels, captured, "random", seed, 600))
+        self.assertEqual(stats.episodes, 10)
+        self.assertEqual(sum(stats.outcomes.values()), 10)
+        self.assertEqual(stats.reached[0], 10)
+        self.assertEqual(sum(stats.coin_histograms[0].values()), 10)
+        self.assertEqual(sum(stats.hotspots.values()), stats.outcomes["died"])
+
+    def test_records_fit_big_packs_and_wide_levels(self):
+        stats = PlaytestStats(300)
+        stats.add_records(EPISODE.pack(7, 1, 299, 600, 40000, 500) + LEVEL.pack(2, 1) * 300)
+        self.assertEqual(stats.reached[299], 1)
+        self.assertEqual(stats.hotspots[(299, 1000, 12)], 1)
+
+    def test_parallel_matches_serial(self):
+        serial = playtest(24, "random", workers=1, max_ticks=600, batch_size=5).to_dict()
+        parallel = playtest(24, "random", workers=2, max_ticks=600, batch_size=5).to_dict()
+        for key in ("episodes", "outcomes", "hotspots"):
+            self.assertEqual(serial[key], parallel[key])
+        for ours, theirs in zip(serial["levels"], parallel["levels"]):
+            self.assertEqual(ours["coin_histogram"], theirs["coin_histogram"])
+            self.assertEqual(ours["time_histogram"], theirs["time_histogram"])
+            self.assertAlmostEqual(ours["time"]["mean"], theirs["time"]["mean"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import csv
+import json
+import os
+import tempfile
+import unittest
+from src.profiler import FrameProfiler, PHASES, RENDER, percentile
+from src.simulation import Simulation
+from src.inputs import FrameInput
+
+class TestFrameProfiler(unittest.TestCase):
+    def setUp(self):
+        self.sim = Simulation()
+        self.sim.profiler = FrameProfiler(capacity=50)
+        self.sim.step(FrameInput(confirm=True))
+        for _ in range(80):
+            self.sim.profiler.begin_frame()
+            self.sim.step(FrameInput(right=True))
+            self.sim.profiler.lap(RENDER)
+
+    def test_ring_buffer_keeps_last_frames(self):
+        frames = self.sim.profiler.recent_frames()
+        self.assertEqual(len(frames), 50)
+        self.assertEqual(frames[-1][0], 79)
+
+    def test_update_phases_are_timed(self):
+        phases = self.sim.profiler.summary()["phases"]
+        self.assertGreater(phases["player_update"], 0)
+        self.assertGreater(phases["check_collisions"], 0)
+        self.assertEqual(phases["display_flip"], 0)
+
+    def test_percentiles(self):
+        self.assertEqual(percentile([1, 2, 3, 4], 0.5), 3)
+        stats = self.sim.profiler.summary()
+        self.assertLessEqual(stats["p50"], stats["p99"])
+        self.assertGreater(stats["fps"], 0)
+
+    def test_exports(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "frames.csv")
+            trace_path = os.path.join(tmp, "frames.trace.json")
+            self.sim.profiler.export_csv(csv_path)
+            self.sim.profiler.export_chrome_trace(trace_path)
+            with open(csv_path) as f:
+                rows = list(csv.reader(f))
+            with open(trace_path) as f:
+                trace = json.load(f)
+        self.assertEqual(len(rows), 51)
+        self.assertEqual(rows[0][2:], [f"{name}_ms" for name in PHASES])
+        names = {event["name"] for event in trace["traceEvents"] if event["ph"] == "X"}
+        self.assertTrue({"player_update", "check_collisions", "render"} <= names)
+
+    def test_overlay_toggle(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        from src.game import GameManager
+        game = GameManager()
+        self.assertIsNone(game.profiler)
+        game.toggle_profiler()
+        game.step(FrameInput(confirm=True))
+        game.profiler.begin_frame()
+        game.render()
+        self.assertTrue(game.overlay_lines[0].startswith("FPS"))
+        game.toggle_profiler()
+        self.assertIsNone(game.profiler)
+
+if __name__ == "__main__":
+    unittest.main()
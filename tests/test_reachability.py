@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import unittest
+from src.reachability import jump_arc, analyze, analyze_level, analyze_pack, level_key, ReportCache
+from src.level_format import compile_levels, encode_level, level_from_dict
+from src.simulation import Simulation
+from src.game_objects import Player, LevelOne, LevelTwo, LevelThree
+from src.inputs import FrameInput
+from src.constants import PLAYER_SPEED
+
+LEVEL_FILES = ["levels/level1.json", "levels/level2.json", "levels/level3.json"]
+
+def load(path):
+    with open(path) as f:
+        return json.load(f)
+
+class TestReachability(unittest.TestCase):
+    def test_jump_arc_follows_player_update(self):
+        player = Player(0, 200, 40, 40)
+        player.is_on_ground = True
+        arc = jump_arc(1)
+        for tick in range(1, 60):
+            player.update(FrameInput(right=True, jump=tick == 1))
+            reach, feet, _ = arc[tick]
+            self.assertEqual(reach, PLAYER_SPEED * tick)
+            offset = player.y - 200
+            self.assertTrue(any(high <= offset <= low for high, low in feet))
+            if player.velocity_y < 0:
+                self.assertEqual(feet[0][0], offset)  # Nothing rises faster than a straight jump
+        self.assertLess(jump_arc(1.5)[30][1][0][0], jump_arc(1)[20][1][0][0])  # Boosted jumps go higher
+
+    def test_builtin_levels_are_completable(self):
+        for level in (LevelOne(), LevelTwo(), LevelThree()):
+            report = analyze_level(level)
+            self.assertEqual(report.unreachable, [])
+            self.assertEqual(report.reachable_platforms, len(level.platforms))
+
+    def test_reports_unreachable_coins(self):
+        data = load("levels/level3.json")
+        data["power_ups"] = []  # The top coin needs the jump boost
+        data["coins"].append([700, 20, 20, 20])  # Floating far above every platform
+        report = analyze(data)
+        self.assertEqual(report.unreachable, [[475, 110, 20, 20], [700, 20, 20, 20]])
+        self.assertEqual(report.coins, 4)
+
+    def test_bottom_edge_is_a_floor(self):
+        data = {"platforms": [[0, 300, 50, 20]], "coins": [[700, 570, 20, 20]]}
+        self.assertEqual(analyze(data).unreachable, [])
+        sim = Simulation(levels=[level_from_dict(data)])
+        sim.run([FrameInput(confirm=True)] + [FrameInput(right=True)] * 200)
+        self.assertEqual(sim.state, "FINISHED")  # Walked along the bottom edge to the coin
+
+    def test_guarded_coins(self):
+        data = load("levels/level3.json")
+        data["coins"].append([560, 400, 20, 20])  # In the fast enemy's lane
+        self.assertEqual(analyze(data).guarded, [[560, 400, 20, 20]])
+
+    def test_pack_analysis_is_parallel_and_cached(self):
+        levels = [load(path) for path in LEVEL_FILES]
+        levels.append(dict(levels[2], power_ups=[]))
+        with tempfile.TemporaryDirectory() as directory:
+            pack_path = os.path.join(directory, "levels.pak")
+            compile_levels(levels, pack_path)
+            cache = ReportCache(os.path.join(directory, "cache.json"))
+            reports = analyze_pack(pack_path, cache, workers=2)
+            self.assertEqual(reports, [analyze(data) for data in levels])
+            self.assertEqual((cache.hits, cache.misses), (0, 4))
+            cache.save()
+
+            cache = ReportCache(os.path.join(directory, "cache.json"))  # Reloaded from disk
+            self.assertEqual(analyze_pack(pack_path, cache), reports)
+            self.assertEqual((cache.hits, cache.misses), (4, 0))
+            self.assertEqual(cache.get(level_key(encode_level(levels[3]))), reports[3])
+            self.assertIsNone(cache.get(level_key(encode_level(dict(levels[3], coins=[])))))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os
+import unittest
+import pygame
+from src.game import GameManager
+from src.inputs import FrameInput
+from src.game_objects import LevelOne, display_format, get_surface, clear_surface_cache
+from src.constants import WHITE
+
+class TestDirtyRectRenderer(unittest.TestCase):
+    def setUp(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        self.game = GameManager()
+        self.game.get_ticks = self.game.simulation_ticks
+
+    def screen_bytes(self):
+        return pygame.image.tobytes(self.game.screen, "RGB")
+
+    def test_incremental_frames_match_full_redraw(self):
+        inputs = [FrameInput(confirm=True)] + [FrameInput(right=True, jump=i % 40 < 5) for i in range(120)]
+        for frame_input in inputs:
+            self.game.step(frame_input)
+            self.game.render()
+        incremental = self.screen_bytes()
+        self.game.renderer.invalidate()
+        self.game.render()
+        self.assertTrue(self.game.renderer.full_redraw)
+        self.assertEqual(incremental, self.screen_bytes())
+
+    def test_static_layer_baked_once_per_level(self):
+        self.game.step(FrameInput(confirm=True))
+        self.game.render()
+        layer = self.game.renderer.static_layer
+        for _ in range(5):
+            self.game.step(FrameInput(right=True))
+            self.game.render()
+            self.assertFalse(self.game.renderer.full_redraw)
+        self.assertIs(self.game.renderer.static_layer, layer)
+
+    def test_menu_screen_not_pushed_again(self):
+        self.game.render()
+        self.assertTrue(self.game.renderer.full_redraw)
+        self.game.render()
+        self.assertFalse(self.game.renderer.full_redraw)
+        self.assertEqual(self.game.renderer.rects, [])
+
+    def test_startup_converts_images_and_defers_fonts(self):
+        pygame.display.quit()
+        clear_surface_cache()
+        level = LevelOne()  # Built before any display exists
+        self.assertIsNone(display_format())
+        game = GameManager(levels=[level])
+        self.assertIsNone(game.text._font)  # No text rendered yet
+        for platform in level.platforms:
+            self.assertEqual(platform.image.get_bitsize(), game.screen.get_bitsize())
+            self.assertIs(platform.image, get_surface((platform.width, platform.height), (255, 255, 255)))
+        game.render()
+        self.assertIsNotNone(game.text._font)
+        self.assertEqual(game.text.render("Press SPACE to Start", WHITE).get_bitsize(), 32)
+
+if __name__ == "__main__":
+    unittest.main()
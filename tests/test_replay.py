@@ -0,0 +1,76 @@
+import random
+import unittest
+from src.replay import Recorder, Recording, verify, input_bits, INPUT_TABLE, write_varint, read_varint
+from src.simulation import Simulation
+from src.game_objects import Level, Platform, Coin
+from src.inputs import FrameInput
+
+def walk_level():
+    """Ground-only level whose coins are collected by walking right."""
+    level = Level()
+    level.platforms = [Platform(0, 580, 800, 20)]
+    level.coins = [Coin(300, 550, 20, 20), Coin(600, 550, 20, 20)]
+    return level
+
+def play(inputs, levels):
+    sim = Simulation(levels=levels)
+    sim.recorder = Recorder()
+    sim.run(inputs)
+    return sim, Recording(sim.recorder.to_bytes(sim))
+
+class TestReplay(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(1)
+        self.inputs = ([FrameInput(confirm=True)] + [FrameInput(right=True, jump=rng.random() < 0.1)] * 400
+                       + [FrameInput(confirm=True)] + [FrameInput(right=True)] * 300)
+
+    def test_varint_and_input_bits_round_trip(self):
+        buffer = bytearray()
+        for value in [0, 1, 127, 128, 300, 2 ** 40]:
+            write_varint(buffer, value)
+        offset = 0
+        for value in [0, 1, 127, 128, 300, 2 ** 40]:
+            decoded, offset = read_varint(buffer, offset)
+            self.assertEqual(decoded, value)
+        for bits in range(64):
+            self.assertEqual(input_bits(INPUT_TABLE[bits]), bits)
+
+    def test_recording_decodes_original_inputs(self):
+        _, recording = play(self.inputs, [walk_level(), walk_level()])
+        self.assertEqual(list(recording.inputs()), self.inputs)
+
+    def test_finished_run_verifies(self):
+        sim, recording = play(self.inputs, [walk_level(), walk_level()])
+        self.assertEqual(sim.state, "FINISHED")  # Finished, replayed and finished again
+        self.assertGreater(recording.final_ticks, 0)
+        result = verify(recording, [walk_level(), walk_level()])
+        self.assertTrue(result.valid, result.reason)
+        self.assertEqual((result.final_time, result.score), (sim.final_time, sim.player.score))
+
+    def test_timer_counts_simulation_ticks(self):
+        sim = Simulation(levels=[walk_level(), walk_level()])
+        sim.step(FrameInput(confirm=True))
+        while sim.state == "PLAYING":
+            sim.step(FrameInput(right=True))
+        self.assertEqual(sim.state, "FINISHED")
+        self.assertEqual(sim.get_ticks(), sim.frame * 1000 // 60)
+        self.assertEqual(sim.final_time, (sim.get_ticks() - sim.start_time) / 1000)
+
+    def test_tampered_score_is_rejected(self):
+        sim, recording = play(self.inputs, [walk_level(), walk_level()])
+        recording.score += 1
+        result = verify(recording, [walk_level(), walk_level()])
+        self.assertFalse(result.valid)
+
+    def test_unknown_version_names_readable_ones(self):
+        with self.assertRaisesRegex(ValueError, "version 2 or 3"):
+            Recording(b"PREC\x01\x00")
+
+    def test_recording_is_compact(self):
+        sim = Simulation(levels=[walk_level(), walk_level()])
+        sim.recorder = Recorder()
+        sim.run(self.inputs)
+        self.assertLess(len(sim.recorder.to_bytes(sim)), 200)
+
+if __name__ == "__main__":
+    unittest.main()
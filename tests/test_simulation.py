@@ -0,0 +1,54 @@
+import os
+import unittest
+import unittest.mock
+import pygame
+from src.simulation import Simulation
+from src.inputs import FrameInput, NO_INPUT
+from src.constants import SCREEN_HEIGHT, FPS
+
+START = FrameInput(confirm=True)
+RIGHT = FrameInput(right=True)
+
+class TestSimulation(unittest.TestCase):
+    def setUp(self):
+        self.sim = Simulation()
+
+    def test_confirm_starts_game(self):
+        self.sim.step(START)
+        self.assertEqual(self.sim.state, "PLAYING")
+        self.assertEqual(self.sim.start_time, 0)
+
+    def test_player_rests_on_ground(self):
+        self.sim.run([START] + [NO_INPUT] * 30)
+        self.assertEqual(self.sim.player.y, SCREEN_HEIGHT - 60)
+        self.assertTrue(self.sim.player.is_on_ground)
+
+    def test_walking_collects_ground_coin(self):
+        self.sim.run([START] + [RIGHT] * 60)
+        self.assertEqual(self.sim.level_coin_counts[0], 1)
+        self.assertEqual(self.sim.player.score, 1)
+
+    def test_timer_uses_simulation_ticks(self):
+        self.sim.run([START] + [NO_INPUT] * (FPS - 1))
+        self.assertEqual(self.sim.get_ticks() - self.sim.start_time, 1000)
+
+    def test_observer_called_each_tick(self):
+        frames = []
+        self.sim.run([START, NO_INPUT, NO_INPUT], observer=lambda sim: frames.append(sim.frame))
+        self.assertEqual(frames, [1, 2, 3])
+
+    def test_matches_keyboard_driven_update(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        pygame.init()
+        keyboard = Simulation()
+        keyboard.step(START)
+        keys = {pygame.K_RIGHT: True, pygame.K_LEFT: False, pygame.K_UP: True}
+        with unittest.mock.patch('pygame.key.get_pressed', return_value=keys):
+            for _ in range(90):
+                keyboard.update(None)
+        self.sim.run([START] + [FrameInput(right=True, jump=True)] * 90)
+        self.assertEqual((self.sim.player.x, self.sim.player.y), (keyboard.player.x, keyboard.player.y))
+        self.assertEqual(self.sim.level_coin_counts, keyboard.level_coin_counts)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+import random
+import unittest
+import pygame
+from src.snapshot import SnapshotRing, snapshot_size, take_snapshot, restore_snapshot
+from src.simulation import Simulation
+from src.replay import Recorder, Recording, verify
+from src.game_objects import LevelOne, LevelTwo, LevelThree, Level, Platform, Coin, Enemy, FastEnemy
+from src.world import ChunkedLevel
+from src.constants import SCREEN_WIDTH
+from src.inputs import FrameInput
+
+START = FrameInput(confirm=True)
+
+def world_state(sim):
+    """Everything a snapshot should bring back, as comparable values."""
+    level = sim.levels[sim.current_level_index]
+    player = sim.player
+    return (sim.state, sim.current_level_index, list(sim.level_coin_counts), sim.frame, sim.powerup_active,
+            (player.x, player.y, player.velocity_x, player.velocity_y, player.is_on_ground, player.score,
+             player.jump_multiplier, player.rect.topleft),
+            [(enemy.x, enemy.velocity_x, enemy.rect.topleft) for enemy in level.enemies],
+            [coin.collected for coin in level.coins.items], len(level.coins))
+
+def ground_level(enemy=False):
+    """Ground-only level whose coins are collected by walking right, with an optional enemy in the way."""
+    level = Level()
+    ground = Platform(0, 580, 800, 20)
+    level.platforms = [ground]
+    level.coins = [Coin(300, 550, 20, 20), Coin(600, 550, 20, 20)]
+    if enemy:
+        level.enemies = [Enemy(200, 540, 40, 40, ground)]
+    return level
+
+def scrolling_level(screens=20, seed=0):
+    """Level many screens wide with an enemy on each floating platform, most of them asleep at any time."""
+    rng = random.Random(seed)
+    width = SCREEN_WIDTH * screens
+    level = ChunkedLevel(width, 600)
+    level.platforms = [Platform(0, 580, width, 20)]
+    for x in range(600, width - 200, 300):
+        level.platforms.append(Platform(x, rng.randrange(300, 480), rng.randrange(100, 250), 20))
+    level.enemies = [(FastEnemy if i % 3 == 0 else Enemy)(p.x + 5, p.y - 20, 30, 20, p)
+                     for i, p in enumerate(level.platforms[1:])]
+    level.coins = [Coin(x, 540, 20, 20) for x in range(400, width, 700)]
+    return level
+
+def random_inputs(seed, count):
+    rng = random.Random(seed)
+    return [FrameInput(left=rng.random() < 0.2, right=rng.random() < 0.6, jump=rng.random() < 0.1)
+            for _ in range(count)]
+
+class TestSnapshot(unittest.TestCase):
+    def test_builtin_levels_fit_in_100_bytes(self):
+        for level in (LevelOne(), LevelTwo(), LevelThree()):
+            self.assertLess(snapshot_size(level), 100)
+
+    def test_restore_resumes_identically(self):
+        sim = Simulation()
+        sim.run([START] + [FrameInput(right=True)] * 60 + random_inputs(1, 60))
+        snapshot = take_snapshot(sim)
+        before = world_state(sim)
+        later = random_inputs(2, 200)
+        sim.run(later)
+        after = world_state(sim)
+        self.assertNotEqual(before, after)
+        restore_snapshot(sim, snapshot)
+        self.assertEqual(world_state(sim), before)
+        sim.run(later)
+        self.assertEqual(world_state(sim), after)
+
+    def test_restore_resumes_identically_on_a_scrolling_level(self):
+        level = scrolling_level()
+        sim = Simulation(levels=[level])
+        sim.run([START] + [FrameInput(right=True, jump=i % 40 == 0) for i in range(500)])
+        self.assertTrue(level.asleep_since)
+        snapshot = take_snapshot(sim)
+        later = [FrameInput(right=True, jump=i % 40 == 0) for i in range(300)] + random_inputs(4, 300)
+        everything = pygame.Rect(0, 0, level.width, level.height)
+
+        def play():
+            sim.run(later)
+            state = world_state(sim)
+            level.awake_enemies(everything)  # Sleeping enemies catch up
+            return state, [(enemy.x, enemy.velocity_x) for enemy in level.enemies]
+
+        after = play()
+        restore_snapshot(sim, snapshot)
+        self.assertEqual(play(), after)
+
+    def test_rewind_steps_back_through_a_level_change(self):
+        sim = Simulation(levels=[ground_level(), ground_level(enemy=True)])
+        sim.enable_rewind()
+        sim.step(START)
+        states = []
+        while sim.current_level_index == 0:
+            states.append(world_state(sim))
+            sim.step(FrameInput(right=True))
+        self.assertEqual(sim.current_level_index, 1)
+        for state in reversed(states):
+            sim.step(FrameInput(rewind=True))
+            self.assertEqual(world_state(sim), state)
+        sim.step(FrameInput(rewind=True))  # Back to before the first tick
+        first = world_state(sim)
+        self.assertEqual(first[3], 0)
+        sim.step(FrameInput(rewind=True))  # Nothing older than the start of the game
+        self.assertEqual(world_state(sim), first)
+
+    def test_rewind_out_of_game_over(self):
+        sim = Simulation(levels=[ground_level(enemy=True)])
+        sim.enable_rewind()
+        sim.step(START)
+        sim.run([FrameInput(right=True)] * 150)
+        self.assertEqual(sim.state, "GAME_OVER")
+        sim.step(FrameInput(rewind=True))
+        self.assertEqual(sim.state, "PLAYING")
+        self.assertIn(("state", "PLAYING"), sim.tick_events)
+
+    def test_ring_keeps_the_newest_snapshots(self):
+        sim = Simulation()
+        sim.step(START)
+        ring = SnapshotRing(memory=10 * 64)
+        frames = []
+        for inputs in random_inputs(3, 25):
+            ring.push(sim)
+            frames.append(sim.frame)
+            sim.step(inputs)
+        self.assertEqual(len(ring), 10)
+        restored = []
+        while ring.pop(sim):
+            restored.append(sim.frame)
+        self.assertEqual(restored, frames[::-1][:10])
+
+    def test_ring_grows_slots_for_bigger_levels(self):
+        sim = Simulation()
+        sim.step(START)
+        ring = SnapshotRing(memory=600, slot_size=40)
+        for _ in range(20):
+            ring.push(sim)
+            sim.step(FrameInput(right=True))
+        self.assertEqual(ring.slot_size, snapshot_size(sim.levels[0]))
+        self.assertEqual(len(ring), ring.capacity)
+        ring.pop(sim)
+        self.assertEqual(sim.frame, 20)
+
+    def test_ring_drops_history_for_snapshots_leaving_too_few_slots(self):
+        sim = Simulation(levels=[LevelOne(), scrolling_level()])
+        sim.step(START)
+        ring = SnapshotRing(memory=1000, min_count=10)
+        self.assertTrue(ring.push(sim))
+        sim.current_level_index = 1
+        self.assertGreater(snapshot_size(sim.levels[1]), 100)
+        self.assertFalse(ring.push(sim))
+        self.assertEqual(len(ring), 0)
+        self.assertEqual(len(ring.buffer), 1000)
+
+    def test_big_levels_are_played_without_rewind(self):
+        sim = Simulation(levels=[scrolling_level(screens=100)])
+        sim.enable_rewind()
+        sim.step(START)
+        sim.run([FrameInput(right=True)] * 30)
+        self.assertEqual(len(sim.rewind_buffer), 0)
+        state = world_state(sim)
+        sim.step(FrameInput(rewind=True))
+        self.assertEqual(world_state(sim), state)
+
+    def test_restart_restores_level_start_and_keeps_the_clock(self):
+        sim = Simulation()
+        sim.step(START)
+        start = world_state(sim)
+        sim.run([FrameInput(right=True)] * 60)
+        self.assertEqual(sim.player.score, 1)
+        sim.step(FrameInput(restart=True))
+        state = world_state(sim)
+        self.assertEqual(state[3], 62)  # Frame counter kept running
+        self.assertEqual(state[:3] + state[4:], start[:3] + start[4:])
+
+    def test_restart_after_rewinding_into_an_earlier_level(self):
+        sim = Simulation(levels=[ground_level(), ground_level(), ground_level()])
+        sim.enable_rewind()
+        sim.step(START)
+        start = world_state(sim)
+        while sim.current_level_index == 0:
+            sim.step(FrameInput(right=True))
+        while sim.current_level_index == 1:
+            sim.step(FrameInput(rewind=True))
+        sim.step(FrameInput(restart=True))  # Restarts the first level, not the one rewound out of
+        state = world_state(sim)
+        self.assertEqual(state[:3] + state[4:], start[:3] + start[4:])
+
+    def test_recording_with_rewind_verifies(self):
+        inputs = ([START] + [FrameInput(right=True, jump=i % 50 == 0) for i in range(150)]
+                  + [FrameInput(rewind=True)] * 80 + [FrameInput(right=True)] * 200)
+        sim = Simulation()
+        sim.enable_rewind()
+        sim.recorder = Recorder()
+        sim.run(inputs)
+        recording = Recording(sim.recorder.to_bytes(sim))
+        self.assertTrue(verify(recording).valid)
+
+if __name__ == "__main__":
+    unittest.main()
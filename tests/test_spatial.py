@@ -0,0 +1,58 @@
+import random
+import unittest
+import pygame
+from src.spatial import SpatialHash
+from src.simulation import Simulation
+from src.game_objects import Level, Platform, Enemy, Coin
+from src.inputs import FrameInput
+
+def random_level(seed, count=200):
+    rng = random.Random(seed)
+    level = Level()
+    level.platforms = [Platform(0, 580, 800, 20)]
+    for _ in range(count):
+        level.platforms.append(Platform(rng.randrange(-50, 800), rng.randrange(0, 580),
+                                        rng.randrange(20, 200), rng.randrange(10, 40)))
+    level.enemies = [Enemy(p.x, p.y - 20, 30, 20, p) for p in level.platforms[1:20]]
+    level.coins = [Coin(rng.randrange(0, 780), rng.randrange(0, 580), 20, 20) for _ in range(count)]
+    level.initial_coins = level.coins.copy()
+    return level
+
+class TestSpatialHash(unittest.TestCase):
+    def test_query_finds_overlapping_objects_in_order(self):
+        platforms = [Platform(x * 30, 100, 40, 20) for x in range(10)]
+        index = SpatialHash(platforms, cell_size=32)
+        probe = pygame.Rect(65, 90, 40, 40)
+        expected = [p for p in platforms if probe.colliderect(p.rect)]
+        found = [p for p in index.query(probe) if probe.colliderect(p.rect)]
+        self.assertEqual(found, expected)
+        self.assertEqual(index.query(probe, after=platforms[3]), [p for p in index.query(probe) if platforms.index(p) > 3])
+
+    def test_move_and_remove(self):
+        platform = Platform(0, 0, 20, 20)
+        index = SpatialHash([platform], cell_size=32)
+        platform.rect.topleft = (200, 200)
+        index.move(platform)
+        self.assertEqual(index.query(pygame.Rect(0, 0, 10, 10)), [])
+        self.assertEqual(index.query(pygame.Rect(205, 205, 10, 10)), [platform])
+        index.remove(platform)
+        self.assertEqual(len(index), 0)
+
+    def test_matches_linear_scan(self):
+        for seed in range(3):
+            grid = Simulation(levels=[random_level(seed)])
+            linear = Simulation(levels=[random_level(seed)])
+            linear.levels[0].build_index(cell_size=10 ** 6)  # One cell: every object is a candidate
+            rng = random.Random(seed)
+            inputs = [FrameInput(confirm=True)] + [FrameInput(rng.random() < 0.4, rng.random() < 0.5, rng.random() < 0.3,
+                                                              rng.random() < 0.05)
+                                                   for _ in range(400)]
+            for frame_input in inputs:
+                grid.step(frame_input)
+                linear.step(frame_input)
+                self.assertEqual((grid.player.x, grid.player.y, grid.player.velocity_y, grid.state),
+                                 (linear.player.x, linear.player.y, linear.player.velocity_y, linear.state))
+            self.assertEqual(grid.level_coin_counts, linear.level_coin_counts)
+
+if __name__ == "__main__":
+    unittest.main()
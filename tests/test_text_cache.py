@@ -0,0 +1,38 @@
+import unittest
+import pygame
+from src.text_cache import TextCache
+from src.constants import WHITE, RED
+
+class TestTextCache(unittest.TestCase):
+    def setUp(self):
+        pygame.font.init()
+        self.cache = TextCache(pygame.font.Font(None, 36), max_entries=3)
+
+    def test_repeated_text_is_rasterized_once(self):
+        first = self.cache.render("Level 1", WHITE)
+        self.assertIs(self.cache.render("Level 1", WHITE), first)
+        self.assertIsNot(self.cache.render("Level 1", RED), first)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_least_recently_used_is_evicted(self):
+        for text in ["a", "b", "c"]:
+            self.cache.render(text, WHITE)
+        self.cache.render("a", WHITE)  # "b" is now least recently used
+        self.cache.render("d", WHITE)
+        self.assertEqual(len(self.cache), 3)
+        self.assertNotIn(("b", WHITE), self.cache.surfaces)
+        self.assertIn(("a", WHITE), self.cache.surfaces)
+
+    def test_glyphs_drawn_side_by_side(self):
+        cache = TextCache(pygame.font.Font(None, 36))
+        screen = pygame.Surface((400, 100))
+        area = cache.draw_glyphs(screen, "Time: 1.00s", WHITE, (10, 20))
+        widths = sum(cache.render(char, WHITE).get_width() for char in "Time: 1.00s")
+        self.assertEqual(area.topleft, (10, 20))
+        self.assertEqual(area.width, widths)
+        misses = cache.misses
+        cache.draw_glyphs(screen, "Time: 1.01s", WHITE, (10, 20))
+        self.assertEqual(cache.misses, misses)  # Only cached glyphs were used
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import random
+import unittest
+import pygame
+from src.world import Camera, ChunkedLevel, fast_forward
+from src.game_objects import Platform, Enemy, FastEnemy, Coin, Player
+from src.simulation import Simulation
+from src.level_format import level_to_dict, level_from_dict, encode_level, decode_level
+from src.inputs import FrameInput
+from src.constants import SCREEN_WIDTH
+
+def wide_level(screens=10, seed=0):
+    rng = random.Random(seed)
+    width = SCREEN_WIDTH * screens
+    level = ChunkedLevel(width, 600)
+    level.platforms = [Platform(0, 580, width, 20)]
+    for x in range(600, width - 200, 300):
+        level.platforms.append(Platform(x, rng.randrange(300, 480), rng.randrange(100, 250), 20))
+    level.enemies = [(FastEnemy if i % 3 == 0 else Enemy)(p.x + 5, p.y - 20, 30, 20, p)
+                     for i, p in enumerate(level.platforms[1:])]
+    level.coins = [Coin(x, 540, 20, 20) for x in range(400, width, 700)]
+    return level
+
+class TestWorld(unittest.TestCase):
+    def test_fast_forward_matches_updates(self):
+        rng = random.Random(3)
+        for _ in range(300):
+            # Platforms down to narrower than the enemy, starts partly off the edge, several tick lengths
+            platform = Platform(0, 100, rng.randrange(10, 400), 20)
+            enemy_class = rng.choice([Enemy, FastEnemy])
+            stepped = enemy_class(rng.randrange(-20, platform.width), 80, 30, 20, platform)
+            skipped = enemy_class(stepped.x, 80, 30, 20, platform)
+            if rng.random() < 0.5:
+                stepped.velocity_x = skipped.velocity_x = -stepped.velocity_x
+            dt = rng.choice([1, 2, 3, 6])
+            steps = rng.randrange(0, 5000)
+            for _ in range(steps):
+                stepped.update(dt)
+            fast_forward(skipped, steps, dt)
+            self.assertEqual((skipped.x, skipped.velocity_x, skipped.rect), (stepped.x, stepped.velocity_x, stepped.rect))
+
+    def test_sleeping_enemies_catch_up(self):
+        chunked = wide_level()
+        reference = wide_level()
+        reference.awake_enemies = lambda view, dt=1: reference.enemies  # Always simulate everything
+        sims = [Simulation(levels=[chunked]), Simulation(levels=[reference])]
+        inputs = [FrameInput(confirm=True)] + [FrameInput(right=True, jump=i % 50 == 0) for i in range(1200)]
+        for sim in sims:
+            sim.run(inputs)
+        self.assertLess(len(chunked.awake), len(chunked.enemies))
+        self.assertEqual(sims[0].player.x, sims[1].player.x)
+        chunked.awake_enemies(pygame.Rect(0, 0, chunked.width, chunked.height))  # Wake everything
+        self.assertEqual([(e.x, e.velocity_x) for e in chunked.enemies], [(e.x, e.velocity_x) for e in reference.enemies])
+
+    def test_camera_follows_and_clamps(self):
+        level = wide_level()
+        player = Player(100, 540, 40, 40)
+        camera = Camera()
+        camera.follow(player, level)
+        self.assertEqual((camera.x, camera.y), (0, 0))
+        player.x = 3000
+        camera.follow(player, level)
+        self.assertEqual(camera.x, 3020 - SCREEN_WIDTH // 2)
+        player.x = level.width - 40
+        camera.follow(player, level)
+        self.assertEqual(camera.x, level.width - SCREEN_WIDTH)
+
+    def test_player_walks_past_screen_edge(self):
+        sim = Simulation(levels=[wide_level()])
+        sim.run([FrameInput(confirm=True)] + [FrameInput(right=True, jump=True)] * 400)
+        self.assertGreater(sim.player.x, SCREEN_WIDTH)
+        self.assertGreater(sim.camera.x, 0)
+
+    def test_level_file_keeps_world_size(self):
+        data = level_to_dict(wide_level())
+        self.assertEqual(decode_level(encode_level(data)), data)
+        level = level_from_dict(data)
+        self.assertIsInstance(level, ChunkedLevel)
+        self.assertEqual(level.width, SCREEN_WIDTH * 10)
+
+    def test_renders_only_visible_chunks(self):
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        from src.game import GameManager
+        game = GameManager(levels=[wide_level(screens=40)])
+        game.step(FrameInput(confirm=True))
+        for _ in range(200):
+            game.step(FrameInput(right=True, jump=True))
+            game.render()
+        self.assertTrue(game.renderer.full_redraw)
+        self.assertLessEqual(len(game.chunk_renderer.layers), 8)
+
+if __name__ == "__main__":
+    unittest.main()